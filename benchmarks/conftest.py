@@ -0,0 +1,74 @@
+import os
+import pytest
+from playwright.sync_api import Browser, Page
+from typing import Generator
+
+from config.settings import (
+    BENCHMARK_ROUNDS,
+    BENCHMARK_REGRESSION_THRESHOLD,
+    BENCHMARK_BASELINE_PATH,
+    BENCHMARK_RESULTS_PATH,
+)
+from core.local_site import LocalSite
+from core.locator_stats import locator_stats
+from benchmarks.harness import BenchmarkRecorder, BENCH_SITE
+
+_recorder = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=None,
+        help="Timed rounds per benchmarked operation (default: BENCHMARK_ROUNDS env or 20)",
+    )
+    parser.addoption(
+        "--regression-threshold",
+        type=float,
+        default=None,
+        help="Allowed p50/p95 slowdown vs. the baseline, e.g. 0.25 = 25%% (default: BENCHMARK_REGRESSION_THRESHOLD env)",
+    )
+    parser.addoption(
+        "--update-baseline",
+        action="store_true",
+        default=False,
+        help="Write this run's timings into the benchmark baseline JSON",
+    )
+
+
+def pytest_configure(config):
+    # Benchmarks must be repeatable: no adaptive reordering, and the bench site's
+    # deliberately dead selectors must not leak into the real win-rate store.
+    locator_stats.adaptive = False
+    locator_stats.path = os.path.join(os.path.dirname(BENCHMARK_RESULTS_PATH), "locator_stats.json")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _recorder:
+        _recorder.save()
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(pytestconfig) -> BenchmarkRecorder:
+    global _recorder
+    threshold = pytestconfig.getoption("--regression-threshold")
+    _recorder = BenchmarkRecorder(
+        rounds=pytestconfig.getoption("--benchmark-rounds") or BENCHMARK_ROUNDS,
+        threshold=BENCHMARK_REGRESSION_THRESHOLD if threshold is None else threshold,
+        baseline_path=BENCHMARK_BASELINE_PATH,
+        results_path=BENCHMARK_RESULTS_PATH,
+        update_baseline=pytestconfig.getoption("--update-baseline"),
+    )
+    return _recorder
+
+
+@pytest.fixture(scope="function")
+def bench_page(browser: Browser) -> Generator[Page, None, None]:
+    # Plain context with a fixed default viewport (no tracing, auth or network policy),
+    # so only page-object work is timed and runs stay comparable
+    browser_context = browser.new_context()
+    LocalSite.for_site(BENCH_SITE).attach(browser_context)
+    page_instance = browser_context.new_page()
+    yield page_instance
+    browser_context.close()
@@ -0,0 +1,130 @@
+import json
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from config.settings import logger
+
+BENCH_SITE = "bench"
+
+# Rounds run before timing starts (first navigation, JIT, font loading)
+WARMUP_ROUNDS = 1
+# Slowdowns smaller than this are treated as noise, whatever the relative threshold says
+REGRESSION_MIN_DELTA_MS = 5.0
+GATED_METRICS = ("p50_ms", "p95_ms")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+@dataclass(frozen=True)
+class OperationTimings:
+    name:       str
+    samples_ms: tuple[float, ...]
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(list(self.samples_ms), 0.50)
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(list(self.samples_ms), 0.95)
+
+    @property
+    def max_ms(self) -> float:
+        return max(self.samples_ms)
+
+    def summary(self) -> dict:
+        return {
+            "rounds": len(self.samples_ms),
+            "p50_ms": round(self.p50_ms, 1),
+            "p95_ms": round(self.p95_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class BenchmarkRecorder:
+    # Times each operation `rounds` times (setup excluded), keeps the results for the
+    # session and compares them with the committed baseline JSON. A run that records the
+    # baseline (update_baseline) is not gated; any other run fails an operation it has no baseline for.
+    def __init__(self, rounds: int, threshold: float, baseline_path: str, results_path: str, update_baseline: bool = False):
+        self.rounds          = rounds
+        self.threshold       = threshold
+        self.baseline_path   = baseline_path
+        self.results_path    = results_path
+        self.update_baseline = update_baseline
+        self.results       = {}
+        self._baseline     = None
+
+    def measure(self, name: str, operation: Callable[[], object], setup: Optional[Callable[[], object]] = None) -> OperationTimings:
+        samples = []
+        for round_no in range(WARMUP_ROUNDS + self.rounds):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            operation()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if round_no >= WARMUP_ROUNDS:
+                samples.append(elapsed_ms)
+        timings = OperationTimings(name, tuple(samples))
+        self.results[name] = timings.summary()
+        logger.info(f"Benchmark {name}: {timings.summary()}")
+        return timings
+
+    def baseline(self) -> dict:
+        if self._baseline is None:
+            self._baseline = {}
+            if os.path.exists(self.baseline_path):
+                with open(self.baseline_path, encoding="utf-8") as f:
+                    self._baseline = json.load(f).get("operations", {})
+        return self._baseline
+
+    def regressions(self, timings: OperationTimings) -> list[str]:
+        if self.update_baseline:
+            return []
+        reference = self.baseline().get(timings.name)
+        if not reference:
+            return [
+                f"No baseline for benchmark '{timings.name}' in {self.baseline_path} — "
+                f"record one on the reference machine with --update-baseline"
+            ]
+        current = timings.summary()
+        problems = []
+        for metric in GATED_METRICS:
+            allowed = reference[metric] * (1 + self.threshold)
+            if current[metric] > allowed and current[metric] - reference[metric] > REGRESSION_MIN_DELTA_MS:
+                problems.append(
+                    f"{timings.name} {metric} {current[metric]}ms exceeds baseline {reference[metric]}ms "
+                    f"by more than {self.threshold:.0%}"
+                )
+        return problems
+
+    def save(self) -> None:
+        if not self.results:
+            return
+        document = {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine":     platform.node(),
+            "rounds":      self.rounds,
+            "operations":  self.results,
+        }
+        _write_json(self.results_path, document)
+        logger.info(f"Benchmark results written to {self.results_path}")
+        if self.update_baseline:
+            merged = dict(self.baseline())
+            merged.update(self.results)
+            _write_json(self.baseline_path, dict(document, operations=merged))
+            logger.info(f"Benchmark baseline updated: {self.baseline_path}")
+
+
+def _write_json(path: str, document: dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
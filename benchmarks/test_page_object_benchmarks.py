@@ -0,0 +1,93 @@
+import pytest
+
+from benchmarks.harness import BENCH_SITE
+from core.base_page import BasePage
+from core.constants import FieldParser
+from core.extraction import FieldSpec
+from data.data_loader import load_locators
+from pages.search_results_page import SearchResultsPage
+from pages.item_page import ItemPage
+from pages.cart_page import CartPage
+
+BENCH_ORIGIN  = "https://bench.test"
+CLICK_URL     = f"{BENCH_ORIGIN}/click.html"
+RESULTS_URL   = f"{BENCH_ORIGIN}/results.html?page=1"
+ITEM_URL      = f"{BENCH_ORIGIN}/item.html"
+BLANK_URL     = "about:blank"
+CLICK_SECTION = "click"
+# 60 results per bench page, so this crosses two "next page" clicks
+COLLECT_LIMIT = 150
+
+
+def _assert_within_baseline(benchmark_recorder, timings):
+    regressions = benchmark_recorder.regressions(timings)
+    assert not regressions, "Benchmark regression:\n" + "\n".join(regressions)
+
+
+@pytest.mark.parametrize("selectors_key", ["primary_target", "fallback_target"])
+def test_smart_click(bench_page, benchmark_recorder, selectors_key):
+    selectors = load_locators(BENCH_SITE)[CLICK_SECTION][selectors_key]
+    base_page = BasePage(bench_page, BENCH_SITE)
+    bench_page.goto(CLICK_URL)
+
+    timings = benchmark_recorder.measure(f"smart_click[{selectors_key}]", lambda: base_page.smart_click(selectors))
+    _assert_within_baseline(benchmark_recorder, timings)
+
+
+def test_smart_get_number_fallback(bench_page, benchmark_recorder):
+    cart = CartPage(bench_page, BENCH_SITE)
+    bench_page.goto(cart.cart_url)
+
+    timings = benchmark_recorder.measure(
+        "smart_get_number[fallback]",
+        lambda: cart.smart_get_number(cart.subtotal_selectors),
+    )
+    assert cart.smart_get_number(cart.subtotal_selectors) == 1234.56
+    _assert_within_baseline(benchmark_recorder, timings)
+
+
+def test_smart_extract_fallback(bench_page, benchmark_recorder):
+    cart = CartPage(bench_page, BENCH_SITE)
+    fields = {"subtotal": FieldSpec(cart.subtotal_selectors, FieldParser.CURRENCY)}
+    bench_page.goto(cart.cart_url)
+
+    timings = benchmark_recorder.measure("smart_extract[fallback]", lambda: cart.smart_extract(fields))
+    assert cart.smart_extract(fields) == {"subtotal": 1234.56}
+    _assert_within_baseline(benchmark_recorder, timings)
+
+
+def test_collect_item_urls(bench_page, benchmark_recorder):
+    search = SearchResultsPage(bench_page, BENCH_SITE)
+    collected = []
+
+    timings = benchmark_recorder.measure(
+        "_collect_item_urls[3_pages]",
+        lambda: collected.append(search._collect_item_urls(COLLECT_LIMIT)),
+        setup=lambda: bench_page.goto(RESULTS_URL),
+    )
+    assert len(collected[-1]) == COLLECT_LIMIT
+    _assert_within_baseline(benchmark_recorder, timings)
+
+
+def test_select_variants_if_exist(bench_page, benchmark_recorder):
+    item = ItemPage(bench_page, BENCH_SITE)
+
+    timings = benchmark_recorder.measure(
+        "_select_variants_if_exist[variant_heavy]",
+        item._select_variants_if_exist,
+        setup=lambda: bench_page.goto(ITEM_URL),
+    )
+    _assert_within_baseline(benchmark_recorder, timings)
+
+
+def test_get_cart_total(bench_page, benchmark_recorder):
+    cart = CartPage(bench_page, BENCH_SITE)
+    totals = []
+
+    timings = benchmark_recorder.measure(
+        "get_cart_total",
+        lambda: totals.append(cart.get_cart_total()),
+        setup=lambda: bench_page.goto(BLANK_URL),
+    )
+    assert set(totals) == {1234.56}
+    _assert_within_baseline(benchmark_recorder, timings)
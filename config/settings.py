@@ -1,4 +1,5 @@
 import os
+import random
 import logging
 from dotenv import load_dotenv
 
@@ -6,9 +7,106 @@ load_dotenv()
 
 # Global config variables
 GRID_URL = os.getenv("GRID_URL")
+IS_CI = os.getenv("CI", "false").lower() == "true"
 USER_EMAIL = os.getenv("USER_EMAIL")
 USER_PASSWORD = os.getenv("USER_PASSWORD")
 
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--start-maximized',
+]
+
+REAL_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+
+# Compiled site profiles (validated locators JSON) are pickled here keyed by the JSON's hash; "" = no disk cache
+SITE_PROFILE_CACHE_DIR = os.getenv("SITE_PROFILE_CACHE_DIR", "")
+
+# Smart locator resolution: "race" waits on all fallbacks at once, "sequential" tries them one by one
+LOCATOR_RESOLUTION = os.getenv("LOCATOR_RESOLUTION", "race").lower()
+
+# On-disk selector win-rate store; ADAPTIVE_LOCATORS reorders fallbacks and tunes timeouts from it
+LOCATOR_STATS_PATH = os.getenv("LOCATOR_STATS_PATH", ".locator_stats.json")
+ADAPTIVE_LOCATORS  = os.getenv("ADAPTIVE_LOCATORS", "true").lower() == "true"
+
+# Number of item tabs ItemPage.add_items_to_cart keeps loading in parallel (1 = serial)
+ADD_TO_CART_CONCURRENCY = int(os.getenv("ADD_TO_CART_CONCURRENCY", "1"))
+
+# Seed for random variant picks on item pages; unset = a new seed per run (logged, so a run can be replayed)
+VARIANT_SEED = os.getenv("VARIANT_SEED") or str(random.SystemRandom().randrange(10**6))
+
+# Logged-in storage state is saved once per site and reused by every test context until it expires
+AUTH_STATE_DIR         = os.getenv("AUTH_STATE_DIR", ".auth")
+AUTH_STATE_TTL_SECONDS = int(os.getenv("AUTH_STATE_TTL_SECONDS", "3600"))
+
+# Playwright tracing: off | on-failure (keep only the last TRACE_RING_SIZE navigation chunks of failing tests) | always
+TRACE_MODE      = os.getenv("TRACE_MODE", "on-failure").lower()
+TRACE_RING_SIZE = int(os.getenv("TRACE_RING_SIZE", "1"))
+
+# Screenshots: policy never | failure-only | always; JPEG is much cheaper to encode than PNG.
+# SCREENSHOT_CLIP="x,y,width,height" captures only that viewport region.
+SCREENSHOT_POLICY  = os.getenv("SCREENSHOT_POLICY", "always").lower()
+SCREENSHOT_FORMAT  = os.getenv("SCREENSHOT_FORMAT", "png").lower()
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "70"))
+SCREENSHOT_CLIP    = os.getenv("SCREENSHOT_CLIP", "")
+
+# Network mode: live | record (HAR per site/query) | replay (serve HARs offline); CLI: --network-mode
+NETWORK_MODE = os.getenv("NETWORK_MODE", "live").lower()
+HAR_DIR      = os.getenv("HAR_DIR", os.path.join("data", "har"))
+
+# Number of (site, query) cases the async suite drives at once on one event loop and browser
+ASYNC_CASE_CONCURRENCY = int(os.getenv("ASYNC_CASE_CONCURRENCY", "4"))
+
+# Parallel runner (python -m core.parallel_runner): pytest workers per node sharing one browser
+# server, and the most cases of one site in flight at once, e.g. RUNNER_SITE_CAPS="ebay=2,fakeshop=4"
+RUNNER_WORKERS   = int(os.getenv("RUNNER_WORKERS", "4"))
+RUNNER_SITE_CAPS = os.getenv("RUNNER_SITE_CAPS", "")
+
+# Warm browser daemon (python -m core.browser_daemon start): Chromium with a persistent profile kept
+# alive between runs. With BROWSER_DAEMON=true the browser fixture attaches to it over CDP while it is
+# running; tests still get isolated contexts unless BROWSER_DAEMON_SHARED_CONTEXT=true runs live-site
+# tests in its warm-cache profile context. It stops itself after BROWSER_DAEMON_IDLE_SECONDS without a test run.
+BROWSER_DAEMON                = os.getenv("BROWSER_DAEMON", "false").lower() == "true"
+BROWSER_DAEMON_SHARED_CONTEXT = os.getenv("BROWSER_DAEMON_SHARED_CONTEXT", "false").lower() == "true"
+BROWSER_DAEMON_STATE_PATH     = os.getenv("BROWSER_DAEMON_STATE_PATH", ".browser_daemon.json")
+BROWSER_DAEMON_PROFILE_DIR    = os.getenv("BROWSER_DAEMON_PROFILE_DIR", ".browser_profile")
+BROWSER_DAEMON_PORT           = int(os.getenv("BROWSER_DAEMON_PORT", "9333"))
+BROWSER_DAEMON_IDLE_SECONDS   = int(os.getenv("BROWSER_DAEMON_IDLE_SECONDS", "1800"))
+
+# Harvested search-result URLs are reused per (site, query, filters) within the TTL. Off by
+# default: a cached run skips the search and pagination flows it would otherwise exercise.
+# SEARCH_CACHE_PATH="" keeps the cache in memory for the session only.
+SEARCH_CACHE             = os.getenv("SEARCH_CACHE", "false").lower() == "true"
+SEARCH_CACHE_PATH        = os.getenv("SEARCH_CACHE_PATH", "")
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "900"))
+
+# Timed spans for navigation, smart actions, selector attempts and waits, exported per test
+INSTRUMENTATION = os.getenv("INSTRUMENTATION", "true").lower() == "true"
+
+# Page-object benchmarks (benchmarks/): timed rounds per operation and the allowed slowdown vs. the baseline
+BENCHMARK_ROUNDS               = int(os.getenv("BENCHMARK_ROUNDS", "20"))
+BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.25"))
+BENCHMARK_BASELINE_PATH        = os.getenv("BENCHMARK_BASELINE_PATH", os.path.join("benchmarks", "baseline.json"))
+BENCHMARK_RESULTS_PATH         = os.getenv("BENCHMARK_RESULTS_PATH", os.path.join("benchmarks", "results", "latest.json"))
+
+# LOG_PIPELINE=queue formats and writes log records and smart-action events on background threads
+# (and writes a per-test events/<test>.jsonl). LOG_VERBOSITY=summary logs one line per passing smart
+# action instead of every selector attempt, without per-attempt Allure steps.
+LOG_PIPELINE  = os.getenv("LOG_PIPELINE", "sync").lower()
+LOG_VERBOSITY = os.getenv("LOG_VERBOSITY", "steps").lower()
+
+# Time budgets: nested waits and selector attempts draw from the enclosing budget instead of each
+# spending its own full timeout. TEST_BUDGET_SECONDS covers a whole test (the `budget(seconds)`
+# marker overrides it), SEARCH_BUDGET_SECONDS one filtered search. Both are opt-in: 0 opens no
+# budget, so every wait keeps its own timeout.
+TEST_BUDGET_SECONDS   = float(os.getenv("TEST_BUDGET_SECONDS", "0"))
+SEARCH_BUDGET_SECONDS = float(os.getenv("SEARCH_BUDGET_SECONDS", "0"))
+
 # Configure basic logging
 logging.basicConfig(
     level=logging.INFO,
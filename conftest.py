@@ -1,17 +1,56 @@
+import json
 import os
+import allure
 import pytest
+import pytest_asyncio
 from dataclasses import dataclass
 from playwright.sync_api import Playwright, Browser, BrowserContext, Page
-from typing import Generator
+from playwright.async_api import async_playwright, Browser as AsyncBrowser, Page as AsyncPage
+from typing import AsyncGenerator, Awaitable, Callable, Generator
 
-from config.settings import logger, GRID_URL
+from config.settings import (
+    logger,
+    GRID_URL,
+    IS_CI,
+    CHROMIUM_ARGS,
+    REAL_USER_AGENT,
+    USER_EMAIL,
+    USER_PASSWORD,
+    AUTH_STATE_DIR,
+    AUTH_STATE_TTL_SECONDS,
+    TRACE_MODE,
+    TRACE_RING_SIZE,
+    NETWORK_MODE,
+    INSTRUMENTATION,
+    TEST_BUDGET_SECONDS,
+)
+from core.auth_state import AuthStateCache
+from core.network_policy import NetworkPolicy
+from core.tracing import TraceRecorder
+from core.local_site import LocalSite
+from core.har_recording import har_context_options, replay_har, MissingRecordingError
+from core.screenshots import attachment_writer
+from core.instrumentation import SpanRecorder
+from core.deadline import Budget, deadline
 from pages.home_page import HomePage
 from pages.login_page import LoginPage
 from pages.search_results_page import SearchResultsPage
 from pages.item_page import ItemPage
 from pages.cart_page import CartPage
-from core.constants import PARAM_SITE, TRACE_OUTPUT_PATH
-from data.data_loader import _TEST_DATA_ENV_KEY
+from pages.async_home_page import AsyncHomePage
+from pages.async_login_page import AsyncLoginPage
+from pages.async_search_results_page import AsyncSearchResultsPage
+from pages.async_item_page import AsyncItemPage
+from pages.async_cart_page import AsyncCartPage
+from core.constants import PARAM_SITE, TRACE_OUTPUT_DIR, METRICS_OUTPUT_DIR, BUDGET_MARKER, TraceMode, NetworkMode
+from core.locator_stats import locator_stats
+from core.search_cache import search_cache
+from core.work_queue import connect_work_queue, run_from_work_queue, WORKER_ID_ENV_KEY
+from core.async_stack import split_async_stack, run_async_stack_subprocess
+from core.browser_daemon import attach_to_daemon, touch_daemon_lease, daemon_context, DaemonContextLease
+from core.event_log import action_events
+from data.site_profile import site_profile, SiteProfileError
+from data.data_loader import _TEST_DATA_ENV_KEY, _SHARD_INDEX_ENV_KEY, _SHARD_COUNT_ENV_KEY, FIELD_QUERY
 
 
 def pytest_addoption(parser):
@@ -20,30 +59,124 @@ def pytest_addoption(parser):
         default=None,
         help="Test data filename inside data/ directory (default: test_data.json)",
     )
+    parser.addoption(
+        "--shard-index",
+        type=int,
+        default=None,
+        help="Run only this shard (0-based) of the test-data matrix; rows are assigned by a stable hash",
+    )
+    parser.addoption(
+        "--shard-count",
+        type=int,
+        default=None,
+        help="Number of shards the test-data matrix is split into (default: 1 — no sharding)",
+    )
+    parser.addoption(
+        "--trace-mode",
+        default=None,
+        choices=[mode.value for mode in TraceMode],
+        help="Playwright tracing policy (default: TRACE_MODE env or 'on-failure')",
+    )
+    parser.addoption(
+        "--network-mode",
+        default=None,
+        choices=[mode.value for mode in NetworkMode],
+        help="live network, record a HAR per (site, query), or replay recorded HARs offline (default: NETWORK_MODE env or 'live')",
+    )
 
 
 def pytest_configure(config):
+    action_events.install()
     try:
         test_data = config.getoption("--test-data")
         if test_data:
             os.environ[_TEST_DATA_ENV_KEY] = test_data
+        shard_index = config.getoption("--shard-index")
+        shard_count = config.getoption("--shard-count")
+        if shard_index is not None:
+            os.environ[_SHARD_INDEX_ENV_KEY] = str(shard_index)
+        if shard_count is not None:
+            os.environ[_SHARD_COUNT_ENV_KEY] = str(shard_count)
     except ValueError:
         pass
 
-IS_CI = os.getenv("CI", "false").lower() == "true"
 
-CHROMIUM_ARGS = [
-    '--no-sandbox',
-    '--disable-dev-shm-usage',
-    '--disable-blink-features=AutomationControlled',
-    '--start-maximized',
-]
+_ASYNC_STACK_DEFERRED = pytest.StashKey[bool]()
 
-REAL_USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/122.0.0.0 Safari/537.36"
-)
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    # Runs after -m/-k deselection. Sync and async Playwright cannot share one event loop, so
+    # when both kinds are selected the async_stack items move to a pytest process of their own.
+    sync_items, async_items = split_async_stack(items)
+    if sync_items and async_items:
+        items[:] = sync_items
+        config.hook.pytest_deselected(items=async_items)
+        if os.getenv(WORKER_ID_ENV_KEY):
+            logger.warning("Parallel runner workers skip the async stack; run `pytest -m async_stack` on its own")
+        else:
+            config.stash[_ASYNC_STACK_DEFERRED] = True
+    # Every site's locators are compiled and validated before any browser starts
+    sites = {item.callspec.params.get(PARAM_SITE) for item in items if hasattr(item, "callspec")} - {None}
+    problems = []
+    for site in sorted(sites):
+        try:
+            site_profile(site)
+        except SiteProfileError as e:
+            problems.append(str(e))
+    if problems:
+        raise pytest.UsageError("\n".join(problems))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def _test_failed(request) -> bool:
+    return any(
+        getattr(request.node, f"rep_{when}", None) is not None and getattr(request.node, f"rep_{when}").failed
+        for when in ("setup", "call")
+    )
+
+
+def pytest_runtestloop(session):
+    # Inside a parallel-runner worker, cases come from the node's shared work queue
+    work_queue = connect_work_queue()
+    if work_queue is None:
+        return None
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        raise session.Interrupted(f"{session.testsfailed} error(s) during collection")
+    if not session.config.option.collectonly:
+        run_from_work_queue(session, work_queue)
+    return True
+
+
+def pytest_sessionfinish(session, exitstatus):
+    attachment_writer.flush()
+    action_events.flush()
+    locator_stats.save()
+    search_cache.save()
+    if search_cache.hits or search_cache.misses:
+        logger.info(f"Search result cache: {search_cache.summary()}")
+    for dead in locator_stats.dead_selectors():
+        logger.warning(
+            f"Dead selector in {dead['scope']}: {dead['selector']} "
+            f"(0/{dead['attempts']} recent attempts succeeded, last {dead['last_attempt']})"
+        )
+    deferred_async_stack = session.config.stash.get(_ASYNC_STACK_DEFERRED, False) and not session.config.option.collectonly
+    if deferred_async_stack and not (session.shouldfail or session.shouldstop):
+        async_exit_code = run_async_stack_subprocess(session.config)
+        if async_exit_code and not session.exitstatus:
+            session.exitstatus = async_exit_code
+
+
+CONTEXT_OPTIONS = {
+    "no_viewport": True,
+    "user_agent":  REAL_USER_AGENT,
+}
 
 
 @dataclass
@@ -55,15 +188,38 @@ class EcommerceSitePages:
     cart:   CartPage
 
 
+@dataclass
+class AsyncEcommerceSitePages:
+    home:   AsyncHomePage
+    login:  AsyncLoginPage
+    search: AsyncSearchResultsPage
+    item:   AsyncItemPage
+    cart:   AsyncCartPage
+
+    @classmethod
+    def for_page(cls, page: AsyncPage, site: str, label: str = "") -> "AsyncEcommerceSitePages":
+        return cls(
+            home=AsyncHomePage(page, site, label),
+            login=AsyncLoginPage(page, site, label),
+            search=AsyncSearchResultsPage(page, site, label),
+            item=AsyncItemPage(page, site, label),
+            cart=AsyncCartPage(page, site, label),
+        )
+
+
 # ---------------------------------------------------------------------------
 # Browser / context / page
 # ---------------------------------------------------------------------------
 
 @pytest.fixture(scope="session")
 def browser(playwright: Playwright) -> Generator[Browser, None, None]:
+    daemon_browser = None if GRID_URL else attach_to_daemon(playwright)
     if GRID_URL:
         logger.info(f"Connecting to remote Playwright grid at {GRID_URL}")
         browser_instance = playwright.chromium.connect(ws_endpoint=GRID_URL)
+    elif daemon_browser:
+        logger.info("Attached to the warm browser daemon")
+        browser_instance = daemon_browser
     else:
         logger.info(f"Launching local Playwright Chromium instance (headless={IS_CI})")
         browser_instance = playwright.chromium.launch(
@@ -71,38 +227,237 @@ def browser(playwright: Playwright) -> Generator[Browser, None, None]:
             args=CHROMIUM_ARGS,
         )
     yield browser_instance
-    browser_instance.close()
+    # The daemon's browser outlives the run; the playwright fixture drops the connection to it
+    if daemon_browser:
+        touch_daemon_lease()
+    else:
+        browser_instance.close()
+
+
+def _site_param(request) -> str | None:
+    callspec = getattr(request.node, "callspec", None)
+    return callspec.params.get(PARAM_SITE) if callspec else None
+
+
+def _query_param(request) -> str | None:
+    callspec = getattr(request.node, "callspec", None)
+    return callspec.params.get(FIELD_QUERY) if callspec else None
+
+
+def _network_mode(config) -> str:
+    return config.getoption("--network-mode") or NETWORK_MODE
+
+
+def _log_in(page: Page, site: str) -> None:
+    home = HomePage(page, site)
+    home.navigate()
+    home.go_to_login()
+    LoginPage(page, site).login(USER_EMAIL, USER_PASSWORD)
+
+
+def _is_logged_in(page: Page, site: str) -> bool | None:
+    HomePage(page, site).navigate()
+    return LoginPage(page, site).is_logged_in()
+
+
+def _serve_local_site(browser_context: BrowserContext, site: str) -> None:
+    # A bundled site only resolves through its context routing, login contexts included
+    local_site = LocalSite.for_site(site)
+    if local_site:
+        local_site.attach(browser_context)
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache(browser: Browser, pytestconfig) -> AuthStateCache | None:
+    # Replayed runs must stay offline, so they rely on whatever session the recording captured
+    if not (USER_EMAIL and USER_PASSWORD) or _network_mode(pytestconfig) == NetworkMode.REPLAY:
+        return None
+    return AuthStateCache(
+        browser,
+        state_dir=AUTH_STATE_DIR,
+        ttl_seconds=AUTH_STATE_TTL_SECONDS,
+        context_options=CONTEXT_OPTIONS,
+        log_in=_log_in,
+        is_logged_in=_is_logged_in,
+        prepare_context=_serve_local_site,
+    )
 
 
 @pytest.fixture(scope="function")
-def context(browser: Browser) -> Generator[BrowserContext, None, None]:
-    browser_context = browser.new_context(
-        no_viewport=True,
-        user_agent=REAL_USER_AGENT,
+def context(browser: Browser, auth_state_cache: AuthStateCache | None, request) -> Generator[BrowserContext, None, None]:
+    site = _site_param(request)
+    query = _query_param(request)
+    local_site = LocalSite.for_site(site) if site else None
+    # HAR record/replay only applies to live sites; a bundled local site is already offline
+    network_mode = _network_mode(request.config) if site and query and not local_site else NetworkMode.LIVE
+    context_options = dict(CONTEXT_OPTIONS)
+    context_options.update(har_context_options(network_mode, site, query))
+    if auth_state_cache and site:
+        context_options["storage_state"] = auth_state_cache.storage_state_for(site)
+    # Opt-in (BROWSER_DAEMON_SHARED_CONTEXT): live sites lease the warm daemon's profile context, the one holding its disk cache
+    shared_context = daemon_context(browser) if network_mode == NetworkMode.LIVE and not local_site else None
+    daemon_lease = DaemonContextLease(shared_context, context_options.get("storage_state")) if shared_context else None
+    browser_context = shared_context or browser.new_context(**context_options)
+    touch_daemon_lease()
+    if local_site:
+        local_site.attach(browser_context)
+    network_policy = NetworkPolicy.for_site(site) if site else None
+    if network_policy and daemon_lease:
+        # Routing turns off the HTTP cache for every routed request, which is all the shared context is for
+        logger.warning(f"Network policy of {site} not applied: the test runs in the shared daemon context (BROWSER_DAEMON_SHARED_CONTEXT)")
+        network_policy = None
+    network_stats = network_policy.attach(browser_context) if network_policy else None
+    try:
+        replay_har(browser_context, network_mode, site, query)
+    except MissingRecordingError as e:
+        browser_context.close()
+        pytest.skip(str(e))
+    trace_recorder = TraceRecorder(
+        browser_context,
+        mode=request.config.getoption("--trace-mode") or TRACE_MODE,
+        output_dir=TRACE_OUTPUT_DIR,
+        test_id=request.node.nodeid,
+        ring_size=TRACE_RING_SIZE,
     )
-    browser_context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    trace_recorder.start()
     yield browser_context
-    try:
-        browser_context.tracing.stop(path=TRACE_OUTPUT_PATH)
-    except Exception:
-        pass
-    browser_context.close()
+    for trace_path in trace_recorder.finish(failed=_test_failed(request)):
+        allure.attach.file(trace_path, name=os.path.basename(trace_path), extension="zip")
+    if daemon_lease:
+        cache_summary = daemon_lease.release()
+        logger.info(
+            f"Daemon HTTP cache: {cache_summary['served_from_cache']}/{cache_summary['responses']} "
+            f"responses served from cache ({cache_summary['hit_rate']:.0%})"
+        )
+        allure.attach(json.dumps(cache_summary, indent=2), name="Daemon cache hits", attachment_type=allure.attachment_type.JSON)
+    else:
+        browser_context.close()
+    if network_stats:
+        summary = network_stats.summary()
+        logger.info(
+            f"Network policy saved {summary['requests_blocked']} blocked + {summary['requests_stubbed']} stubbed "
+            f"requests (~{summary['bytes_saved_estimate']} bytes); loaded {summary['bytes_loaded']} bytes"
+        )
+        allure.attach(network_stats.to_json(), name="Network policy savings", attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture(scope="function")
+def span_recorder(request) -> Generator[SpanRecorder | None, None, None]:
+    if not INSTRUMENTATION:
+        yield None
+        return
+    recorder = SpanRecorder(request.node.nodeid)
+    recorder.start()
+    yield recorder
+    recorder.finish()
+    recorder.export(METRICS_OUTPUT_DIR)
+    allure.attach(recorder.to_json(), name="Timing summary", attachment_type=allure.attachment_type.JSON)
+    allure.attach(recorder.to_flame_html(), name="Timing breakdown", attachment_type=allure.attachment_type.HTML)
 
 
 @pytest.fixture(scope="function")
-def page(context: BrowserContext) -> Generator[Page, None, None]:
+def action_event_log(request) -> Generator[None, None, None]:
+    # Selector-attempt events of this test; written to events/ by the queue pipeline
+    action_events.start_test()
+    yield
+    action_events.finish_test(request.node.nodeid)
+
+
+@pytest.fixture(scope="function")
+def time_budget(request) -> Generator[Budget | None, None, None]:
+    # Opened after the browser context is ready, so it covers what the test itself drives
+    marker = request.node.get_closest_marker(BUDGET_MARKER)
+    seconds = float(marker.args[0]) if marker else TEST_BUDGET_SECONDS
+    with deadline(request.node.nodeid, seconds) as budget:
+        yield budget
+    if budget is not None and _test_failed(request):
+        logger.info(budget.report())
+        allure.attach(budget.report(), name="Time budget", attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture(scope="function")
+def page(context: BrowserContext, span_recorder: SpanRecorder | None, action_event_log, time_budget) -> Generator[Page, None, None]:
     page_instance = context.new_page()
     yield page_instance
     page_instance.close()
 
 
 @pytest.fixture(scope="function")
-def site_pages(page: Page, request) -> EcommerceSitePages:
-    site = request.node.callspec.params[PARAM_SITE]
-    return EcommerceSitePages(
+def site_pages(page: Page, auth_state_cache: AuthStateCache | None, request) -> EcommerceSitePages:
+    site = _site_param(request)
+    site_pages = EcommerceSitePages(
         home=HomePage(page, site),
         login=LoginPage(page, site),
         search=SearchResultsPage(page, site),
         item=ItemPage(page, site),
         cart=CartPage(page, site),
     )
+    site_pages.search.use_search_cache = request.node.get_closest_marker("live_search") is None
+    if auth_state_cache and site:
+        _ensure_logged_in(site_pages, auth_state_cache, site)
+    return site_pages
+
+
+def _ensure_logged_in(site_pages: EcommerceSitePages, auth_state_cache: AuthStateCache, site: str) -> None:
+    # The cached state is verified once per session; a session the site expires later is
+    # caught here and replaced once before the test starts
+    site_pages.home.navigate()
+    if site_pages.login.is_logged_in() is not False:
+        return
+    auth_state_cache.refresh(site_pages.home.page.context, site)
+    site_pages.home.navigate()
+    if site_pages.login.is_logged_in() is False:
+        pytest.fail(f"Logged-in marker of {site} still missing after re-authenticating")
+
+
+# ---------------------------------------------------------------------------
+# Async browser / pages (one event loop + one browser for the whole session)
+# ---------------------------------------------------------------------------
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser() -> AsyncGenerator[AsyncBrowser, None]:
+    async with async_playwright() as async_pw:
+        if GRID_URL:
+            logger.info(f"Connecting async stack to remote Playwright grid at {GRID_URL}")
+            browser_instance = await async_pw.chromium.connect(ws_endpoint=GRID_URL)
+        else:
+            logger.info(f"Launching async Playwright Chromium instance (headless={IS_CI})")
+            browser_instance = await async_pw.chromium.launch(headless=IS_CI, args=CHROMIUM_ARGS)
+        yield browser_instance
+        await browser_instance.close()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
+async def async_site_pages_factory(
+    async_browser: AsyncBrowser,
+    span_recorder: SpanRecorder | None,
+    action_event_log,
+    time_budget,
+    request,
+) -> AsyncGenerator[Callable[[str, str], Awaitable[AsyncEcommerceSitePages]], None]:
+    # Each call opens an isolated context + page for one (site, query) case, so many
+    # cases can run side by side on the session loop; all are closed at teardown.
+    # The async stack is reduced-feature: contexts skip the auth-state cache, NetworkPolicy,
+    # HAR record/replay and tracing that the sync `browser_context` fixture sets up.
+    created_contexts = []
+    use_search_cache = request.node.get_closest_marker("live_search") is None
+
+    async def _new_site_pages(site: str, label: str = "") -> AsyncEcommerceSitePages:
+        browser_context = await async_browser.new_context(**CONTEXT_OPTIONS)
+        created_contexts.append(browser_context)
+        local_site = LocalSite.for_site(site)
+        if local_site:
+            await local_site.attach_async(browser_context)
+        page_instance = await browser_context.new_page()
+        site_pages = AsyncEcommerceSitePages.for_page(page_instance, site, label)
+        site_pages.search.use_search_cache = use_search_cache
+        return site_pages
+
+    yield _new_site_pages
+    for browser_context in created_contexts:
+        await browser_context.close()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
+async def async_site_pages(async_site_pages_factory, request) -> AsyncEcommerceSitePages:
+    return await async_site_pages_factory(_site_param(request))
@@ -0,0 +1,174 @@
+from contextlib import asynccontextmanager
+from typing import Optional
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from config.settings import logger
+from core.base_page import PARSE_NUMBER_JS
+from core.constants import (
+    DEFAULT_TIMEOUT_MS,
+    ElementState,
+    LoadState,
+    SpanKind,
+    AttemptOutcome,
+)
+from core.page_core import PageCore, SmartLocatorRun
+from core.screenshots import screenshot_settings, attachment_writer
+from core.ready_condition import ReadyCondition
+from core.instrumentation import span
+from core.deadline import budgeted_timeout, BudgetExceededError
+from core.response_capture import response_capture_for, CapturedResponse
+from core.extraction import EXTRACT_FIELDS_JS, WAIT_FOR_FIELDS_JS, FieldSpec
+
+
+class AsyncBasePage(PageCore):
+    # Async twin of BasePage: the smart-locator bookkeeping comes from PageCore, only the
+    # Playwright calls are awaited here. Many flows interleave on one event loop, so progress
+    # is reported through the logger (prefixed with `label`) rather than nested allure.step
+    # blocks, which would tangle across concurrently running cases.
+    def __init__(self, page: Page, site: str = None, label: str = ""):
+        super().__init__(page, site, label)
+
+    def capture_responses(self, patterns: list[str]) -> None:
+        response_capture_for(self.page.context, asynchronous=True).watch(patterns)
+
+    def captured_json(self, pattern: str, since: Optional[float] = None) -> Optional[CapturedResponse]:
+        return response_capture_for(self.page.context, asynchronous=True).latest(pattern, since)
+
+    async def go_to(self, url: str):
+        logger.info(f"{self._log_prefix()}Navigate to {url}")
+        with span(SpanKind.NAVIGATION, "go_to", url=url):
+            await self.page.goto(url, timeout=budgeted_timeout(None))
+
+    async def _execute_with_smart_locators(self, locators: list[str], action_func, timeout_ms: int = DEFAULT_TIMEOUT_MS):
+        action_name = action_func.__name__
+        with span(SpanKind.ACTION, f"smart{action_name}"):
+            return await self._run_smart_locators(locators, action_func, action_name, timeout_ms)
+
+    async def _run_smart_locators(self, locators: list[str], action_func, action_name: str, timeout_ms: int):
+        run = self._smart_run(locators, action_name, timeout_ms)
+        if run.racing:
+            race_timeout_ms = run.race_timeout()
+            try:
+                with span(SpanKind.RACE, action_name, candidates=len(run.ordered)):
+                    await self._race_locators(run, race_timeout_ms)
+            except PlaywrightTimeoutError as e:
+                run.race_lost(e, race_timeout_ms)
+
+        for attempt_index, selector in run.candidates:
+            try:
+                element = self._locate(selector, visible_only=run.racing)
+                with span(SpanKind.ATTEMPT, selector, action=action_name):
+                    await action_func(element, timeout=run.attempting(attempt_index, selector))
+                run.succeeded(attempt_index, selector)
+                return element
+            except BudgetExceededError:
+                raise
+            except PlaywrightTimeoutError as e:
+                run.failed(attempt_index, selector, AttemptOutcome.TIMED_OUT, e)
+            except Exception as e:
+                run.failed(attempt_index, selector, AttemptOutcome.ERROR, e)
+
+        failure_message = run.exhausted()
+        await self.take_screenshot(f"failed_{action_name}", on_failure=True)
+        raise Exception(failure_message)
+
+    async def _race_locators(self, run: SmartLocatorRun, timeout_ms: float) -> None:
+        await self._race_locator(run.ordered).wait_for(state=ElementState.VISIBLE, timeout=timeout_ms)
+        position = None
+        for candidate, selector in enumerate(run.ordered):
+            if await self._locate(selector, visible_only=True).count() > 0:
+                position = candidate
+                break
+        message = run.race_won(position)
+        if message:
+            logger.info(f"{self._log_prefix()}{message}")
+
+    async def smart_click(self, locators: list[str], timeout_ms: int = DEFAULT_TIMEOUT_MS):
+        async def _click(element, timeout):
+            await element.click(timeout=timeout)
+        await self._execute_with_smart_locators(locators, _click, timeout_ms)
+
+    async def smart_fill(self, locators: list[str], text: str, timeout_ms: int = DEFAULT_TIMEOUT_MS):
+        async def _fill(element, timeout):
+            await element.fill(text, timeout=timeout)
+        await self._execute_with_smart_locators(locators, _fill, timeout_ms)
+
+    async def smart_get_text(self, locators: list[str], timeout_ms: int = DEFAULT_TIMEOUT_MS) -> str:
+        extracted_texts = []
+        async def _get_text(element, timeout):
+            await element.wait_for(state=ElementState.VISIBLE, timeout=timeout)
+            extracted_texts.append(await element.inner_text())
+        await self._execute_with_smart_locators(locators, _get_text, timeout_ms)
+        return extracted_texts[0] if extracted_texts else ""
+
+    async def smart_get_number(self, locators: list[str], timeout_ms: int = DEFAULT_TIMEOUT_MS) -> float:
+        extracted_numbers = []
+        async def _get_number(element, timeout):
+            await element.wait_for(state=ElementState.VISIBLE, timeout=timeout)
+            value = await element.evaluate(PARSE_NUMBER_JS)
+            extracted_numbers.append(float(value))
+        await self._execute_with_smart_locators(locators, _get_number, timeout_ms)
+        return extracted_numbers[0] if extracted_numbers else 0.0
+
+    async def smart_extract(self, fields: dict[str, FieldSpec], timeout_ms: int = DEFAULT_TIMEOUT_MS) -> dict:
+        with span(SpanKind.ACTION, "smart_extract", fields=len(fields)):
+            run = self._extraction(fields, timeout_ms)
+            result = await self.page.evaluate(EXTRACT_FIELDS_JS, run.arg)
+            if not result["complete"]:
+                try:
+                    with span(SpanKind.WAIT, "smart_extract"):
+                        handle = await self.page.wait_for_function(WAIT_FOR_FIELDS_JS, arg=run.arg, timeout=run.wait_timeout())
+                        result = await handle.json_value()
+                except PlaywrightTimeoutError:
+                    result = await self.page.evaluate(EXTRACT_FIELDS_JS, run.arg)
+            failure_message = run.finish(result)
+            if failure_message:
+                await self.take_screenshot("failed_smart_extract", on_failure=True)
+                raise Exception(failure_message)
+            return run.values(result)
+
+    async def take_screenshot(self, name: str, on_failure: bool = False):
+        if not screenshot_settings.should_capture(on_failure):
+            return
+        with span(SpanKind.SCREENSHOT, name):
+            screenshot_bytes = await self.page.screenshot(**screenshot_settings.capture_options())
+        attachment_writer.attach(screenshot_bytes, f"{self._log_prefix()}{name}", screenshot_settings.attachment_type)
+
+    async def wait_for_page_load(self):
+        with span(SpanKind.WAIT, "wait_for_page_load"):
+            await self.page.wait_for_load_state(LoadState.DOM_CONTENT, timeout=budgeted_timeout(None))
+
+    async def wait_for_network_idle(self):
+        with span(SpanKind.WAIT, "wait_for_network_idle"):
+            await self.page.wait_for_load_state(LoadState.NETWORK_IDLE, timeout=budgeted_timeout(None))
+
+    @asynccontextmanager
+    async def expect_ready(self):
+        ready = self.ready_condition
+        if ready is None:
+            yield
+            await self.wait_for_network_idle()
+            return
+        logger.info(f"{self._log_prefix()}Wait until ready: {ready.describe()}")
+        if ready.response_pattern:
+            async with self.page.expect_response(ready.response_pattern, timeout=budgeted_timeout(ready.timeout_ms)):
+                yield
+        else:
+            yield
+        await self._wait_for_ready_state(ready)
+
+    async def wait_until_ready(self):
+        ready = self.ready_condition
+        if ready is None or not (ready.selectors or ready.predicate):
+            await self.wait_for_network_idle()
+            return
+        await self._wait_for_ready_state(ready)
+
+    async def _wait_for_ready_state(self, ready: ReadyCondition):
+        with span(SpanKind.WAIT, f"wait_until_ready[{self._SECTION}]"):
+            await self._wait_for_ready_parts(ready)
+
+    async def _wait_for_ready_parts(self, ready: ReadyCondition):
+        if ready.selectors:
+            await self._ready_locator(ready).wait_for(state=ready.state, timeout=budgeted_timeout(ready.timeout_ms))
+        if ready.predicate:
+            await self.page.wait_for_function(ready.predicate, timeout=budgeted_timeout(ready.timeout_ms))
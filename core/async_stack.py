@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+from config.settings import logger
+from core.constants import ASYNC_STACK_MARKER
+
+# pytest's "no tests were collected" exit code
+_NO_TESTS_COLLECTED = 5
+
+
+def split_async_stack(items: list) -> tuple[list, list]:
+    # (sync items, async_stack items), each in collection order
+    sync_items, async_items = [], []
+    for item in items:
+        (async_items if item.get_closest_marker(ASYNC_STACK_MARKER) else sync_items).append(item)
+    return sync_items, async_items
+
+
+def run_async_stack_subprocess(config) -> int:
+    # Sync Playwright keeps its event loop running in the main thread for the whole session,
+    # so the async suite gets a pytest process of its own. Same arguments; the trailing -m
+    # overrides any earlier marker expression.
+    command = [sys.executable, "-m", "pytest", *config.invocation_params.args, "-m", ASYNC_STACK_MARKER]
+    logger.info(f"Running the async stack in its own pytest process: {' '.join(command)}")
+    exit_code = subprocess.call(command, cwd=config.invocation_params.dir)
+    return 0 if exit_code == _NO_TESTS_COLLECTED else exit_code
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from typing import Callable, Optional
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from config.settings import logger
+
+_STATE_FILE_SUFFIX = "_storage_state.json"
+
+
+class AuthStateCache:
+    # Logs in once per site, saves the context's storage state to disk and hands the
+    # file to every test context. A saved state is verified once per session (via the
+    # site's logged-in marker) and only re-created when it is expired or rejected.
+    # prepare_context wires up each of its own contexts for the site (e.g. local site routing).
+    def __init__(
+        self,
+        browser: Browser,
+        state_dir: str,
+        ttl_seconds: int,
+        context_options: dict,
+        log_in: Callable[[Page, str], None],
+        is_logged_in: Callable[[Page, str], Optional[bool]],
+        prepare_context: Optional[Callable[[BrowserContext, str], None]] = None,
+    ):
+        self.browser         = browser
+        self.state_dir       = state_dir
+        self.ttl_seconds     = ttl_seconds
+        self.context_options = context_options
+        self._log_in         = log_in
+        self._is_logged_in   = is_logged_in
+        self._prepare        = prepare_context
+        self._verified_sites = set()
+
+    def storage_state_for(self, site: str) -> str:
+        state_path = self._state_path(site)
+        if site in self._verified_sites:
+            return state_path
+        if self._is_fresh(state_path):
+            if self._is_accepted(site, state_path):
+                logger.info(f"Reusing saved authentication state for '{site}': {state_path}")
+                self._verified_sites.add(site)
+                return state_path
+            logger.warning(f"Saved authentication state for '{site}' was rejected — re-authenticating")
+        self._authenticate(site, state_path)
+        self._verified_sites.add(site)
+        return state_path
+
+    def invalidate(self, site: str) -> None:
+        self._verified_sites.discard(site)
+        state_path = self._state_path(site)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+    def refresh(self, browser_context: BrowserContext, site: str) -> None:
+        # The site dropped the session mid-run: authenticate again and swap the new
+        # session cookies into the running test context
+        logger.warning(f"Authenticated session for '{site}' was dropped — re-authenticating")
+        self.invalidate(site)
+        with open(self.storage_state_for(site)) as f:
+            state = json.load(f)
+        browser_context.clear_cookies()
+        browser_context.add_cookies(state["cookies"])
+
+    def _state_path(self, site: str) -> str:
+        return os.path.join(self.state_dir, f"{site}{_STATE_FILE_SUFFIX}")
+
+    def _is_fresh(self, state_path: str) -> bool:
+        return os.path.exists(state_path) and time.time() - os.path.getmtime(state_path) < self.ttl_seconds
+
+    def _new_context(self, site: str, **options) -> BrowserContext:
+        browser_context = self.browser.new_context(**self.context_options, **options)
+        if self._prepare:
+            self._prepare(browser_context, site)
+        return browser_context
+
+    def _is_accepted(self, site: str, state_path: str) -> bool:
+        browser_context = self._new_context(site, storage_state=state_path)
+        try:
+            # None (no marker configured) means the state cannot be checked — trust the TTL
+            return self._is_logged_in(browser_context.new_page(), site) is not False
+        finally:
+            browser_context.close()
+
+    def _authenticate(self, site: str, state_path: str) -> None:
+        logger.info(f"Authenticating once for '{site}' and saving storage state to {state_path}")
+        os.makedirs(self.state_dir, exist_ok=True)
+        browser_context = self._new_context(site)
+        try:
+            self._log_in(browser_context.new_page(), site)
+            browser_context.storage_state(path=state_path)
+        finally:
+            browser_context.close()
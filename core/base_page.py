@@ -1,45 +1,91 @@
+from contextlib import contextmanager
+from typing import Optional
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from config.settings import logger
 from core.constants import (
     DEFAULT_TIMEOUT_MS,
     ElementState,
     LoadState,
+    SpanKind,
+    AttemptOutcome,
 )
+from core.page_core import PageCore, SmartLocatorRun
+from core.screenshots import screenshot_settings, attachment_writer
+from core.tracing import trace_checkpoint
+from core.instrumentation import span
+from core.deadline import budgeted_timeout, BudgetExceededError
+from core.event_log import action_events
+from core.response_capture import response_capture_for, CapturedResponse
+from core.extraction import EXTRACT_FIELDS_JS, WAIT_FOR_FIELDS_JS, FieldSpec
+from core.ready_condition import ReadyCondition
 import allure
 
+PARSE_NUMBER_JS = "el => parseFloat(el.textContent.replace(/[^0-9.]/g, ''))"
 
-class BasePage:
-    def __init__(self, page: Page):
-        self.page = page
+
+class BasePage(PageCore):
+    def __init__(self, page: Page, site: str = None):
+        super().__init__(page, site)
+
+    def capture_responses(self, patterns: list[str]) -> None:
+        # Must be called before the responses happen; page objects do it in __init__
+        response_capture_for(self.page.context).watch(patterns)
+
+    def captured_json(self, pattern: str, since: Optional[float] = None) -> Optional[CapturedResponse]:
+        return response_capture_for(self.page.context).latest(pattern, since)
 
     def go_to(self, url: str):
-        with allure.step(f"Navigate to {url}"):
-            self.page.goto(url)
+        with allure.step(f"Navigate to {url}"), span(SpanKind.NAVIGATION, "go_to", url=url):
+            trace_checkpoint(self.page.context, f"Navigate to {url}")
+            self.page.goto(url, timeout=budgeted_timeout(None))
 
     def _execute_with_smart_locators(self, locators: list[str], action_func, timeout_ms: int = DEFAULT_TIMEOUT_MS):
         action_name = action_func.__name__
-        last_exception = None
-        for attempt_index, selector in enumerate(locators):
+        with span(SpanKind.ACTION, f"smart{action_name}"):
+            return self._run_smart_locators(locators, action_func, action_name, timeout_ms)
+
+    def _run_smart_locators(self, locators: list[str], action_func, action_name: str, timeout_ms: int):
+        run = self._smart_run(locators, action_name, timeout_ms)
+        if run.racing:
+            race_timeout_ms = run.race_timeout()
+            try:
+                with span(SpanKind.RACE, action_name, candidates=len(run.ordered)):
+                    self._race_locators(run, race_timeout_ms)
+            except PlaywrightTimeoutError as e:
+                run.race_lost(e, race_timeout_ms)
+
+        for attempt_index, selector in run.candidates:
             try:
-                element = self.page.locator(selector).first
-                with allure.step(f"Attempting '{action_name}' with locator: {selector}"):
-                    logger.info(f"Attempting '{action_name}' via locator [{attempt_index+1}/{len(locators)}]: {selector}")
-                    action_func(element, timeout=timeout_ms)
-                    logger.info(f"Successfully executed '{action_name}' on locator: {selector}")
-                    return element
+                element = self._locate(selector, visible_only=run.racing)
+                with action_events.step(action_name, selector), span(SpanKind.ATTEMPT, selector, action=action_name):
+                    action_func(element, timeout=run.attempting(attempt_index, selector))
+                run.succeeded(attempt_index, selector)
+                return element
+            except BudgetExceededError:
+                # No time left for the remaining fallbacks
+                raise
             except PlaywrightTimeoutError as e:
-                logger.warning(f"Timeout executing '{action_name}' on locator: {selector}")
-                last_exception = e
+                run.failed(attempt_index, selector, AttemptOutcome.TIMED_OUT, e)
             except Exception as e:
-                logger.warning(f"Unexpected error executing '{action_name}' on locator: {selector}. Error: {e}")
-                last_exception = e
+                run.failed(attempt_index, selector, AttemptOutcome.ERROR, e)
 
-        failure_message = f"Failed to execute '{action_name}' after trying all locators: {locators}. Last Error: {last_exception}"
-        logger.error(failure_message)
-        failure_screenshot = self.page.screenshot()
-        allure.attach(failure_screenshot, name=f"failed_{action_name}", attachment_type=allure.attachment_type.PNG)
+        failure_message = run.exhausted()
+        self.take_screenshot(f"failed_{action_name}", on_failure=True)
         raise Exception(failure_message)
 
+    def _race_locators(self, run: SmartLocatorRun, timeout_ms: float) -> None:
+        # Wait once for whichever candidate becomes visible first, then pick the
+        # highest-priority visible one so JSON order still decides the winner.
+        self._race_locator(run.ordered).wait_for(state=ElementState.VISIBLE, timeout=timeout_ms)
+        position = next(
+            (position for position, selector in enumerate(run.ordered) if self._locate(selector, visible_only=True).count() > 0),
+            None,
+        )
+        message = run.race_won(position)
+        if message:
+            with allure.step(message):
+                logger.info(message)
+
     def smart_click(self, locators: list[str], timeout_ms: int = DEFAULT_TIMEOUT_MS):
         def _click(element, timeout):
             element.click(timeout=timeout)
@@ -62,17 +108,77 @@ class BasePage:
         extracted_numbers = []
         def _get_number(element, timeout):
             element.wait_for(state=ElementState.VISIBLE, timeout=timeout)
-            value = element.evaluate("el => parseFloat(el.textContent.replace(/[^0-9.]/g, ''))") 
+            value = element.evaluate(PARSE_NUMBER_JS)
             extracted_numbers.append(float(value))
         self._execute_with_smart_locators(locators, _get_number, timeout_ms)
         return extracted_numbers[0] if extracted_numbers else 0.0
 
-    def take_screenshot(self, name: str):
-        screenshot_bytes = self.page.screenshot()
-        allure.attach(screenshot_bytes, name=name, attachment_type=allure.attachment_type.PNG)
+    def smart_extract(self, fields: dict[str, FieldSpec], timeout_ms: int = DEFAULT_TIMEOUT_MS) -> dict:
+        # Reads many fields in one in-page evaluation (polling in the page until every
+        # required field resolves), instead of one smart_get_* round trip loop per field.
+        with span(SpanKind.ACTION, "smart_extract", fields=len(fields)):
+            run = self._extraction(fields, timeout_ms)
+            result = self.page.evaluate(EXTRACT_FIELDS_JS, run.arg)
+            if not result["complete"]:
+                try:
+                    with span(SpanKind.WAIT, "smart_extract"):
+                        result = self.page.wait_for_function(WAIT_FOR_FIELDS_JS, arg=run.arg, timeout=run.wait_timeout()).json_value()
+                except PlaywrightTimeoutError:
+                    result = self.page.evaluate(EXTRACT_FIELDS_JS, run.arg)
+            failure_message = run.finish(result)
+            if failure_message:
+                allure.attach("\n".join(run.diagnostics), name="smart_extract diagnostics")
+                self.take_screenshot("failed_smart_extract", on_failure=True)
+                raise Exception(failure_message)
+            return run.values(result)
+
+    def take_screenshot(self, name: str, on_failure: bool = False):
+        if not screenshot_settings.should_capture(on_failure):
+            return
+        with span(SpanKind.SCREENSHOT, name):
+            screenshot_bytes = self.page.screenshot(**screenshot_settings.capture_options())
+        attachment_writer.attach(screenshot_bytes, name, screenshot_settings.attachment_type)
 
     def wait_for_page_load(self):
-        self.page.wait_for_load_state(LoadState.DOM_CONTENT)
+        with span(SpanKind.WAIT, "wait_for_page_load"):
+            self.page.wait_for_load_state(LoadState.DOM_CONTENT, timeout=budgeted_timeout(None))
 
     def wait_for_network_idle(self):
-        self.page.wait_for_load_state(LoadState.NETWORK_IDLE)
+        with span(SpanKind.WAIT, "wait_for_network_idle"):
+            self.page.wait_for_load_state(LoadState.NETWORK_IDLE, timeout=budgeted_timeout(None))
+
+    @contextmanager
+    def expect_ready(self):
+        # Wrap the action that makes the section busy. Waits on the section's declared
+        # "ready" condition, or falls back to network idle when none is declared.
+        ready = self.ready_condition
+        if ready is None:
+            yield
+            self.wait_for_network_idle()
+            return
+        with allure.step(f"Wait until ready: {ready.describe()}"):
+            if ready.response_pattern:
+                with self.page.expect_response(ready.response_pattern, timeout=budgeted_timeout(ready.timeout_ms)):
+                    yield
+            else:
+                yield
+            self._wait_for_ready_state(ready)
+
+    def wait_until_ready(self):
+        # No triggering action to observe, so only selector/predicate parts can be awaited
+        ready = self.ready_condition
+        if ready is None or not (ready.selectors or ready.predicate):
+            self.wait_for_network_idle()
+            return
+        with allure.step(f"Wait until ready: {ready.describe()}"):
+            self._wait_for_ready_state(ready)
+
+    def _wait_for_ready_state(self, ready: ReadyCondition):
+        with span(SpanKind.WAIT, f"wait_until_ready[{self._SECTION}]"):
+            self._wait_for_ready_parts(ready)
+
+    def _wait_for_ready_parts(self, ready: ReadyCondition):
+        if ready.selectors:
+            self._ready_locator(ready).wait_for(state=ready.state, timeout=budgeted_timeout(ready.timeout_ms))
+        if ready.predicate:
+            self.page.wait_for_function(ready.predicate, timeout=budgeted_timeout(ready.timeout_ms))
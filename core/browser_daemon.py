@@ -0,0 +1,383 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: leases of attached processes are not serialised
+    fcntl = None
+
+from playwright.sync_api import Playwright, Browser, BrowserContext, Page, sync_playwright
+
+from config.settings import (
+    logger,
+    IS_CI,
+    CHROMIUM_ARGS,
+    REAL_USER_AGENT,
+    BROWSER_DAEMON,
+    BROWSER_DAEMON_SHARED_CONTEXT,
+    BROWSER_DAEMON_STATE_PATH,
+    BROWSER_DAEMON_PROFILE_DIR,
+    BROWSER_DAEMON_PORT,
+    BROWSER_DAEMON_IDLE_SECONDS,
+)
+from core.constants import (
+    LoadState,
+    DAEMON_HEALTH_INTERVAL_SECONDS,
+    DAEMON_HEALTH_TIMEOUT_SECONDS,
+    DAEMON_START_TIMEOUT_SECONDS,
+)
+from core.local_site import LocalSite
+from data.data_loader import load_test_params
+from data.site_profile import site_profile
+from data.locator_keys import HomeKeys
+
+_VERSION_PATH = "/json/version"
+_STATE_ENDPOINT, _STATE_PID, _STATE_PROFILE, _STATE_STARTED_AT = "endpoint", "pid", "profile_dir", "started_at"
+_LEASE_LOCK_SUFFIX = ".lease"
+# Everything an origin keeps besides cookies (cleared separately) and the HTTP cache (the point of sharing)
+_ORIGIN_STORAGE_TYPES = "local_storage,indexeddb,websql,service_workers,cache_storage,file_systems"
+_WEB_SCHEMES = ("http", "https")
+
+_attached = False
+
+
+def read_daemon_state(state_path: str = BROWSER_DAEMON_STATE_PATH) -> Optional[dict]:
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_healthy(endpoint: str) -> bool:
+    try:
+        with urllib.request.urlopen(endpoint + _VERSION_PATH, timeout=DAEMON_HEALTH_TIMEOUT_SECONDS) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def attach_to_daemon(playwright: Playwright) -> Optional[Browser]:
+    # Returns None (and the caller launches its own browser) unless a healthy daemon is running
+    global _attached
+    if not BROWSER_DAEMON:
+        return None
+    state = read_daemon_state()
+    if not state or not is_healthy(state[_STATE_ENDPOINT]):
+        return None
+    try:
+        browser = playwright.chromium.connect_over_cdp(state[_STATE_ENDPOINT])
+    except Exception as e:
+        logger.warning(f"Could not attach to the browser daemon at {state[_STATE_ENDPOINT]}: {e}")
+        return None
+    _attached = True
+    touch_daemon_lease()
+    return browser
+
+
+def touch_daemon_lease() -> None:
+    # The daemon shuts down once its state file has gone untouched for the idle timeout
+    if not _attached:
+        return
+    try:
+        os.utime(BROWSER_DAEMON_STATE_PATH)
+    except OSError:
+        pass
+
+
+def daemon_context(browser: Browser) -> Optional[BrowserContext]:
+    # The daemon profile's own context, whose disk cache the warm-up filled, when
+    # BROWSER_DAEMON_SHARED_CONTEXT opts in. Contexts from browser.new_context() are
+    # isolated (the default) but incognito, so they start with an empty cache.
+    if not (_attached and BROWSER_DAEMON_SHARED_CONTEXT) or not browser.contexts:
+        return None
+    return browser.contexts[0]
+
+
+class CacheHitStats:
+    # Counts the responses of a context's new pages by whether Chromium served them from
+    # its HTTP cache (Network domain events of a CDP session per page)
+    def __init__(self):
+        self.responses = 0
+        self._cached   = set()
+
+    def watch(self, context: BrowserContext) -> None:
+        context.on("page", self._watch_page)
+
+    def unwatch(self, context: BrowserContext) -> None:
+        context.remove_listener("page", self._watch_page)
+
+    def summary(self) -> dict:
+        return {
+            "responses":         self.responses,
+            "served_from_cache": len(self._cached),
+            "hit_rate":          round(len(self._cached) / self.responses, 3) if self.responses else 0.0,
+        }
+
+    def _watch_page(self, page: Page) -> None:
+        session = page.context.new_cdp_session(page)
+        session.on("Network.responseReceived", self._on_response)
+        session.on("Network.requestServedFromCache", lambda event: self._cached.add(event["requestId"]))
+        session.send("Network.enable")
+
+    def _on_response(self, event: dict) -> None:
+        self.responses += 1
+        response = event["response"]
+        if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            self._cached.add(event["requestId"])
+
+
+class DaemonContextLease:
+    # One test's turn in the daemon's profile context. Only the HTTP cache is shared: cookies,
+    # permissions and the storage of every origin the test visited are cleared around the test,
+    # pages it opened are closed, and its storage state (cookies and localStorage) is restored.
+    # Leases of every process attached to the daemon are serialised by a lock file.
+    def __init__(self, context: BrowserContext, storage_state_path: Optional[str] = None):
+        self.context       = context
+        self.cache_stats   = CacheHitStats()
+        self._pages_before = set(context.pages)
+        self._origins      = set()
+        self._lock_file    = _lock_daemon_leases()
+        try:
+            state = _read_storage_state(storage_state_path)
+            self._origins.update(origin["origin"] for origin in state.get("origins", []))
+            self._reset()
+            self._restore(state)
+        except BaseException:
+            _unlock_daemon_leases(self._lock_file)
+            raise
+        context.on("page", self._track_origins)
+        self.cache_stats.watch(context)
+
+    def release(self) -> dict:
+        try:
+            self.cache_stats.unwatch(self.context)
+            self.context.remove_listener("page", self._track_origins)
+            for page in self.context.pages:
+                if page not in self._pages_before:
+                    page.close()
+            self._reset()
+        finally:
+            _unlock_daemon_leases(self._lock_file)
+        return self.cache_stats.summary()
+
+    def _reset(self) -> None:
+        self.context.clear_cookies()
+        self.context.clear_permissions()
+        if not self._origins:
+            return
+        session = self.context.browser.new_browser_cdp_session()
+        try:
+            for origin in sorted(self._origins):
+                session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": _ORIGIN_STORAGE_TYPES})
+        finally:
+            session.detach()
+
+    def _restore(self, state: dict) -> None:
+        if state.get("cookies"):
+            self.context.add_cookies(state["cookies"])
+        origins = [origin for origin in state.get("origins", []) if origin.get("localStorage")]
+        if not origins:
+            return
+        # DOM storage of any origin can be written through a blank page's CDP session
+        page = self.context.new_page()
+        try:
+            session = self.context.new_cdp_session(page)
+            session.send("DOMStorage.enable")
+            for origin in origins:
+                storage_id = {"securityOrigin": origin["origin"], "isLocalStorage": True}
+                for item in origin["localStorage"]:
+                    session.send("DOMStorage.setDOMStorageItem", {"storageId": storage_id, "key": item["name"], "value": item["value"]})
+            session.detach()
+        finally:
+            page.close()
+
+    def _track_origins(self, page: Page) -> None:
+        page.on("framenavigated", lambda frame: self._remember_origin(frame.url))
+
+    def _remember_origin(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme in _WEB_SCHEMES:
+            self._origins.add(f"{parts.scheme}://{parts.netloc}")
+
+
+def _read_storage_state(path: Optional[str]) -> dict:
+    if not path:
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _lock_daemon_leases():
+    if fcntl is None:
+        return None
+    lock_file = open(f"{BROWSER_DAEMON_STATE_PATH}{_LEASE_LOCK_SUFFIX}", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        logger.info("Waiting for another run's test to release the shared daemon context")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+
+def _unlock_daemon_leases(lock_file) -> None:
+    if lock_file is None:
+        return
+    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    lock_file.close()
+
+
+def warm_up_sites() -> list[str]:
+    # Every live site of the current test data; bundled local sites are served from disk anyway
+    sites = dict.fromkeys(case[0] for case in load_test_params())
+    return [site for site in sites if not LocalSite.for_site(site)]
+
+
+class BrowserDaemon:
+    # A Chromium with a persistent profile (disk cache, cookies of the warm-up visits) and a
+    # CDP port. Test runs connect to it and open their own isolated contexts, or lease its
+    # profile context with BROWSER_DAEMON_SHARED_CONTEXT.
+    def __init__(self, port: int, profile_dir: str, state_path: str, idle_seconds: int, headless: bool):
+        self.port         = port
+        self.profile_dir  = os.path.abspath(profile_dir)
+        self.state_path   = state_path
+        self.idle_seconds = idle_seconds
+        self.headless     = headless
+        self.endpoint     = f"http://127.0.0.1:{port}"
+        self._process     = None
+        self._stop        = threading.Event()
+
+    def run(self, sites: list[str]) -> None:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        self._launch()
+        try:
+            self._warm_up(sites)
+            self._write_state()
+            self._watch()
+        finally:
+            self._shutdown()
+
+    def _launch(self) -> None:
+        with sync_playwright() as playwright:
+            executable = playwright.chromium.executable_path
+        command = [
+            executable,
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.profile_dir}",
+            f"--user-agent={REAL_USER_AGENT}",
+            *CHROMIUM_ARGS,
+        ]
+        if self.headless:
+            command.append("--headless=new")
+        self._process = subprocess.Popen(command + ["about:blank"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT_SECONDS
+        while not is_healthy(self.endpoint):
+            if self._process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Daemon browser did not open its CDP port {self.port} (exit code {self._process.poll()})")
+            time.sleep(DAEMON_HEALTH_TIMEOUT_SECONDS / 10)
+        logger.info(f"Browser daemon started (pid {self._process.pid}, profile {self.profile_dir}, CDP {self.endpoint})")
+
+    def _warm_up(self, sites: list[str]) -> None:
+        # The driver connection is dropped when sync_playwright exits; the browser keeps running
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.connect_over_cdp(self.endpoint)
+            page = browser.contexts[0].new_page()
+            for site in sites:
+                url = site_profile(site).section("home")[HomeKeys.URL]
+                started = time.perf_counter()
+                try:
+                    page.goto(url, wait_until=LoadState.DOM_CONTENT)
+                    logger.info(f"Warmed up {site} ({url}) in {(time.perf_counter() - started) * 1000:.0f}ms")
+                except Exception as e:
+                    logger.warning(f"Warm-up of {site} ({url}) failed: {e}")
+            page.close()
+
+    def _write_state(self) -> None:
+        state = {
+            _STATE_ENDPOINT:   self.endpoint,
+            _STATE_PID:        os.getpid(),
+            _STATE_PROFILE:    self.profile_dir,
+            _STATE_STARTED_AT: time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(DAEMON_HEALTH_INTERVAL_SECONDS):
+            if not is_healthy(self.endpoint):
+                logger.error("Browser daemon failed its health check — shutting down")
+                return
+            try:
+                idle_for = time.time() - os.path.getmtime(self.state_path)
+            except OSError:
+                logger.info("Browser daemon state file removed — shutting down")
+                return
+            if idle_for > self.idle_seconds:
+                logger.info(f"Browser daemon idle for {idle_for:.0f}s — shutting down")
+                return
+
+    def _request_stop(self, signum, frame) -> None:
+        self._stop.set()
+
+    def _shutdown(self) -> None:
+        state = read_daemon_state(self.state_path)
+        if state and state.get(_STATE_PID) == os.getpid():
+            os.remove(self.state_path)
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        logger.info("Browser daemon stopped")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Keep a warm Chromium with a persistent profile running between test runs")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--sites", default=None, help="comma-separated sites to warm up (default: live sites of the test data)")
+    options = parser.parse_args(argv)
+
+    state = read_daemon_state()
+    if options.command == "status":
+        healthy = bool(state) and is_healthy(state[_STATE_ENDPOINT])
+        logger.info(f"Browser daemon {'running' if healthy else 'not running'}{f': {state}' if state else ''}")
+        return 0 if healthy else 1
+    if options.command == "stop":
+        if not state:
+            logger.info("Browser daemon not running")
+            return 0
+        try:
+            os.kill(state[_STATE_PID], signal.SIGTERM)
+        except ProcessLookupError:
+            logger.info("Browser daemon process already gone — removing its stale state file")
+            os.remove(BROWSER_DAEMON_STATE_PATH)
+        return 0
+    if state and is_healthy(state[_STATE_ENDPOINT]):
+        logger.info(f"Browser daemon already running at {state[_STATE_ENDPOINT]}")
+        return 0
+    sites = options.sites.split(",") if options.sites else warm_up_sites()
+    BrowserDaemon(
+        port=BROWSER_DAEMON_PORT,
+        profile_dir=BROWSER_DAEMON_PROFILE_DIR,
+        state_path=BROWSER_DAEMON_STATE_PATH,
+        idle_seconds=BROWSER_DAEMON_IDLE_SECONDS,
+        headless=IS_CI,
+    ).run(sites)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,36 +4,173 @@ from enum import Enum
 # Timeouts
 # ---------------------------------------------------------------------------
 DEFAULT_TIMEOUT_MS = 5000
+READY_TIMEOUT_MS   = 15000  # budget for a section's declared "ready" condition
+
+# ---------------------------------------------------------------------------
+# Adaptive locator statistics
+# ---------------------------------------------------------------------------
+LOCATOR_STATS_WINDOW          = 50     # most recent attempts kept per selector
+LOCATOR_STATS_MAX_AGE_DAYS    = 14     # attempts older than this are forgotten
+LOCATOR_STATS_MIN_SAMPLES     = 5      # successes needed before a p95 timeout is trusted
+ADAPTIVE_TIMEOUT_PERCENTILE   = 0.95
+ADAPTIVE_TIMEOUT_MARGIN       = 1.5    # headroom multiplier on the observed p95
+ADAPTIVE_TIMEOUT_FLOOR_MS     = 1000
+DEAD_SELECTOR_MIN_ATTEMPTS    = 5      # failures in a row (with no success) before a selector is reported dead
 
 class ElementState(str, Enum):
     VISIBLE  = "visible"
     ATTACHED = "attached"
+    HIDDEN   = "hidden"
+    DETACHED = "detached"
 
 
 class LoadState(str, Enum):
+    COMMIT       = "commit"
     DOM_CONTENT  = "domcontentloaded"
     NETWORK_IDLE = "networkidle"
 
 
-class HtmlAttr(str, Enum):
-    HREF          = "href"
-    VALUE         = "value"
-    ARIA_CONTROLS = "aria-controls"
+class LocatorResolution(str, Enum):
+    SEQUENTIAL = "sequential"
+    RACE       = "race"
+
+
+# ---------------------------------------------------------------------------
+# Logging pipeline (core/event_log.py)
+# ---------------------------------------------------------------------------
+EVENTS_OUTPUT_DIR = "events"
+
+
+class LogPipeline(str, Enum):
+    SYNC  = "sync"
+    QUEUE = "queue"
+
+
+class LogVerbosity(str, Enum):
+    STEPS   = "steps"
+    SUMMARY = "summary"
+
 
+class AttemptOutcome(str, Enum):
+    SUCCEEDED = "succeeded"
+    TIMED_OUT = "timed_out"
+    ERROR     = "error"
 
-class HtmlTag(str, Enum):
-    OPTION = "option"
+
+# JSON responses kept per browser context by core/response_capture.py
+CAPTURED_RESPONSES_LIMIT = 50
+
+# Playwright selector filter that keeps only visible matches of the current scope
+VISIBLE_ONLY_SELECTOR = "visible=true"
+
+
+# Value parsers for BasePage.smart_extract fields
+class FieldParser(str, Enum):
+    TEXT      = "text"
+    NUMBER    = "number"
+    CURRENCY  = "currency"
+    ATTRIBUTE = "attribute"
+
+
+# Variant widget families, as reported by the in-page variant discovery
+class VariantKind(str, Enum):
+    LISTBOX = "listbox"
+    SELECT  = "select"
+    BUTTON  = "button"
 
 
 # Sentinel for a disabled / placeholder <select> option
 INVALID_SELECT_VALUE = "-1"
 
+# Query parameters that only carry tracking/ranking data — stripped so the same
+# listing reached from different result positions dedups to one URL
+TRACKING_QUERY_PARAMS = frozenset({
+    "_skw", "_trkparms", "_trksid", "_ul", "amdata", "epid", "hash",
+    "itmmeta", "itmprp", "mkcid", "mkevt", "mkrid", "campid", "customid",
+    "toolid", "siteid", "ssspo", "sssrc", "ssuid", "widget_ver",
+})
+TRACKING_QUERY_PARAM_PREFIXES = ("utm_",)
+
+class NetworkMode(str, Enum):
+    LIVE   = "live"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+HAR_FILE_SUFFIX = ".har.zip"
+
 # ---------------------------------------------------------------------------
 # Parametrize param names
 # ---------------------------------------------------------------------------
 PARAM_SITE = "site"
 
+# Marker of the async Playwright suite, which runs in a pytest process of its own
+ASYNC_STACK_MARKER = "async_stack"
+
 # ---------------------------------------------------------------------------
 # Output paths
 # ---------------------------------------------------------------------------
-TRACE_OUTPUT_PATH = "test_trace.zip"
+TRACE_OUTPUT_DIR   = "traces"
+METRICS_OUTPUT_DIR = "metrics"
+
+
+class ScreenshotPolicy(str, Enum):
+    NEVER        = "never"
+    FAILURE_ONLY = "failure-only"
+    ALWAYS       = "always"
+
+
+class ScreenshotFormat(str, Enum):
+    PNG  = "png"
+    JPEG = "jpeg"
+
+
+class TraceMode(str, Enum):
+    OFF        = "off"
+    ON_FAILURE = "on-failure"
+    ALWAYS     = "always"
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation span kinds
+# ---------------------------------------------------------------------------
+class SpanKind(str, Enum):
+    NAVIGATION = "navigation"
+    ACTION     = "action"
+    RACE       = "race"
+    ATTEMPT    = "attempt"
+    WAIT       = "wait"
+    SCREENSHOT = "screenshot"
+
+
+# ---------------------------------------------------------------------------
+# Parallel runner
+# ---------------------------------------------------------------------------
+# How often an idle worker asks again while the remaining cases are held back by site caps
+WORK_QUEUE_POLL_SECONDS = 0.2
+# Time allowed for `playwright launch-server` to print its websocket endpoint
+BROWSER_SERVER_START_TIMEOUT_SECONDS = 60
+
+
+class CaseOutcome(str, Enum):
+    PASSED  = "passed"
+    FAILED  = "failed"
+    SKIPPED = "skipped"
+    CRASHED = "crashed"
+
+
+# ---------------------------------------------------------------------------
+# Browser daemon
+# ---------------------------------------------------------------------------
+DAEMON_HEALTH_INTERVAL_SECONDS = 15
+DAEMON_HEALTH_TIMEOUT_SECONDS  = 2
+DAEMON_START_TIMEOUT_SECONDS   = 30
+
+
+# ---------------------------------------------------------------------------
+# Time budgets
+# ---------------------------------------------------------------------------
+# Largest consumers listed when a budget runs out
+BUDGET_REPORT_TOP_N = 8
+# pytest marker overriding TEST_BUDGET_SECONDS for one test: @pytest.mark.budget(seconds)
+BUDGET_MARKER = "budget"
@@ -0,0 +1,137 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.constants import BUDGET_REPORT_TOP_N
+
+# Innermost open budget; a ContextVar so concurrent asyncio tasks draw from the budget
+# that was open when they were created
+_current_budget = ContextVar("current_budget", default=None)
+
+_UNTRACKED = "(untracked)"
+
+
+class Budget:
+    # Wall-clock allowance for a test or page operation. Budgeted waits are clamped to what is
+    # left of it (and of every enclosing budget); their durations are charged per label so an
+    # exhausted budget can report where the time went.
+    __slots__ = ("name", "total_ms", "parent", "_started", "_charges")
+
+    def __init__(self, name: str, total_ms: float, parent: Optional["Budget"]):
+        self.name     = name
+        self.total_ms = total_ms
+        self.parent   = parent
+        self._started = time.perf_counter()
+        self._charges = defaultdict(lambda: [0.0, 0])
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def own_remaining_ms(self) -> float:
+        return self.total_ms - self.elapsed_ms()
+
+    def remaining_ms(self) -> float:
+        remaining = self.own_remaining_ms()
+        return remaining if self.parent is None else min(remaining, self.parent.remaining_ms())
+
+    def exhausted(self) -> Optional["Budget"]:
+        # The innermost budget (this one or an enclosing one) with no time left
+        budget = self
+        while budget is not None:
+            if budget.own_remaining_ms() <= 0:
+                return budget
+            budget = budget.parent
+        return None
+
+    def charge(self, label: str, duration_ms: float) -> None:
+        budget = self
+        while budget is not None:
+            entry = budget._charges[label]
+            entry[0] += duration_ms
+            entry[1] += 1
+            budget = budget.parent
+
+    def breakdown(self) -> list[tuple[str, float, int]]:
+        # (label, ms, count), largest first. Only leaf spans are charged, so entries do not
+        # overlap and the rest of the elapsed time is reported as untracked.
+        entries = sorted(((label, ms, count) for label, (ms, count) in self._charges.items()), key=lambda entry: -entry[1])
+        untracked_ms = self.elapsed_ms() - sum(ms for _, ms, _ in entries)
+        if untracked_ms >= 1:
+            entries.append((_UNTRACKED, untracked_ms, 0))
+        return entries
+
+    def report(self) -> str:
+        lines = [f"Time budget '{self.name}' ({self.total_ms / 1000:.1f}s): {self.elapsed_ms() / 1000:.1f}s used"]
+        entries = self.breakdown()
+        for label, ms, count in entries[:BUDGET_REPORT_TOP_N]:
+            lines.append(f"  {ms / 1000:7.2f}s  {label}" + (f" ({count}x)" if count > 1 else ""))
+        if len(entries) > BUDGET_REPORT_TOP_N:
+            rest_ms = sum(ms for _, ms, _ in entries[BUDGET_REPORT_TOP_N:])
+            lines.append(f"  {rest_ms / 1000:7.2f}s  {len(entries) - BUDGET_REPORT_TOP_N} more")
+        return "\n".join(lines)
+
+
+class BudgetExceededError(TimeoutError):
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        super().__init__(f"Time budget exceeded\n{budget.report()}")
+
+
+@contextmanager
+def deadline(name: str, total_seconds: float):
+    # total_seconds <= 0 opens no budget; nested waits keep their own timeouts (within any enclosing budget)
+    if total_seconds <= 0:
+        yield current_budget()
+        return
+    budget = Budget(name, total_seconds * 1000, _current_budget.get())
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def current_budget() -> Optional[Budget]:
+    return _current_budget.get()
+
+
+def budgeted_timeout(requested_ms: Optional[float]) -> Optional[float]:
+    # The timeout to pass to Playwright: the requested one clamped to the remaining budget.
+    # None requests Playwright's default, which only a budget can shorten.
+    budget = _current_budget.get()
+    if budget is None:
+        return requested_ms
+    remaining_ms = budget.remaining_ms()
+    if remaining_ms <= 0:
+        raise BudgetExceededError(budget.exhausted() or budget)
+    # Playwright treats 0 as "no timeout"
+    remaining_ms = max(1, int(remaining_ms))
+    return remaining_ms if requested_ms is None else min(requested_ms, remaining_ms)
+
+
+@contextmanager
+def charged(label: str):
+    # Charges the block's duration to the open budgets; a Playwright timeout that ran the
+    # budget dry is re-raised as BudgetExceededError carrying the breakdown
+    budget = _current_budget.get()
+    if budget is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    except PlaywrightTimeoutError as e:
+        budget.charge(label, (time.perf_counter() - started) * 1000)
+        exhausted = budget.exhausted()
+        if exhausted is not None:
+            raise BudgetExceededError(exhausted) from e
+        raise
+    except BaseException:
+        budget.charge(label, (time.perf_counter() - started) * 1000)
+        raise
+    else:
+        budget.charge(label, (time.perf_counter() - started) * 1000)
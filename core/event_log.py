@@ -0,0 +1,178 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Callable
+
+import allure
+
+from config.settings import logger, LOG_PIPELINE, LOG_VERBOSITY
+from core.constants import EVENTS_OUTPUT_DIR, AttemptOutcome, LogPipeline, LogVerbosity
+from core.tracing import trace_file_stem
+
+# One selector attempt: (timestamp, log prefix, action, selector, attempt index, candidates, duration ms, outcome, error)
+_EVENT_FIELDS = ("ts", "prefix", "action", "selector", "attempt", "candidates", "duration_ms", "outcome", "error")
+
+# Events of the running test, only collected with the queue pipeline (they feed its event
+# files). A ContextVar so the asyncio tasks of one test append to that test's list.
+_test_events = ContextVar("test_events", default=None)
+
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    # The queue never leaves the process, so the record can travel unformatted and
+    # the listener thread does the formatting
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class ActionEvents:
+    # Selector attempts of smart actions as structured events. With the queue pipeline,
+    # formatting, log output and the per-test event files are produced on a background
+    # thread; the browser-driving code only appends tuples. With `summary` verbosity a
+    # passing action becomes one log line and its attempts get no Allure step.
+    def __init__(self, pipeline: str, verbosity: str):
+        self.pipeline   = LogPipeline(pipeline)
+        self.verbosity  = LogVerbosity(verbosity)
+        self._queue     = queue.Queue()
+        self._thread    = None
+        self._lock      = threading.Lock()
+        self._listener  = None
+
+    @property
+    def queued(self) -> bool:
+        return self.pipeline == LogPipeline.QUEUE
+
+    @property
+    def verbose(self) -> bool:
+        return self.verbosity == LogVerbosity.STEPS
+
+    def install(self) -> None:
+        # Moves the root logger's handlers behind a queue served by a listener thread
+        if not self.queued or self._listener:
+            return
+        root = logging.getLogger()
+        log_queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+        root.handlers = [_DeferredFormatQueueHandler(log_queue)]
+        self._listener.start()
+
+    # -----------------------------------------------------------------------
+    # Recording (browser-driving thread)
+    # -----------------------------------------------------------------------
+
+    def step(self, action: str, selector: str):
+        if self.verbose:
+            return allure.step(f"Attempting '{action}' with locator: {selector}")
+        return nullcontext()
+
+    def attempting(self, prefix: str, action: str, selector: str, attempt: int, candidates: int) -> None:
+        if self.verbose:
+            self._dispatch(_log_attempting, prefix, action, selector, attempt, candidates)
+
+    def attempted(self, prefix: str, action: str, selector: str, attempt: int, candidates: int,
+                  duration_ms: float, outcome: AttemptOutcome, error: Exception = None) -> tuple:
+        event = (time.time(), prefix, action, selector, attempt, candidates, duration_ms, outcome, str(error) if error else None)
+        events = _test_events.get() if self.queued else None
+        if events is not None:
+            events.append(event)
+        if self.verbose:
+            self._dispatch(_log_attempts, [event])
+        return event
+
+    def action_finished(self, prefix: str, action: str, attempts: list[tuple], succeeded: bool) -> None:
+        if not self.verbose:
+            self._dispatch(_log_action_summary, prefix, action, attempts, succeeded)
+
+    # -----------------------------------------------------------------------
+    # Per-test files
+    # -----------------------------------------------------------------------
+
+    def start_test(self) -> None:
+        if self.queued:
+            _test_events.set([])
+
+    def finish_test(self, test_id: str) -> None:
+        events = _test_events.get()
+        _test_events.set(None)
+        if events:
+            self._dispatch(_write_event_file, test_id, events)
+
+    def flush(self) -> None:
+        if self._thread:
+            self._queue.join()
+
+    def stop(self) -> None:
+        self.flush()
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+
+    def _dispatch(self, func: Callable, *args) -> None:
+        if not self.queued:
+            func(*args)
+            return
+        self._ensure_started()
+        self._queue.put((func, args))
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="action-event-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception as e:
+                logger.warning(f"Action event writer failed in {func.__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def _log_attempting(prefix: str, action: str, selector: str, attempt: int, candidates: int) -> None:
+    logger.info(f"{prefix}Attempting '{action}' via locator [{attempt + 1}/{candidates}]: {selector}")
+
+
+def _log_attempts(events: list[tuple]) -> None:
+    for _, prefix, action, selector, _, _, duration_ms, outcome, error in events:
+        if outcome == AttemptOutcome.SUCCEEDED:
+            logger.info(f"{prefix}Successfully executed '{action}' on locator: {selector} ({duration_ms:.0f}ms)")
+        elif outcome == AttemptOutcome.TIMED_OUT:
+            logger.warning(f"{prefix}Timeout executing '{action}' on locator: {selector} ({duration_ms:.0f}ms)")
+        else:
+            logger.warning(f"{prefix}Unexpected error executing '{action}' on locator: {selector}. Error: {error}")
+
+
+def _log_action_summary(prefix: str, action: str, attempts: list[tuple], succeeded: bool) -> None:
+    if not succeeded:
+        _log_attempts(attempts)
+        return
+    winner = attempts[-1]
+    failed = len(attempts) - 1
+    logger.info(
+        f"{prefix}'{action}' via locator [{winner[4] + 1}/{winner[5]}] {winner[3]} in {winner[6]:.0f}ms"
+        + (f" after {failed} failed attempt(s)" if failed else "")
+    )
+
+
+def _write_event_file(test_id: str, events: list[tuple]) -> None:
+    os.makedirs(EVENTS_OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(EVENTS_OUTPUT_DIR, f"{trace_file_stem(test_id)}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            record = dict(zip(_EVENT_FIELDS, event))
+            record["duration_ms"] = round(record["duration_ms"], 1)
+            record["outcome"] = record["outcome"].value
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+action_events = ActionEvents(LOG_PIPELINE, LOG_VERBOSITY)
+atexit.register(action_events.stop)
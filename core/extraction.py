@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from core.constants import FieldParser
+
+# Resolves every field in one pass. Per field, selectors are tried in order and the first
+# one with a usable element (visible, except for attribute reads) whose value parses wins.
+# Selectors are plain CSS (document.querySelectorAll); invalid ones are reported and skipped.
+EXTRACT_FIELDS_JS = """
+({fields}) => {
+    const visible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+    // Same rules as core.response_capture.to_number: the first amount next to a currency
+    // symbol or code (else the first amount); the last separator is the decimal point unless
+    // it is the only one of its kind and is followed by exactly three digits
+    const money = /(?:[$€£¥₹]|\\b(?:USD|EUR|GBP|CAD|AUD|JPY|CHF|INR|PLN|SEK)\\b)\\s*(\\d(?:[\\d.,]*\\d)?)|(\\d(?:[\\d.,]*\\d)?)\\s*(?:[$€£¥₹]|\\b(?:USD|EUR|GBP|CAD|AUD|JPY|CHF|INR|PLN|SEK)\\b)/;
+    const parseAmount = token => {
+        const lastDot = token.lastIndexOf("."), lastComma = token.lastIndexOf(",");
+        let decimal = null;
+        if (lastDot > -1 && lastComma > -1) decimal = lastDot > lastComma ? "." : ",";
+        else if (lastDot > -1 || lastComma > -1) {
+            const separator = lastDot > -1 ? "." : ",";
+            const count = token.split(separator).length - 1;
+            decimal = count === 1 && token.length - token.lastIndexOf(separator) - 1 !== 3 ? separator : null;
+        }
+        for (const separator of [".", ","]) {
+            if (separator !== decimal) token = token.split(separator).join("");
+        }
+        return parseFloat(decimal ? token.replace(decimal, ".") : token);
+    };
+    const parseCurrency = raw => {
+        const match = raw.match(money) || raw.match(/\\d(?:[\\d.,]*\\d)?/);
+        if (!match) return null;
+        const value = parseAmount(match[1] || match[2] || match[0]);
+        return Number.isNaN(value) ? null : value;
+    };
+    const parsers = {
+        text:      el => (el.innerText ?? el.textContent).trim(),
+        number:    el => { const value = parseFloat(el.textContent.replace(/[^0-9.]/g, "")); return Number.isNaN(value) ? null : value; },
+        currency:  el => parseCurrency(el.textContent),
+        attribute: (el, attribute) => el.getAttribute(attribute),
+    };
+    const resolved = {};
+    let complete = true;
+    for (const [name, field] of Object.entries(fields)) {
+        const tried = [];
+        let hit = null;
+        for (let index = 0; index < field.selectors.length && !hit; index++) {
+            const selector = field.selectors[index];
+            let matches;
+            try { matches = Array.from(document.querySelectorAll(selector)); }
+            catch (e) { tried.push({selector, error: "invalid selector"}); continue; }
+            const usable = field.parser === "attribute" ? matches : matches.filter(visible);
+            const value = usable.length ? parsers[field.parser](usable[0], field.attribute) : null;
+            tried.push({selector, matches: matches.length, usable: usable.length, parsed: value !== null});
+            if (value !== null) hit = {value, selector, index};
+        }
+        resolved[name] = Object.assign({value: null, selector: null, index: -1}, hit, {tried});
+        if (!hit && field.required) complete = false;
+    }
+    return {complete, fields: resolved};
+}
+"""
+
+# wait_for_function variant: keeps polling until every required field resolves
+WAIT_FOR_FIELDS_JS = f"arg => {{ const result = ({EXTRACT_FIELDS_JS.strip()})(arg); return result.complete ? result : false; }}"
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    selectors: list[str]
+    parser:    FieldParser   = FieldParser.TEXT
+    attribute: Optional[str] = None
+    required:  bool          = True
+
+    def to_js(self, ordered_selectors: list[str]) -> dict:
+        return {
+            "selectors": ordered_selectors,
+            "parser":    FieldParser(self.parser).value,
+            "attribute": self.attribute,
+            "required":  self.required,
+        }
+
+
+def describe_field(name: str, field: dict, selector_count: int) -> str:
+    attempts = ", ".join(
+        f"{attempt['selector']} ({attempt['error']})" if "error" in attempt
+        else f"{attempt['selector']} ({attempt['matches']} match / {attempt['usable']} usable / {'parsed' if attempt['parsed'] else 'unparsable'})"
+        for attempt in field["tried"]
+    )
+    if field["index"] < 0:
+        return f"Field '{name}' unresolved after: {attempts}"
+    return f"Field '{name}' = {field['value']!r} via [{field['index'] + 1}/{selector_count}] {field['selector']} — tried {attempts}"
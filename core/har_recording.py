@@ -0,0 +1,41 @@
+import os
+import re
+
+from config.settings import logger, HAR_DIR
+from core.constants import NetworkMode, HAR_FILE_SUFFIX
+
+_UNSAFE_SLUG_CHARS = re.compile(r"[^\w-]+")
+_HAR_MODE_MINIMAL  = "minimal"
+_HAR_NOT_FOUND     = "abort"
+
+
+class MissingRecordingError(FileNotFoundError):
+    pass
+
+
+def har_path(site: str, query: str) -> str:
+    query_slug = _UNSAFE_SLUG_CHARS.sub("_", query.lower()).strip("_") or "default"
+    return os.path.join(HAR_DIR, site, f"{query_slug}{HAR_FILE_SUFFIX}")
+
+
+def har_context_options(mode: str, site: str, query: str) -> dict:
+    # Recording has to be configured when the context is created
+    if NetworkMode(mode) != NetworkMode.RECORD:
+        return {}
+    path = har_path(site, query)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    logger.info(f"Recording network traffic for ({site}, {query}) to {path}")
+    return {"record_har_path": path, "record_har_mode": _HAR_MODE_MINIMAL}
+
+
+def replay_har(context, mode: str, site: str, query: str) -> None:
+    if NetworkMode(mode) != NetworkMode.REPLAY:
+        return
+    path = har_path(site, query)
+    if not os.path.exists(path):
+        raise MissingRecordingError(
+            f"No recording for ({site}, {query}) at {path} — run once with --network-mode=record"
+        )
+    # Anything not in the recording is aborted so a replayed run never touches the network
+    context.route_from_har(path, not_found=_HAR_NOT_FOUND)
+    logger.info(f"Replaying network traffic for ({site}, {query}) from {path}")
@@ -0,0 +1,238 @@
+import html
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+from core.constants import SpanKind
+from core.tracing import trace_file_stem
+from core.deadline import charged
+
+_METRIC_PREFIX = "ecommerce"
+_FLAME_ROW_PX  = 22
+
+# Innermost open span of the running flow; a ContextVar so concurrent asyncio
+# tasks (async stack) each build their own branch of the tree
+_current_span = ContextVar("current_span", default=None)
+# Recorder of the running test; a ContextVar so tasks started during the test record into it
+_active_recorder = ContextVar("active_recorder", default=None)
+
+# Spans that wait on the browser themselves; their time is charged to the open time budgets.
+# Actions are left out because they only enclose races and attempts.
+_BUDGETED_KINDS = frozenset({SpanKind.NAVIGATION, SpanKind.RACE, SpanKind.ATTEMPT, SpanKind.WAIT, SpanKind.SCREENSHOT})
+
+
+class Span:
+    __slots__ = ("kind", "name", "attributes", "parent", "depth", "started_ms", "duration_ms", "failed")
+
+    def __init__(self, kind: SpanKind, name: str, attributes: dict, parent: Optional["Span"], started_ms: float):
+        self.kind        = kind
+        self.name        = name
+        self.attributes  = attributes
+        self.parent      = parent
+        self.depth       = parent.depth + 1 if parent else 0
+        self.started_ms  = started_ms
+        self.duration_ms = 0.0
+        self.failed      = False
+
+
+class SpanRecorder:
+    # Collects the spans of one test. Times are milliseconds relative to start().
+    def __init__(self, test_id: str):
+        self.test_id   = test_id
+        self.spans     = []
+        self._origin   = None
+        self._total_ms = 0.0
+        self._token    = None
+
+    def start(self) -> None:
+        self._origin = time.perf_counter()
+        self._token  = _active_recorder.set(self)
+
+    def finish(self) -> None:
+        self._total_ms = self.now_ms()
+        if self._token is not None:
+            _active_recorder.reset(self._token)
+            self._token = None
+
+    def now_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
+    # -----------------------------------------------------------------------
+    # Aggregation
+    # -----------------------------------------------------------------------
+
+    def self_times(self) -> dict[int, float]:
+        # Exclusive time per span, so nested kinds can be summed without double counting
+        exclusive = {id(span): span.duration_ms for span in self.spans}
+        for span in self.spans:
+            if span.parent is not None and id(span.parent) in exclusive:
+                exclusive[id(span.parent)] -= span.duration_ms
+        return {key: max(0.0, value) for key, value in exclusive.items()}
+
+    def summary(self) -> dict:
+        exclusive = self.self_times()
+        by_kind = defaultdict(lambda: {"count": 0, "self_ms": 0.0})
+        actions = defaultdict(lambda: {"count": 0, "failed": 0, "total_ms": 0.0})
+        selectors = defaultdict(lambda: {"attempts": 0, "succeeded": 0, "failed": 0, "total_ms": 0.0, "wasted_ms": 0.0})
+        for span in self.spans:
+            by_kind[span.kind.value]["count"] += 1
+            by_kind[span.kind.value]["self_ms"] += exclusive[id(span)]
+            if span.kind in (SpanKind.ACTION, SpanKind.NAVIGATION, SpanKind.WAIT, SpanKind.SCREENSHOT):
+                actions[span.name]["count"] += 1
+                actions[span.name]["failed"] += int(span.failed)
+                actions[span.name]["total_ms"] += span.duration_ms
+            elif span.kind == SpanKind.ATTEMPT:
+                entry = selectors[(span.attributes.get("action", ""), span.name)]
+                entry["attempts"] += 1
+                entry["total_ms"] += span.duration_ms
+                if span.failed:
+                    entry["failed"] += 1
+                    entry["wasted_ms"] += span.duration_ms
+                else:
+                    entry["succeeded"] += 1
+        tracked_ms = sum(span.duration_ms for span in self.spans if span.parent is None)
+        return {
+            "test":       self.test_id,
+            "total_ms":   _ms(self._total_ms),
+            "tracked_ms": _ms(tracked_ms),
+            "wasted_ms":  _ms(sum(entry["wasted_ms"] for entry in selectors.values())),
+            "by_kind":    {kind: _rounded(values) for kind, values in by_kind.items()},
+            "actions":    {name: _rounded(values) for name, values in actions.items()},
+            "selectors":  [
+                dict(action=action, selector=selector, **_rounded(values))
+                for (action, selector), values in sorted(selectors.items(), key=lambda item: -item[1]["wasted_ms"])
+            ],
+        }
+
+    # -----------------------------------------------------------------------
+    # Export
+    # -----------------------------------------------------------------------
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self) -> str:
+        summary = self.summary()
+        test = _label_value(self.test_id)
+        lines = [
+            f"# HELP {_METRIC_PREFIX}_test_duration_seconds Wall time of the test between fixture setup and teardown",
+            f"# TYPE {_METRIC_PREFIX}_test_duration_seconds gauge",
+            f'{_METRIC_PREFIX}_test_duration_seconds{{test="{test}"}} {summary["total_ms"] / 1000:.4f}',
+            f"# HELP {_METRIC_PREFIX}_span_self_seconds Exclusive time spent per span kind",
+            f"# TYPE {_METRIC_PREFIX}_span_self_seconds gauge",
+        ]
+        for kind, values in summary["by_kind"].items():
+            lines.append(f'{_METRIC_PREFIX}_span_self_seconds{{test="{test}",kind="{kind}"}} {values["self_ms"] / 1000:.4f}')
+        lines += [
+            f"# HELP {_METRIC_PREFIX}_action_seconds Inclusive time per page-object action",
+            f"# TYPE {_METRIC_PREFIX}_action_seconds gauge",
+        ]
+        for name, values in summary["actions"].items():
+            lines.append(f'{_METRIC_PREFIX}_action_seconds{{test="{test}",action="{_label_value(name)}"}} {values["total_ms"] / 1000:.4f}')
+        lines += [
+            f"# HELP {_METRIC_PREFIX}_selector_attempts Selector attempts by outcome",
+            f"# TYPE {_METRIC_PREFIX}_selector_attempts gauge",
+            f"# HELP {_METRIC_PREFIX}_selector_wasted_seconds Time spent on selector attempts that failed",
+            f"# TYPE {_METRIC_PREFIX}_selector_wasted_seconds gauge",
+        ]
+        for entry in summary["selectors"]:
+            labels = f'test="{test}",action="{_label_value(entry["action"])}",selector="{_label_value(entry["selector"])}"'
+            lines.append(f'{_METRIC_PREFIX}_selector_attempts{{{labels},outcome="succeeded"}} {entry["succeeded"]}')
+            lines.append(f'{_METRIC_PREFIX}_selector_attempts{{{labels},outcome="failed"}} {entry["failed"]}')
+            lines.append(f'{_METRIC_PREFIX}_selector_wasted_seconds{{{labels}}} {entry["wasted_ms"] / 1000:.4f}')
+        return "\n".join(lines) + "\n"
+
+    def to_flame_html(self) -> str:
+        # Icicle chart: x = time since test start, one row per nesting depth
+        total_ms = max(self._total_ms, 1.0)
+        max_depth = max((span.depth for span in self.spans), default=0)
+        bars = []
+        for span in self.spans:
+            title = f"{span.kind.value}: {span.name} — {span.duration_ms:.1f}ms{' (failed)' if span.failed else ''}"
+            bars.append(
+                f'<div class="span {span.kind.value}{" failed" if span.failed else ""}" title="{html.escape(title)}" '
+                f'style="left:{span.started_ms / total_ms * 100:.3f}%;width:{max(span.duration_ms / total_ms * 100, 0.05):.3f}%;'
+                f'top:{span.depth * _FLAME_ROW_PX}px">{html.escape(span.name)}</div>'
+            )
+        return (
+            "<html><head><style>"
+            "body{font:12px sans-serif}"
+            f".chart{{position:relative;height:{(max_depth + 1) * _FLAME_ROW_PX}px}}"
+            f".span{{position:absolute;height:{_FLAME_ROW_PX - 2}px;overflow:hidden;white-space:nowrap;"
+            "box-sizing:border-box;border:1px solid #fff;padding:2px}"
+            ".navigation{background:#8fb8de}.action{background:#9ccc65}.race{background:#ffd54f}"
+            ".attempt{background:#c5e1a5}.wait{background:#b0bec5}.screenshot{background:#ce93d8}"
+            ".failed{background:#ef9a9a}"
+            "</style></head><body>"
+            f"<p>{html.escape(self.test_id)} — {total_ms:.0f}ms total</p>"
+            f'<div class="chart">{"".join(bars)}</div>'
+            "</body></html>"
+        )
+
+    def export(self, output_dir: str) -> list[str]:
+        os.makedirs(output_dir, exist_ok=True)
+        stem = os.path.join(output_dir, trace_file_stem(self.test_id))
+        paths = []
+        for suffix, content in ((".json", self.to_json()), (".prom", self.to_prometheus())):
+            with open(stem + suffix, "w", encoding="utf-8") as f:
+                f.write(content)
+            paths.append(stem + suffix)
+        return paths
+
+
+@contextmanager
+def span(kind: SpanKind, name: str, **attributes):
+    with charged(_budget_label(kind, name, attributes)) if kind in _BUDGETED_KINDS else nullcontext():
+        with _recorded_span(kind, name, attributes) as current:
+            yield current
+
+
+@contextmanager
+def _recorded_span(kind: SpanKind, name: str, attributes: dict):
+    recorder = _active_recorder.get()
+    if recorder is None:
+        yield None
+        return
+    current = Span(kind, name, attributes, _current_span.get(), recorder.now_ms())
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.failed = True
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration_ms = recorder.now_ms() - current.started_ms
+        recorder.spans.append(current)
+
+
+def record_span(kind: SpanKind, name: str, duration_ms: float, failed: bool = False, **attributes) -> None:
+    # For work measured outside a `with span(...)` block, e.g. candidates that lost a locator race
+    recorder = _active_recorder.get()
+    if recorder is None:
+        return
+    completed = Span(kind, name, attributes, _current_span.get(), recorder.now_ms() - duration_ms)
+    completed.duration_ms = duration_ms
+    completed.failed = failed
+    recorder.spans.append(completed)
+
+
+def _budget_label(kind: SpanKind, name: str, attributes: dict) -> str:
+    action = attributes.get("action")
+    return f"{kind.value} {name}" + (f" ({action})" if action else "")
+
+
+def _ms(value: float) -> float:
+    return round(value, 1)
+
+
+def _rounded(values: dict) -> dict:
+    return {key: _ms(value) if isinstance(value, float) else value for key, value in values.items()}
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
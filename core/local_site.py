@@ -0,0 +1,78 @@
+import json
+import mimetypes
+import os
+from typing import Optional
+from urllib.parse import urlsplit
+
+from config.settings import logger
+from data.data_loader import _DATA_DIR
+from data.site_profile import site_profile
+from data.locator_keys import LocalSiteKeys
+
+_SECTION       = "local_site"
+_INDEX_FILE    = "index.html"
+_NOT_FOUND     = 404
+_DEFAULT_MIME  = "application/octet-stream"
+_API_PREFIX    = "/api/"
+_JSON_MIME     = "application/json"
+
+
+class LocalSite:
+    # Serves a bundled static site (declared in the optional "local_site" section of
+    # the locators JSON) through context routing, so it runs with no server or network.
+    # Paths under /api/<name> are a tiny JSON collection store kept per browser context:
+    # POST appends the request body, GET returns {"items": [...]}.
+    def __init__(self, origin: str, root_dir: str):
+        self.origin   = origin.rstrip("/")
+        self.root_dir = root_dir
+
+    @classmethod
+    def for_site(cls, site: str) -> Optional["LocalSite"]:
+        section = site_profile(site).get(_SECTION)
+        if not section:
+            return None
+        return cls(section[LocalSiteKeys.ORIGIN], os.path.join(_DATA_DIR, section[LocalSiteKeys.ROOT]))
+
+    @property
+    def url_pattern(self) -> str:
+        return f"{self.origin}/**"
+
+    def response_for(self, url: str) -> dict:
+        relative_path = urlsplit(url).path.lstrip("/") or _INDEX_FILE
+        root = os.path.normpath(self.root_dir)
+        file_path = os.path.normpath(os.path.join(root, relative_path))
+        # commonpath, not a prefix check: "sites/fakeshop-private" starts with "sites/fakeshop"
+        if os.path.commonpath([root, file_path]) != root or not os.path.isfile(file_path):
+            return {"status": _NOT_FOUND, "body": ""}
+        with open(file_path, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(file_path)[0] or _DEFAULT_MIME
+        return {"status": 200, "body": body, "content_type": content_type}
+
+    @staticmethod
+    def api_response_for(collections: dict, request) -> Optional[dict]:
+        path = urlsplit(request.url).path
+        if not path.startswith(_API_PREFIX):
+            return None
+        items = collections.setdefault(path[len(_API_PREFIX):].strip("/"), [])
+        if request.method == "POST":
+            items.append(request.post_data_json)
+        return {"status": 200, "body": json.dumps({"items": items}), "content_type": _JSON_MIME}
+
+    def _handler_for(self, collections: dict):
+        def respond(request) -> dict:
+            return self.api_response_for(collections, request) or self.response_for(request.url)
+        return respond
+
+    def attach(self, context) -> None:
+        respond = self._handler_for({})
+        context.route(self.url_pattern, lambda route: route.fulfill(**respond(route.request)))
+        logger.info(f"Serving local site {self.origin} from {self.root_dir}")
+
+    async def attach_async(self, context) -> None:
+        respond = self._handler_for({})
+
+        async def handle_route(route):
+            await route.fulfill(**respond(route.request))
+        await context.route(self.url_pattern, handle_route)
+        logger.info(f"Serving local site {self.origin} from {self.root_dir}")
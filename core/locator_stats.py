@@ -0,0 +1,205 @@
+import json
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialised across processes
+    fcntl = None
+
+from config.settings import logger, LOCATOR_STATS_PATH, ADAPTIVE_LOCATORS
+from data.site_profile import site_profile
+from core.constants import (
+    LOCATOR_STATS_WINDOW,
+    LOCATOR_STATS_MAX_AGE_DAYS,
+    LOCATOR_STATS_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_PERCENTILE,
+    ADAPTIVE_TIMEOUT_MARGIN,
+    ADAPTIVE_TIMEOUT_FLOOR_MS,
+    DEAD_SELECTOR_MIN_ATTEMPTS,
+)
+
+_SECONDS_PER_DAY = 86400
+
+# Each attempt is stored as [unix_timestamp, succeeded (0/1), latency_ms]
+_TS, _OK, _LATENCY = 0, 1, 2
+
+
+def scope_key(site: str, section: str, key: str) -> str:
+    return f"{site}/{section}/{key}"
+
+
+def locator_scopes(site: str, section: str) -> dict[tuple, str]:
+    # Reverse lookup (selector list -> "site/section/key") so smart actions can
+    # attribute each attempt to the JSON key it came from.
+    if not site or not section:
+        return {}
+    return {
+        tuple(value): scope_key(site, section, key)
+        for key, value in site_profile(site).section(section).items() if isinstance(value, tuple)
+    }
+
+
+class LocatorStatsStore:
+    def __init__(self, path: str, adaptive: bool = True):
+        self.path      = path
+        self.adaptive  = adaptive
+        self._stats    = None
+        self._pending  = {}
+
+    # -----------------------------------------------------------------------
+    # Recording
+    # -----------------------------------------------------------------------
+
+    def record(self, scope: str, selector: str, succeeded: bool, latency_ms: float) -> None:
+        attempt = [round(time.time(), 3), int(succeeded), round(latency_ms, 1)]
+        for bucket in (self._loaded(), self._pending):
+            bucket.setdefault(scope, {}).setdefault(selector, []).append(attempt)
+        self._trim(self._stats[scope][selector])
+
+    # -----------------------------------------------------------------------
+    # Adaptive ordering / timeouts
+    # -----------------------------------------------------------------------
+
+    def rank(self, scope: str, selectors: list[str]) -> list[str]:
+        if not self.adaptive:
+            return list(selectors)
+        # Laplace-smoothed success rate: unseen selectors score 0.5 and keep their JSON order on ties
+        scored = []
+        for priority, selector in enumerate(selectors):
+            attempts = self._attempts(scope, selector)
+            successes = sum(a[_OK] for a in attempts)
+            scored.append((-(successes + 1) / (len(attempts) + 2), priority, selector))
+        return [selector for _, _, selector in sorted(scored)]
+
+    def plan(self, scope: str, selectors: list[str], ceiling_ms: int) -> tuple[list[str], dict[str, int]]:
+        if not scope:
+            return list(selectors), {selector: ceiling_ms for selector in selectors}
+        ordered = self.rank(scope, selectors)
+        return ordered, {selector: self.timeout_for(scope, selector, ceiling_ms) for selector in ordered}
+
+    def record_if_scoped(self, scope: str, selector: str, succeeded: bool, latency_ms: float) -> None:
+        if scope:
+            self.record(scope, selector, succeeded, latency_ms)
+
+    def timeout_for(self, scope: str, selector: str, ceiling_ms: int) -> int:
+        if not self.adaptive:
+            return ceiling_ms
+        attempts = self._attempts(scope, selector)
+        if self._is_dead(attempts):
+            return min(ADAPTIVE_TIMEOUT_FLOOR_MS, ceiling_ms)
+        latencies = sorted(a[_LATENCY] for a in attempts if a[_OK])
+        if len(latencies) < LOCATOR_STATS_MIN_SAMPLES:
+            return ceiling_ms
+        p95_index = min(len(latencies) - 1, math.ceil(ADAPTIVE_TIMEOUT_PERCENTILE * len(latencies)) - 1)
+        adaptive_ms = int(latencies[p95_index] * ADAPTIVE_TIMEOUT_MARGIN)
+        return max(min(ADAPTIVE_TIMEOUT_FLOOR_MS, ceiling_ms), min(adaptive_ms, ceiling_ms))
+
+    # -----------------------------------------------------------------------
+    # Reporting
+    # -----------------------------------------------------------------------
+
+    def dead_selectors(self) -> list[dict]:
+        report = []
+        for scope, selectors in sorted(self._loaded().items()):
+            for selector, attempts in selectors.items():
+                if self._is_dead(attempts):
+                    report.append({
+                        "scope":        scope,
+                        "selector":     selector,
+                        "attempts":     len(attempts),
+                        "last_attempt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(attempts[-1][_TS])),
+                    })
+        return report
+
+    def summary(self) -> list[dict]:
+        rows = []
+        for scope, selectors in sorted(self._loaded().items()):
+            for selector, attempts in selectors.items():
+                successes = [a[_LATENCY] for a in attempts if a[_OK]]
+                rows.append({
+                    "scope":          scope,
+                    "selector":       selector,
+                    "attempts":       len(attempts),
+                    "success_rate":   round(len(successes) / len(attempts), 3) if attempts else 0.0,
+                    "median_ms":      sorted(successes)[len(successes) // 2] if successes else None,
+                })
+        return rows
+
+    # -----------------------------------------------------------------------
+    # Persistence
+    # -----------------------------------------------------------------------
+
+    def save(self) -> None:
+        if not self._pending:
+            return
+        # Re-read before writing so concurrent workers' attempts are merged, not overwritten;
+        # the lock keeps two workers from merging against the same snapshot
+        with self._locked():
+            merged = self._read_disk()
+            for scope, selectors in self._pending.items():
+                for selector, attempts in selectors.items():
+                    history = merged.setdefault(scope, {}).setdefault(selector, [])
+                    history.extend(attempts)
+                    history.sort(key=lambda a: a[_TS])
+                    self._trim(history)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(merged, f, indent=1)
+            os.replace(tmp_path, self.path)
+        self._stats   = merged
+        self._pending = {}
+        logger.info(f"Locator statistics saved to {self.path}")
+
+    def _loaded(self) -> dict:
+        if self._stats is None:
+            self._stats = self._read_disk()
+        return self._stats
+
+    @contextmanager
+    def _locked(self):
+        # Exclusive lock on a sidecar file: the stats file itself is replaced on every save
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_disk(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable locator statistics file {self.path}: {e}")
+            return {}
+
+    def _attempts(self, scope: str, selector: str) -> list[list]:
+        attempts = self._loaded().get(scope, {}).get(selector, [])
+        oldest_allowed = time.time() - LOCATOR_STATS_MAX_AGE_DAYS * _SECONDS_PER_DAY
+        return [a for a in attempts if a[_TS] >= oldest_allowed]
+
+    @staticmethod
+    def _trim(history: list) -> None:
+        del history[:-LOCATOR_STATS_WINDOW]
+
+    @staticmethod
+    def _is_dead(attempts: list[list]) -> bool:
+        return len(attempts) >= DEAD_SELECTOR_MIN_ATTEMPTS and not any(a[_OK] for a in attempts)
+
+
+locator_stats = LocatorStatsStore(LOCATOR_STATS_PATH, adaptive=ADAPTIVE_LOCATORS)
+
+
+if __name__ == "__main__":
+    # python -m core.locator_stats [--all]  -> dead-selector report (or full win-rate table)
+    rows = locator_stats.summary() if "--all" in sys.argv[1:] else locator_stats.dead_selectors()
+    print(json.dumps(rows, indent=2))
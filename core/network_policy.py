@@ -0,0 +1,111 @@
+import json
+from collections import Counter, defaultdict
+from fnmatch import fnmatch
+from typing import Optional
+from playwright.sync_api import BrowserContext, Route, Response
+
+from config.settings import logger
+from data.site_profile import site_profile
+from data.locator_keys import NetworkKeys
+
+_SECTION        = "network"
+_ROUTE_ALL      = "**/*"
+_CONTENT_LENGTH = "content-length"
+
+
+class NetworkPolicyStats:
+    def __init__(self):
+        self.blocked_by_type   = Counter()
+        self.stubbed_by_type   = Counter()
+        self.loaded_requests   = 0
+        self.loaded_bytes      = 0
+        # Sizes of responses that were allowed through, used to estimate what blocked ones would have cost
+        self._observed_bytes   = defaultdict(list)
+
+    def record_response(self, response: Response) -> None:
+        content_length = response.headers.get(_CONTENT_LENGTH)
+        self.loaded_requests += 1
+        if content_length and content_length.isdigit():
+            self.loaded_bytes += int(content_length)
+            self._observed_bytes[response.request.resource_type].append(int(content_length))
+
+    def estimated_bytes_saved(self) -> int:
+        estimate = 0
+        for resource_type, count in (self.blocked_by_type + self.stubbed_by_type).items():
+            observed = self._observed_bytes.get(resource_type)
+            if observed:
+                estimate += count * sum(observed) // len(observed)
+        return estimate
+
+    def summary(self) -> dict:
+        return {
+            "requests_blocked":       sum(self.blocked_by_type.values()),
+            "requests_stubbed":       sum(self.stubbed_by_type.values()),
+            "blocked_by_type":        dict(self.blocked_by_type),
+            "stubbed_by_type":        dict(self.stubbed_by_type),
+            "requests_loaded":        self.loaded_requests,
+            "bytes_loaded":           self.loaded_bytes,
+            # Only types that were also seen un-blocked in this test contribute to the estimate
+            "bytes_saved_estimate":   self.estimated_bytes_saved(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+
+class NetworkPolicy:
+    # Per-site request routing declared in the optional "network" section of the
+    # locators JSON. URL patterns are fnmatch-style globs matched against the full URL;
+    # allow patterns win over stub patterns, which win over block rules.
+    def __init__(
+        self,
+        block_resource_types: list[str],
+        block_url_patterns: list[str],
+        stub_url_patterns: list[str],
+        allow_url_patterns: list[str],
+    ):
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_url_patterns   = tuple(block_url_patterns)
+        self.stub_url_patterns    = tuple(stub_url_patterns)
+        self.allow_url_patterns   = tuple(allow_url_patterns)
+
+    @classmethod
+    def for_site(cls, site: str) -> Optional["NetworkPolicy"]:
+        section = site_profile(site).get(_SECTION)
+        if not section:
+            return None
+        return cls(
+            block_resource_types=section.get(NetworkKeys.BLOCK_RESOURCE_TYPES, []),
+            block_url_patterns=section.get(NetworkKeys.BLOCK_URL_PATTERNS, []),
+            stub_url_patterns=section.get(NetworkKeys.STUB_URL_PATTERNS, []),
+            allow_url_patterns=section.get(NetworkKeys.ALLOW_URL_PATTERNS, []),
+        )
+
+    def attach(self, context: BrowserContext) -> NetworkPolicyStats:
+        stats = NetworkPolicyStats()
+
+        def handle_route(route: Route) -> None:
+            request = route.request
+            url = request.url
+            if _matches_any(url, self.allow_url_patterns):
+                route.fallback()
+            elif _matches_any(url, self.stub_url_patterns):
+                stats.stubbed_by_type[request.resource_type] += 1
+                route.fulfill(status=200, body="")
+            elif request.resource_type in self.block_resource_types or _matches_any(url, self.block_url_patterns):
+                stats.blocked_by_type[request.resource_type] += 1
+                route.abort()
+            else:
+                route.fallback()
+
+        context.route(_ROUTE_ALL, handle_route)
+        context.on("response", stats.record_response)
+        logger.info(
+            f"Network policy active: block types {sorted(self.block_resource_types)}, "
+            f"{len(self.block_url_patterns)} block / {len(self.stub_url_patterns)} stub URL patterns"
+        )
+        return stats
+
+
+def _matches_any(url: str, patterns: tuple[str, ...]) -> bool:
+    return any(fnmatch(url, pattern) for pattern in patterns)
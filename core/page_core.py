@@ -0,0 +1,184 @@
+import time
+from typing import Optional
+
+from config.settings import logger, LOCATOR_RESOLUTION
+from core.constants import VISIBLE_ONLY_SELECTOR, LocatorResolution, SpanKind, AttemptOutcome
+from core.locator_stats import locator_stats, locator_scopes
+from core.instrumentation import record_span
+from core.deadline import budgeted_timeout
+from core.event_log import action_events
+from core.extraction import FieldSpec, describe_field
+from core.ready_condition import ReadyCondition
+from data.site_profile import site_profile
+
+
+class PageCore:
+    # What BasePage and AsyncBasePage share: locator scopes, the section's ready condition and
+    # the bookkeeping of smart actions and extractions. Nothing here awaits or blocks on
+    # Playwright (building locators does neither), so the sync and async page classes only
+    # drive the calls themselves.
+    _SECTION = None
+
+    def __init__(self, page, site: str = None, label: str = ""):
+        self.page  = page
+        self.site  = site
+        self.label = label
+        self._locator_scopes = locator_scopes(site, self._SECTION)
+        section = site_profile(site).section(self._SECTION) if site and self._SECTION else {}
+        self.ready_condition = ReadyCondition.from_section(section)
+
+    def _log_prefix(self) -> str:
+        return f"[{self.label}] " if self.label else ""
+
+    def _locate(self, selector: str, visible_only: bool = False):
+        locator = self.page.locator(selector)
+        if visible_only:
+            locator = locator.locator(VISIBLE_ONLY_SELECTOR)
+        return locator.first
+
+    def _race_locator(self, selectors: list[str]):
+        # Matches whichever candidate is visible first
+        combined = self._locate(selectors[0], visible_only=True)
+        for selector in selectors[1:]:
+            combined = combined.or_(self._locate(selector, visible_only=True))
+        return combined.first
+
+    def _ready_locator(self, ready: ReadyCondition):
+        any_match = self.page.locator(ready.selectors[0])
+        for selector in ready.selectors[1:]:
+            any_match = any_match.or_(self.page.locator(selector))
+        return any_match.first
+
+    def _smart_run(self, locators: list[str], action_name: str, timeout_ms: int) -> "SmartLocatorRun":
+        return SmartLocatorRun(locators, self._locator_scopes.get(tuple(locators)), action_name, timeout_ms, self._log_prefix())
+
+    def _extraction(self, fields: dict[str, FieldSpec], timeout_ms: int) -> "ExtractionRun":
+        return ExtractionRun(fields, self._locator_scopes, timeout_ms, self._log_prefix())
+
+
+class SmartLocatorRun:
+    # One smart action over a selector list: adaptive order and per-selector timeouts, race
+    # resolution, per-attempt timeouts from the open budget, attempt events and locator statistics.
+    def __init__(self, locators: list[str], scope: Optional[str], action_name: str, timeout_ms: int, prefix: str = ""):
+        self.locators       = list(locators)
+        self.scope          = scope
+        self.action_name    = action_name
+        self.prefix         = prefix
+        self.ordered, self.timeouts = locator_stats.plan(scope, locators, timeout_ms)
+        self.racing         = LOCATOR_RESOLUTION == LocatorResolution.RACE and len(self.ordered) > 1
+        self.candidates     = list(enumerate(self.ordered))
+        self.attempts       = []
+        self.last_exception = None
+        self._race_ms       = 0.0
+        self._started       = time.perf_counter()
+        if self.ordered != self.locators:
+            logger.info(f"{prefix}Adaptive order for '{action_name}' ({scope}): {self.ordered}")
+
+    # -----------------------------------------------------------------------
+    # Race
+    # -----------------------------------------------------------------------
+
+    def race_timeout(self) -> float:
+        self._started = time.perf_counter()
+        return budgeted_timeout(max(self.timeouts.values()))
+
+    def race_won(self, position: Optional[int]) -> Optional[str]:
+        # position: first candidate (in order) visible once the race resolved. The winner goes
+        # first; the rest stay as fallbacks in case it detaches mid-action. Returns the message
+        # to log when attempts are reported verbosely.
+        self._race_ms = (time.perf_counter() - self._started) * 1000
+        if position is None:
+            return None
+        self.candidates = [self.candidates[position]] + self.candidates[:position] + self.candidates[position + 1:]
+        if not action_events.verbose:
+            return None
+        return f"Race resolved '{self.action_name}' to locator [{position + 1}/{len(self.ordered)}]: {self.ordered[position]}"
+
+    def race_lost(self, error: Exception, timeout_ms: float) -> None:
+        # Only a race nobody won is a miss for every candidate. When one wins, the others
+        # were merely slower to render, and counting that as a failure would bury working fallbacks.
+        self._race_ms = (time.perf_counter() - self._started) * 1000
+        logger.warning(f"{self.prefix}None of the locators for '{self.action_name}' appeared within {timeout_ms}ms: {self.ordered}")
+        self.candidates = []
+        self.last_exception = error
+        for selector in self.ordered:
+            locator_stats.record_if_scoped(self.scope, selector, False, self._race_ms)
+            # The race waited for all candidates at once, so none costs extra time of its own
+            record_span(SpanKind.ATTEMPT, selector, 0.0, failed=True, action=self.action_name)
+
+    # -----------------------------------------------------------------------
+    # Attempts
+    # -----------------------------------------------------------------------
+
+    def attempting(self, attempt_index: int, selector: str) -> float:
+        # Logs the attempt and returns its timeout, clamped to the open budget
+        self._started = time.perf_counter()
+        action_events.attempting(self.prefix, self.action_name, selector, attempt_index, len(self.ordered))
+        return budgeted_timeout(self.timeouts[selector])
+
+    def succeeded(self, attempt_index: int, selector: str) -> None:
+        elapsed_ms = self._record(attempt_index, selector, AttemptOutcome.SUCCEEDED)
+        action_events.action_finished(self.prefix, self.action_name, self.attempts, succeeded=True)
+        locator_stats.record_if_scoped(self.scope, selector, True, elapsed_ms)
+
+    def failed(self, attempt_index: int, selector: str, outcome: AttemptOutcome, error: Exception) -> None:
+        self.last_exception = error
+        elapsed_ms = self._record(attempt_index, selector, outcome, error)
+        locator_stats.record_if_scoped(self.scope, selector, False, elapsed_ms)
+
+    def exhausted(self) -> str:
+        action_events.action_finished(self.prefix, self.action_name, self.attempts, succeeded=False)
+        failure_message = (
+            f"{self.prefix}Failed to execute '{self.action_name}' after trying all locators: {self.locators}. "
+            f"Last Error: {self.last_exception}"
+        )
+        logger.error(failure_message)
+        return failure_message
+
+    def _record(self, attempt_index: int, selector: str, outcome: AttemptOutcome, error: Exception = None) -> float:
+        # The race's wait is charged to the first attempt after it
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self.attempts.append(action_events.attempted(
+            self.prefix, self.action_name, selector, attempt_index, len(self.ordered), elapsed_ms, outcome, error,
+        ))
+        elapsed_ms, self._race_ms = elapsed_ms + self._race_ms, 0.0
+        return elapsed_ms
+
+
+class ExtractionRun:
+    # One smart_extract: adaptive selector order per field, the in-page script's argument, and
+    # the statistics and diagnostics of its result
+    def __init__(self, fields: dict[str, FieldSpec], scopes: dict, timeout_ms: int, prefix: str = ""):
+        self.fields     = fields
+        self.timeout_ms = timeout_ms
+        self.prefix     = prefix
+        self.scopes     = {name: scopes.get(tuple(spec.selectors)) for name, spec in fields.items()}
+        self.ordered    = {name: locator_stats.plan(self.scopes[name], spec.selectors, timeout_ms)[0] for name, spec in fields.items()}
+        self.arg        = {"fields": {name: spec.to_js(self.ordered[name]) for name, spec in fields.items()}}
+        self.diagnostics = []
+        self._started   = time.perf_counter()
+
+    def wait_timeout(self) -> float:
+        return budgeted_timeout(self.timeout_ms)
+
+    def finish(self, result: dict) -> Optional[str]:
+        # Records every tried selector and logs the per-field diagnostics; returns the failure
+        # message when a required field did not resolve
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        for name, field in result["fields"].items():
+            self.diagnostics.append(describe_field(name, field, len(self.ordered[name])))
+            winner = field["index"]
+            for position, selector in enumerate(self.ordered[name][:winner + 1 if winner >= 0 else None]):
+                locator_stats.record_if_scoped(self.scopes[name], selector, position == winner, elapsed_ms)
+        logger.info(f"{self.prefix}smart_extract:\n" + "\n".join(self.diagnostics))
+
+        missing = [name for name, spec in self.fields.items() if spec.required and result["fields"][name]["index"] < 0]
+        if not missing:
+            return None
+        failure_message = f"{self.prefix}Failed to extract fields {missing} within {self.timeout_ms}ms:\n" + "\n".join(self.diagnostics)
+        logger.error(failure_message)
+        return failure_message
+
+    @staticmethod
+    def values(result: dict) -> dict:
+        return {name: field["value"] for name, field in result["fields"].items()}
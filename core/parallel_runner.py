@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from config.settings import logger, IS_CI, CHROMIUM_ARGS, RUNNER_WORKERS, RUNNER_SITE_CAPS
+from core.constants import BROWSER_SERVER_START_TIMEOUT_SECONDS, WORK_QUEUE_POLL_SECONDS
+from core.work_queue import (
+    WorkQueue,
+    parse_site_caps,
+    serve_work_queue,
+    WORK_QUEUE_ADDRESS_ENV_KEY,
+    WORK_QUEUE_AUTHKEY_ENV_KEY,
+    WORKER_ID_ENV_KEY,
+)
+
+DEFAULT_ALLURE_DIR = "allure-results"
+_WS_ENDPOINT_PREFIX = "ws://"
+
+
+class BrowserServer:
+    # One `playwright launch-server` Chromium per node. Workers reach it through GRID_URL,
+    # so the `browser` fixture connects instead of launching its own browser; every test
+    # still gets its own context.
+    def __init__(self, headless: bool, args: list[str]):
+        self.headless     = headless
+        self.args         = args
+        self.ws_endpoint  = None
+        self._process     = None
+        self._config_path = None
+
+    def __enter__(self) -> "BrowserServer":
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"headless": self.headless, "args": self.args}, f)
+            self._config_path = f.name
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "playwright", "launch-server", "--browser", "chromium", "--config", self._config_path],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.ws_endpoint = self._read_endpoint()
+        logger.info(f"Browser server listening on {self.ws_endpoint}")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        if self._config_path:
+            os.remove(self._config_path)
+
+    def _read_endpoint(self) -> str:
+        endpoint = []
+
+        def read():
+            for line in self._process.stdout:
+                if line.strip().startswith(_WS_ENDPOINT_PREFIX):
+                    endpoint.append(line.strip())
+                    return
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        reader.join(BROWSER_SERVER_START_TIMEOUT_SECONDS)
+        if not endpoint:
+            self.__exit__(None, None, None)
+            raise RuntimeError(
+                f"Browser server did not report a websocket endpoint within {BROWSER_SERVER_START_TIMEOUT_SECONDS}s "
+                f"(exit code {self._process.poll()})"
+            )
+        return endpoint[0]
+
+
+def _parse_args(argv: Optional[list[str]]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(
+        description="Run the e2e suite on several pytest workers that share one browser server and pull "
+                    "(site, query) cases from a work-stealing queue. Unknown arguments are passed to pytest.",
+    )
+    parser.add_argument("--workers", type=int, default=RUNNER_WORKERS, help="pytest worker processes on this node")
+    parser.add_argument(
+        "--site-caps",
+        default=RUNNER_SITE_CAPS,
+        help="most cases of one site in flight at once, e.g. 'ebay=2,fakeshop=4' (default: RUNNER_SITE_CAPS)",
+    )
+    parser.add_argument("--alluredir", default=DEFAULT_ALLURE_DIR, help="Allure results directory shared by all workers")
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    options, pytest_args = _parse_args(argv)
+    site_caps = parse_site_caps(options.site_caps)
+    worker_ids = [f"w{number}" for number in range(options.workers)]
+    work_queue = WorkQueue(worker_ids, site_caps)
+    authkey = secrets.token_hex(16)
+    host, port = serve_work_queue(work_queue, authkey.encode())
+
+    with BrowserServer(headless=IS_CI, args=CHROMIUM_ARGS) as server:
+        workers = {}
+        for worker_id in worker_ids:
+            env = dict(
+                os.environ,
+                GRID_URL=server.ws_endpoint,
+                **{
+                    WORK_QUEUE_ADDRESS_ENV_KEY: f"{host}:{port}",
+                    WORK_QUEUE_AUTHKEY_ENV_KEY: authkey,
+                    WORKER_ID_ENV_KEY:          worker_id,
+                },
+            )
+            # Allure names every result file by UUID, so all workers can write into one directory
+            command = [sys.executable, "-m", "pytest", *pytest_args, f"--alluredir={options.alluredir}"]
+            workers[worker_id] = subprocess.Popen(command, env=env)
+        exit_codes = _wait_for_workers(workers, work_queue)
+
+    logger.info(f"Parallel run finished: {work_queue.summary()}")
+    return next((code for code in exit_codes if code != 0), 0)
+
+
+def _wait_for_workers(workers: dict[str, subprocess.Popen], work_queue: WorkQueue) -> list[int]:
+    # Polled rather than waited on in order, so a worker that dies mid-case releases its
+    # site slot while the others are still pulling cases
+    exit_codes = {}
+    while len(exit_codes) < len(workers):
+        for worker_id, worker in workers.items():
+            if worker_id in exit_codes or worker.poll() is None:
+                continue
+            exit_codes[worker_id] = worker.returncode
+            abandoned = work_queue.release_worker(worker_id)
+            if abandoned is not None:
+                logger.error(f"Worker {worker_id} exited with code {worker.returncode} while running {abandoned}")
+        time.sleep(WORK_QUEUE_POLL_SECONDS)
+    return list(exit_codes.values())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from core.constants import ElementState, READY_TIMEOUT_MS
+from data.locator_keys import READY_KEY, ReadyKeys
+
+
+@dataclass(frozen=True)
+class ReadyCondition:
+    # Declared per section in the locators JSON under "ready". Any combination of a
+    # response URL glob, a selector list + state and a JS predicate may be given;
+    # all declared parts are awaited.
+    response_pattern: Optional[str]  = None
+    selectors:        tuple[str, ...] = ()
+    state:            ElementState    = ElementState.VISIBLE
+    predicate:        Optional[str]   = None
+    timeout_ms:       int             = READY_TIMEOUT_MS
+
+    @classmethod
+    def from_section(cls, section: dict) -> Optional["ReadyCondition"]:
+        ready = section.get(READY_KEY)
+        if not ready:
+            return None
+        return cls(
+            response_pattern=ready.get(ReadyKeys.RESPONSE),
+            selectors=tuple(ready.get(ReadyKeys.SELECTOR, [])),
+            state=ElementState(ready.get(ReadyKeys.STATE, ElementState.VISIBLE)),
+            predicate=ready.get(ReadyKeys.PREDICATE),
+            timeout_ms=ready.get(ReadyKeys.TIMEOUT_MS, READY_TIMEOUT_MS),
+        )
+
+    def describe(self) -> str:
+        parts = []
+        if self.response_pattern:
+            parts.append(f"response {self.response_pattern}")
+        if self.selectors:
+            parts.append(f"{self.state.value} {list(self.selectors)}")
+        if self.predicate:
+            parts.append(f"predicate {self.predicate}")
+        return ", ".join(parts)
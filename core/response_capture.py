@@ -0,0 +1,134 @@
+import re
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import Any, Optional
+
+from config.settings import logger
+from core.constants import CAPTURED_RESPONSES_LIMIT
+
+_JSON_CONTENT_TYPE = "json"
+_CONTENT_TYPE      = "content-type"
+
+# An amount next to a currency symbol or code ("US $1,234.56", "1.234,56 €", "EUR 12"); the
+# first one wins, so ranges and counts like "Subtotal (3 items)" do not leak into the value
+_AMOUNT   = r"\d(?:[\d.,]*\d)?"
+_CURRENCY = r"(?:[$€£¥₹]|\b(?:USD|EUR|GBP|CAD|AUD|JPY|CHF|INR|PLN|SEK)\b)"
+_MONEY_RE  = re.compile(rf"{_CURRENCY}\s*({_AMOUNT})|({_AMOUNT})\s*{_CURRENCY}")
+_AMOUNT_RE = re.compile(_AMOUNT)
+
+# BrowserContext -> ResponseCapture, so every page object on a context shares one listener
+_captures = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class CapturedResponse:
+    url:         str
+    status:      int
+    payload:     Any
+    captured_at: float
+
+
+class ResponseCapture:
+    # Keeps the most recent JSON bodies of context responses whose URL matches one of
+    # the watched fnmatch-style globs. Bodies are read as the responses arrive, so they
+    # stay available after the page that triggered them has navigated away.
+    def __init__(self):
+        self.patterns  = set()
+        self._captured = deque(maxlen=CAPTURED_RESPONSES_LIMIT)
+
+    def watch(self, patterns: list[str]) -> None:
+        self.patterns.update(patterns)
+
+    def latest(self, pattern: str, since: Optional[float] = None) -> Optional[CapturedResponse]:
+        # since: time.time() before the action that should have fetched it; older payloads are stale
+        for captured in reversed(self._captured):
+            if since is not None and captured.captured_at < since:
+                return None
+            if fnmatch(captured.url, pattern):
+                return captured
+        return None
+
+    def _wants(self, response) -> bool:
+        return (
+            response.ok
+            and _JSON_CONTENT_TYPE in response.headers.get(_CONTENT_TYPE, "")
+            and any(fnmatch(response.url, pattern) for pattern in self.patterns)
+        )
+
+    def _store(self, response, payload: Any) -> None:
+        self._captured.append(CapturedResponse(response.url, response.status, payload, time.time()))
+        logger.info(f"Captured JSON response: {response.url}")
+
+    def handle(self, response) -> None:
+        if not self._wants(response):
+            return
+        try:
+            self._store(response, response.json())
+        except Exception as e:
+            logger.debug(f"Could not read JSON body of {response.url}: {e}")
+
+    async def handle_async(self, response) -> None:
+        if not self._wants(response):
+            return
+        try:
+            self._store(response, await response.json())
+        except Exception as e:
+            logger.debug(f"Could not read JSON body of {response.url}: {e}")
+
+
+def response_capture_for(context, asynchronous: bool = False) -> ResponseCapture:
+    capture = _captures.get(context)
+    if capture is None:
+        capture = _captures[context] = ResponseCapture()
+        context.on("response", capture.handle_async if asynchronous else capture.handle)
+    return capture
+
+
+def json_path(payload: Any, path: str) -> Any:
+    # "summary.subtotal.value" / "items.0.price" — None when any step is missing
+    value = payload
+    for step in path.split(".") if path else []:
+        if isinstance(value, list) and step.isdigit() and int(step) < len(value):
+            value = value[int(step)]
+        elif isinstance(value, dict) and step in value:
+            value = value[step]
+        else:
+            return None
+    return value
+
+
+def to_number(value: Any) -> Optional[float]:
+    # Accepts numbers, {"value": ...} money objects and formatted strings like "US $1,234.56"
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return to_number(value.get("value", value.get("amount")))
+    text = str(value)
+    money = _MONEY_RE.search(text)
+    if money:
+        return parse_amount(money.group(1) or money.group(2))
+    amount = _AMOUNT_RE.search(text)
+    return parse_amount(amount.group(0)) if amount else None
+
+
+def parse_amount(token: str) -> float:
+    # The last separator is the decimal point unless it is the only one of its kind and is
+    # followed by exactly three digits ("1,234", "1.234"), which makes it a thousands separator
+    last_dot, last_comma = token.rfind("."), token.rfind(",")
+    if last_dot >= 0 and last_comma >= 0:
+        decimal = "." if last_dot > last_comma else ","
+    elif last_dot >= 0 or last_comma >= 0:
+        separator = "." if last_dot >= 0 else ","
+        digits_after = len(token) - token.rfind(separator) - 1
+        decimal = separator if token.count(separator) == 1 and digits_after != 3 else None
+    else:
+        decimal = None
+    for separator in ".,":
+        if separator != decimal:
+            token = token.replace(separator, "")
+    return float(token.replace(decimal, ".") if decimal else token)
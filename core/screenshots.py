@@ -0,0 +1,122 @@
+import atexit
+import queue
+import threading
+from typing import Optional
+from uuid import uuid4
+
+import allure
+import allure_commons
+
+from config.settings import (
+    logger,
+    SCREENSHOT_POLICY,
+    SCREENSHOT_FORMAT,
+    SCREENSHOT_QUALITY,
+    SCREENSHOT_CLIP,
+)
+from core.constants import ScreenshotPolicy, ScreenshotFormat
+
+_CLIP_FIELDS = ("x", "y", "width", "height")
+
+
+class ScreenshotSettings:
+    def __init__(self, policy: str, image_format: str, quality: int, clip: str):
+        self.policy       = ScreenshotPolicy(policy)
+        self.image_format = ScreenshotFormat(image_format)
+        self.quality      = quality
+        self.clip         = _parse_clip(clip)
+
+    def should_capture(self, on_failure: bool = False) -> bool:
+        if self.policy == ScreenshotPolicy.ALWAYS:
+            return True
+        return on_failure and self.policy == ScreenshotPolicy.FAILURE_ONLY
+
+    def capture_options(self) -> dict:
+        options = {"type": self.image_format.value}
+        if self.image_format == ScreenshotFormat.JPEG:
+            options["quality"] = self.quality
+        if self.clip:
+            options["clip"] = self.clip
+        return options
+
+    @property
+    def attachment_type(self):
+        if self.image_format == ScreenshotFormat.JPEG:
+            return allure.attachment_type.JPG
+        return allure.attachment_type.PNG
+
+
+def _parse_clip(clip: str) -> Optional[dict]:
+    if not clip:
+        return None
+    values = [float(value) for value in clip.split(",")]
+    if len(values) != len(_CLIP_FIELDS):
+        raise ValueError(f"SCREENSHOT_CLIP must be 'x,y,width,height', got '{clip}'")
+    return dict(zip(_CLIP_FIELDS, values))
+
+
+class BackgroundAttachmentWriter:
+    # The attachment is registered on the current Allure test/step synchronously
+    # (Allure tracks the running item per thread), but writing the bytes to the
+    # results directory is handed to a daemon thread.
+    # Registering without writing has no public Allure API, so this relies on
+    # AllureLifecycle._attach (allure-python-commons is pinned in requirements.txt).
+    # When it is missing or fails, attachments are written synchronously via allure.attach.
+    def __init__(self):
+        self._queue  = queue.Queue()
+        self._thread = None
+        self._lock   = threading.Lock()
+        self._warned = False
+
+    def attach(self, body: bytes, name: str, attachment_type) -> None:
+        file_name = self._register(name, attachment_type)
+        if file_name is None:
+            allure.attach(body, name=name, attachment_type=attachment_type)
+            return
+        self._ensure_started()
+        self._queue.put((body, file_name))
+
+    def flush(self) -> None:
+        if self._thread:
+            self._queue.join()
+
+    def _register(self, name: str, attachment_type) -> Optional[str]:
+        for plugin in allure_commons.plugin_manager.get_plugins():
+            lifecycle = getattr(plugin, "allure_logger", None)
+            if lifecycle is None:
+                continue
+            if not callable(getattr(lifecycle, "_attach", None)):
+                self._warn_once("this allure-python-commons has no AllureLifecycle._attach")
+                return None
+            try:
+                return lifecycle._attach(uuid4(), name=name, attachment_type=attachment_type)
+            except Exception as e:
+                self._warn_once(f"registering '{name}' failed: {e}")
+                return None
+        return None
+
+    def _warn_once(self, reason: str) -> None:
+        if not self._warned:
+            self._warned = True
+            logger.warning(f"Allure attachments are written synchronously: {reason}")
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="allure-attachment-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            body, file_name = self._queue.get()
+            try:
+                allure_commons.plugin_manager.hook.report_attached_data(body=body, file_name=file_name)
+            except Exception as e:
+                logger.warning(f"Failed to write Allure attachment {file_name}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+screenshot_settings = ScreenshotSettings(SCREENSHOT_POLICY, SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, SCREENSHOT_CLIP)
+attachment_writer   = BackgroundAttachmentWriter()
+atexit.register(attachment_writer.flush)
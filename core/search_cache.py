@@ -0,0 +1,87 @@
+import json
+import os
+import time
+from typing import Optional
+
+from config.settings import logger, SEARCH_CACHE, SEARCH_CACHE_PATH, SEARCH_CACHE_TTL_SECONDS
+
+_URLS, _EXHAUSTED, _STORED_AT = "urls", "exhausted", "stored_at"
+
+
+def search_cache_key(site: str, query: str, filters: dict) -> str:
+    return json.dumps([site, query, filters], sort_keys=True)
+
+
+class SearchResultCache:
+    # Harvested item URLs per (site, query, filters). An entry serves any limit up to the
+    # number of URLs it holds, or any limit at all when the live search ran out of results.
+    # Entries live for ttl_seconds; with a path they are also shared across runs/workers.
+    def __init__(self, path: str, ttl_seconds: int, enabled: bool = True):
+        self.path        = path
+        self.ttl_seconds = ttl_seconds
+        self.enabled     = enabled
+        self.hits        = 0
+        self.misses      = 0
+        self._entries    = None
+        self._pending    = {}
+
+    def get(self, key: str, limit: int) -> Optional[list[str]]:
+        if not self.enabled:
+            return None
+        entry = self._loaded().get(key)
+        usable = (
+            entry is not None
+            and time.time() - entry[_STORED_AT] < self.ttl_seconds
+            and (len(entry[_URLS]) >= limit or entry[_EXHAUSTED])
+        )
+        if not usable:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.info(f"Search cache hit for {key}: {min(limit, len(entry[_URLS]))} URL(s)")
+        return entry[_URLS][:limit]
+
+    def put(self, key: str, urls: list[str], exhausted: bool) -> None:
+        if not self.enabled:
+            return
+        current = self._loaded().get(key)
+        if current and not exhausted and len(current[_URLS]) > len(urls) and time.time() - current[_STORED_AT] < self.ttl_seconds:
+            return
+        entry = {_URLS: list(urls), _EXHAUSTED: exhausted, _STORED_AT: round(time.time(), 3)}
+        self._entries[key] = entry
+        self._pending[key] = entry
+
+    def summary(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries or {})}
+
+    def save(self) -> None:
+        if not (self.path and self._pending):
+            return
+        merged = self._read_disk()
+        merged.update(self._pending)
+        oldest_allowed = time.time() - self.ttl_seconds
+        merged = {key: entry for key, entry in merged.items() if entry[_STORED_AT] >= oldest_allowed}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(merged, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self._pending = {}
+        logger.info(f"Search result cache saved to {self.path}")
+
+    def _loaded(self) -> dict:
+        if self._entries is None:
+            self._entries = self._read_disk()
+        return self._entries
+
+    def _read_disk(self) -> dict:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search cache file {self.path}: {e}")
+            return {}
+
+
+search_cache = SearchResultCache(SEARCH_CACHE_PATH, SEARCH_CACHE_TTL_SECONDS, enabled=SEARCH_CACHE)
@@ -0,0 +1,90 @@
+import os
+import re
+from collections import deque
+from playwright.sync_api import BrowserContext
+
+from config.settings import logger
+from core.constants import TraceMode
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]+")
+
+# BrowserContext -> TraceRecorder, so page objects can mark chunk boundaries
+_active_recorders = {}
+
+
+def trace_file_stem(test_id: str) -> str:
+    return _UNSAFE_FILENAME_CHARS.sub("_", test_id).strip("_")
+
+
+def trace_checkpoint(context: BrowserContext, label: str) -> None:
+    recorder = _active_recorders.get(context)
+    if recorder:
+        recorder.checkpoint(label)
+
+
+class TraceRecorder:
+    # on-failure mode records the test as a series of chunks split at navigations.
+    # With ring_size == 1 the previous chunk is simply discarded (no disk I/O on
+    # passing tests); larger rings spill the last ring_size - 1 chunks to disk.
+    def __init__(self, context: BrowserContext, mode: str, output_dir: str, test_id: str, ring_size: int = 1):
+        self.context     = context
+        self.mode        = TraceMode(mode)
+        self.output_dir  = output_dir
+        self.stem        = trace_file_stem(test_id)
+        self.ring_size   = max(1, ring_size)
+        self._ring       = deque()
+        self._chunk_no   = 0
+
+    def start(self) -> None:
+        if self.mode == TraceMode.OFF:
+            return
+        self.context.tracing.start(screenshots=True, snapshots=True, sources=True)
+        if self.mode == TraceMode.ON_FAILURE:
+            self.context.tracing.start_chunk(title=self.stem)
+            _active_recorders[self.context] = self
+
+    def checkpoint(self, label: str) -> None:
+        if self.ring_size > 1:
+            os.makedirs(self.output_dir, exist_ok=True)
+            chunk_path = self._path(f"chunk{self._chunk_no}")
+            self.context.tracing.stop_chunk(path=chunk_path)
+            self._ring.append(chunk_path)
+            while len(self._ring) > self.ring_size - 1:
+                os.remove(self._ring.popleft())
+        else:
+            self.context.tracing.stop_chunk()
+        self._chunk_no += 1
+        self.context.tracing.start_chunk(title=f"{self.stem}: {label}")
+
+    def finish(self, failed: bool) -> list[str]:
+        _active_recorders.pop(self.context, None)
+        try:
+            if self.mode == TraceMode.OFF:
+                return []
+            if self.mode == TraceMode.ALWAYS:
+                return [self._stop(self._path())]
+            if not failed:
+                self.context.tracing.stop_chunk()
+                self.context.tracing.stop()
+                self._discard_ring()
+                return []
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.context.tracing.stop_chunk(path=self._path())
+            self.context.tracing.stop()
+            return list(self._ring) + [self._path()]
+        except Exception as e:
+            logger.warning(f"Could not save Playwright trace for {self.stem}: {e}")
+            return []
+
+    def _stop(self, path: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.context.tracing.stop(path=path)
+        return path
+
+    def _discard_ring(self) -> None:
+        while self._ring:
+            os.remove(self._ring.popleft())
+
+    def _path(self, suffix: str = "") -> str:
+        name = f"{self.stem}-{suffix}" if suffix else self.stem
+        return os.path.join(self.output_dir, f"{name}.zip")
@@ -0,0 +1,21 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote_plus
+
+from core.constants import TRACKING_QUERY_PARAMS, TRACKING_QUERY_PARAM_PREFIXES
+
+
+def _is_tracking_param(name: str) -> bool:
+    return name in TRACKING_QUERY_PARAMS or name.startswith(TRACKING_QUERY_PARAM_PREFIXES)
+
+
+def normalize_item_url(url: str) -> str:
+    parts = urlsplit(url)
+    kept_params = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(kept_params), ""))
+
+
+def build_search_url(template: str, query: str, max_price: float) -> str:
+    # Fills a site's "url_template", e.g. "https://shop/search?q={query}&max={max_price}"
+    return template.format(query=quote_plus(query), max_price=int(max_price))
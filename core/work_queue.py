@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+from multiprocessing.managers import BaseManager
+from typing import Optional
+
+from config.settings import logger
+from core.constants import PARAM_SITE, WORK_QUEUE_POLL_SECONDS, CaseOutcome
+
+WORK_QUEUE_ADDRESS_ENV_KEY = "WORK_QUEUE_ADDRESS"
+WORK_QUEUE_AUTHKEY_ENV_KEY = "WORK_QUEUE_AUTHKEY"
+WORKER_ID_ENV_KEY          = "WORK_QUEUE_WORKER"
+
+
+def parse_site_caps(spec: str) -> dict[str, int]:
+    # "ebay=2,fakeshop=4" -> {"ebay": 2, "fakeshop": 4}
+    caps = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        site, _, cap = part.partition("=")
+        if not site or not cap.strip().isdigit() or int(cap) < 1:
+            raise ValueError(f"Site cap must look like 'site=N' with N >= 1, got '{part}'")
+        caps[site.strip()] = int(cap)
+    return caps
+
+
+class WorkQueue:
+    # Cases (pytest node ids) are dealt round-robin onto one deque per worker. A worker takes
+    # from the front of its own deque and, once that holds nothing runnable, steals from the
+    # back of the longest other deque. A case is only handed out while fewer than
+    # site_caps[site] cases of its site are in flight.
+    def __init__(self, worker_ids: list[str], site_caps: dict[str, int]):
+        self.site_caps   = dict(site_caps)
+        self._deques     = {worker_id: deque() for worker_id in worker_ids}
+        self._sites      = {}
+        self._in_flight  = Counter()
+        self._running    = {}
+        self._registered = False
+        self._lock       = threading.Lock()
+        self.outcomes    = {}
+        self.ran_by      = Counter()
+        self.steals      = 0
+
+    def register(self, cases: list[tuple[str, str]]) -> int:
+        # Every worker collects the same items; the first one to report them fills the queue
+        with self._lock:
+            if not self._registered:
+                worker_deques = list(self._deques.values())
+                for position, (nodeid, site) in enumerate(cases):
+                    self._sites[nodeid] = site
+                    worker_deques[position % len(worker_deques)].append(nodeid)
+                self._registered = True
+                logger.info(f"Work queue: {len(cases)} case(s) over {len(worker_deques)} worker(s), site caps {self.site_caps or 'none'}")
+            return len(self._sites)
+
+    def next_case(self, worker_id: str) -> Optional[str]:
+        with self._lock:
+            nodeid = self._take(self._deques[worker_id], from_back=False)
+            if nodeid is None:
+                victims = sorted(
+                    (worker_deque for owner, worker_deque in self._deques.items() if owner != worker_id),
+                    key=len,
+                    reverse=True,
+                )
+                for victim in victims:
+                    nodeid = self._take(victim, from_back=True)
+                    if nodeid is not None:
+                        self.steals += 1
+                        break
+            if nodeid is not None:
+                self._in_flight[self._sites[nodeid]] += 1
+                self._running[worker_id] = nodeid
+            return nodeid
+
+    def finish(self, worker_id: str, nodeid: str, outcome: str) -> None:
+        with self._lock:
+            self._in_flight[self._sites[nodeid]] -= 1
+            self._running.pop(worker_id, None)
+            self.outcomes[nodeid] = outcome
+            self.ran_by[worker_id] += 1
+
+    def release_worker(self, worker_id: str) -> Optional[str]:
+        # Called once a worker process has exited: a case it never finished is recorded as
+        # crashed and its site slot is freed, so the other workers are not held below the cap
+        with self._lock:
+            nodeid = self._running.pop(worker_id, None)
+            if nodeid is not None:
+                self._in_flight[self._sites[nodeid]] -= 1
+                self.outcomes[nodeid] = CaseOutcome.CRASHED.value
+            return nodeid
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(worker_deque) for worker_deque in self._deques.values())
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "cases":    len(self._sites),
+                "outcomes": dict(Counter(self.outcomes.values())),
+                "ran_by":   dict(self.ran_by),
+                "steals":   self.steals,
+            }
+
+    def _take(self, worker_deque: deque, from_back: bool) -> Optional[str]:
+        positions = range(len(worker_deque) - 1, -1, -1) if from_back else range(len(worker_deque))
+        for position in positions:
+            nodeid = worker_deque[position]
+            site = self._sites[nodeid]
+            if site not in self.site_caps or self._in_flight[site] < self.site_caps[site]:
+                del worker_deque[position]
+                return nodeid
+        return None
+
+
+class WorkQueueManager(BaseManager):
+    pass
+
+
+_served_queue = None
+
+
+def _get_served_queue() -> WorkQueue:
+    return _served_queue
+
+
+WorkQueueManager.register("work_queue", callable=_get_served_queue)
+
+
+def serve_work_queue(work_queue: WorkQueue, authkey: bytes) -> tuple[str, int]:
+    # Served from a thread of the coordinating process, so it can read the queue directly
+    global _served_queue
+    _served_queue = work_queue
+    server = WorkQueueManager(address=("127.0.0.1", 0), authkey=authkey).get_server()
+    threading.Thread(target=server.serve_forever, name="work-queue", daemon=True).start()
+    return server.address
+
+
+def connect_work_queue():
+    address = os.getenv(WORK_QUEUE_ADDRESS_ENV_KEY)
+    if not address:
+        return None
+    host, port = address.rsplit(":", 1)
+    manager = WorkQueueManager(address=(host, int(port)), authkey=os.environ[WORK_QUEUE_AUTHKEY_ENV_KEY].encode())
+    manager.connect()
+    return manager.work_queue()
+
+
+def run_from_work_queue(session, work_queue) -> None:
+    # Replaces pytest's run loop in a runner worker: cases are pulled until the queue is drained
+    worker_id = os.environ[WORKER_ID_ENV_KEY]
+    items = {item.nodeid: item for item in session.items}
+    work_queue.register([(item.nodeid, _item_site(item)) for item in session.items])
+    while True:
+        nodeid = work_queue.next_case(worker_id)
+        if nodeid is None:
+            if not work_queue.pending():
+                break
+            time.sleep(WORK_QUEUE_POLL_SECONDS)
+            continue
+        item = items[nodeid]
+        logger.info(f"Worker {worker_id} running {nodeid}")
+        item.ihook.pytest_runtest_protocol(item=item, nextitem=_teardown_boundary(item, session.items))
+        work_queue.finish(worker_id, nodeid, _outcome(item))
+        if session.shouldfail or session.shouldstop:
+            break
+
+
+def _item_site(item) -> str:
+    callspec = getattr(item, "callspec", None)
+    return str(callspec.params.get(PARAM_SITE, "")) if callspec else ""
+
+
+def _teardown_boundary(item, items: list) -> Optional[object]:
+    # The next case is not known yet, so only the nodes every other case is sure to share
+    # may stay set up: the item with the shortest common chain (another module when there
+    # is one, otherwise another class, ...) tears down everything else. None (no other
+    # item) tears down the whole stack.
+    chain = item.listchain()
+    boundary, shared = None, len(chain)
+    for other in items:
+        if other is item:
+            continue
+        common = 0
+        for mine, theirs in zip(chain, other.listchain()):
+            if mine is not theirs:
+                break
+            common += 1
+        if common < shared:
+            boundary, shared = other, common
+    return boundary
+
+
+def _outcome(item) -> str:
+    reports = [getattr(item, f"rep_{when}", None) for when in ("setup", "call", "teardown")]
+    reports = [report for report in reports if report is not None]
+    if any(report.failed for report in reports):
+        return CaseOutcome.FAILED.value
+    if any(report.skipped for report in reports):
+        return CaseOutcome.SKIPPED.value
+    return CaseOutcome.PASSED.value
@@ -1,34 +1,86 @@
+import csv
 import json
 import os
+import zlib
 from functools import lru_cache
+from typing import Iterator
 
 _DATA_DIR             = os.path.dirname(__file__)
 _LOCATORS_DIR         = "locators"
 _LOCATORS_FILE_SUFFIX = "_locators.json"
 _TEST_DATA_FILE_DEFAULT = "test_data.json"
 _TEST_DATA_ENV_KEY       = "PYTEST_TEST_DATA_FILE"
+_SHARD_INDEX_ENV_KEY     = "PYTEST_SHARD_INDEX"
+_SHARD_COUNT_ENV_KEY     = "PYTEST_SHARD_COUNT"
 
+FIELD_SITE      = "site"
 FIELD_QUERY     = "query"
 FIELD_MAX_PRICE = "maxPrice"
 FIELD_LIMIT     = "limit"
 
 
+def locators_path(site: str) -> str:
+    return os.path.join(_DATA_DIR, _LOCATORS_DIR, f"{site}{_LOCATORS_FILE_SUFFIX}")
+
+
 @lru_cache(maxsize=None)
 def load_locators(site: str) -> dict:
-    # NOTE: the returned dict is cached and shared across all callers.
-    # Pages must treat self.locators as read-only — never mutate it.
-    locator_path = os.path.join(_DATA_DIR, _LOCATORS_DIR, f"{site}{_LOCATORS_FILE_SUFFIX}")
-    with open(locator_path, "r") as f:
+    # The raw JSON, cached and shared across all callers — never mutate it.
+    # Page objects read the validated, immutable data/site_profile.py instead.
+    with open(locators_path(site), "r") as f:
         return json.load(f)
 
 
 def load_test_params() -> list[tuple]:
     test_data_file = os.environ.get(_TEST_DATA_ENV_KEY, _TEST_DATA_FILE_DEFAULT)
-    data_path = os.path.join(_DATA_DIR, test_data_file)
-    with open(data_path, "r") as f:
-        data = json.load(f)
-    params = []
-    for site, queries in data.items():
-        for q in queries:
-            params.append((site, q[FIELD_QUERY], q[FIELD_MAX_PRICE], q[FIELD_LIMIT]))
-    return params
+    return list(iter_test_params(
+        os.path.join(_DATA_DIR, test_data_file),
+        shard_index=int(os.environ.get(_SHARD_INDEX_ENV_KEY, "0")),
+        shard_count=int(os.environ.get(_SHARD_COUNT_ENV_KEY, "1")),
+    ))
+
+
+def iter_test_params(data_path: str, shard_index: int = 0, shard_count: int = 1) -> Iterator[tuple]:
+    # Yields this shard's (site, query, maxPrice, limit) cases, skipping exact duplicates.
+    # A row's shard depends only on its content, so every machine agrees on the split.
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard index {shard_index} is outside 0..{shard_count - 1}")
+    seen = set()
+    for row in _read_rows(data_path):
+        params = (row[FIELD_SITE], str(row[FIELD_QUERY]), _price(row[FIELD_MAX_PRICE]), int(row[FIELD_LIMIT]))
+        if shard_count > 1 and _shard_of(params, shard_count) != shard_index:
+            continue
+        # Only rows of this shard are remembered; duplicates always land in the same shard
+        if params in seen:
+            continue
+        seen.add(params)
+        yield params
+
+
+def _price(value) -> float | int:
+    # CSV gives strings; whole prices stay ints so "220", 220 and 220.0 are one case
+    price = float(value)
+    return int(price) if price.is_integer() else price
+
+
+def _shard_of(params: tuple, shard_count: int) -> int:
+    return zlib.crc32("\x1f".join(map(str, params)).encode("utf-8")) % shard_count
+
+
+def _read_rows(data_path: str) -> Iterator[dict]:
+    extension = os.path.splitext(data_path)[1].lower()
+    if extension == ".jsonl":
+        with open(data_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == ".csv":
+        with open(data_path, "r", encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        # {"site": [{"query", "maxPrice", "limit"}, ...]} — a single document, read whole
+        with open(data_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for site, queries in data.items():
+            for q in queries:
+                yield dict(q, **{FIELD_SITE: site})
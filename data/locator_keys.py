@@ -1,5 +1,8 @@
 from enum import Enum
 
+# Optional per-section "ready" condition (see ReadyKeys), awaited instead of network idle
+READY_KEY = "ready"
+
 
 class HomeKeys(str, Enum):
     URL          = "url"
@@ -10,16 +13,22 @@ class HomeKeys(str, Enum):
 
 
 class LoginKeys(str, Enum):
-    USERNAME_INPUT = "username_input"
-    CONTINUE_BTN   = "continue_btn"
-    PASSWORD_INPUT = "password_input"
-    SUBMIT_BTN     = "submit_btn"
+    URL              = "url"
+    USERNAME_INPUT   = "username_input"
+    CONTINUE_BTN     = "continue_btn"
+    PASSWORD_INPUT   = "password_input"
+    SUBMIT_BTN       = "submit_btn"
+    LOGGED_IN_MARKER = "logged_in_marker"
 
 
 class SearchKeys(str, Enum):
+    URL_TEMPLATE        = "url_template"
     PRICE_FILTER_MAX    = "price_filter_input_max"
     PRICE_FILTER_SUBMIT = "price_filter_submit"
     ITEM_LINKS          = "item_links"
+    ITEM_CARD           = "item_card"
+    ITEM_TITLE          = "item_title"
+    ITEM_PRICE          = "item_price"
     NEXT_PAGE_BTN       = "next_page_btn"
 
 
@@ -34,3 +43,86 @@ class ItemKeys(str, Enum):
 class CartKeys(str, Enum):
     URL      = "url"
     SUBTOTAL = "cart_subtotal_text"
+    API      = "api"
+
+
+# Optional "api" object in the cart section: where the cart JSON comes from and dotted
+# paths into it (line fields are relative to each entry of line_items)
+class CartApiKeys(str, Enum):
+    RESPONSE   = "response"
+    SUBTOTAL   = "subtotal"
+    LINE_ITEMS = "line_items"
+    TITLE      = "title"
+    PRICE      = "price"
+    QUANTITY   = "quantity"
+
+
+class NetworkKeys(str, Enum):
+    BLOCK_RESOURCE_TYPES = "block_resource_types"
+    BLOCK_URL_PATTERNS   = "block_url_patterns"
+    STUB_URL_PATTERNS    = "stub_url_patterns"
+    ALLOW_URL_PATTERNS   = "allow_url_patterns"
+
+
+class ReadyKeys(str, Enum):
+    RESPONSE   = "response"
+    SELECTOR   = "selector"
+    STATE      = "state"
+    PREDICATE  = "predicate"
+    TIMEOUT_MS = "timeout_ms"
+
+
+class LocalSiteKeys(str, Enum):
+    ORIGIN = "origin"
+    ROOT   = "root"
+
+
+# ---------------------------------------------------------------------------
+# Site profile schema (data/site_profile.py)
+# ---------------------------------------------------------------------------
+# Section of the locators JSON -> the enum its keys must come from
+SECTION_KEYS = {
+    "home":       HomeKeys,
+    "login":      LoginKeys,
+    "search":     SearchKeys,
+    "item":       ItemKeys,
+    "cart":       CartKeys,
+    "network":    NetworkKeys,
+    "local_site": LocalSiteKeys,
+}
+
+# Page sections that may declare a READY_KEY object
+READY_SECTIONS = ("home", "login", "search", "item", "cart")
+
+# Nested objects and the enum their keys must come from
+NESTED_KEYS = {
+    READY_KEY:   ReadyKeys,
+    CartKeys.API: CartApiKeys,
+}
+
+# Keys page objects index directly: a section (or nested object) that is present must define them
+REQUIRED_KEYS = {
+    HomeKeys:      (HomeKeys.URL, HomeKeys.SEARCH_INPUT, HomeKeys.SEARCH_BTN),
+    LoginKeys:     (LoginKeys.USERNAME_INPUT, LoginKeys.CONTINUE_BTN, LoginKeys.PASSWORD_INPUT, LoginKeys.SUBMIT_BTN),
+    SearchKeys:    (SearchKeys.ITEM_LINKS,),
+    ItemKeys:      (ItemKeys.ADD_TO_CART_BTN,),
+    CartKeys:      (CartKeys.SUBTOTAL,),
+    LocalSiteKeys: (LocalSiteKeys.ORIGIN, LocalSiteKeys.ROOT),
+    CartApiKeys:   (CartApiKeys.RESPONSE,),
+}
+
+# Value types other than a selector / pattern list
+STRING_KEYS = frozenset({
+    HomeKeys.URL, HomeKeys.LOGIN_URL, LoginKeys.URL, SearchKeys.URL_TEMPLATE, CartKeys.URL,
+    LocalSiteKeys.ORIGIN, LocalSiteKeys.ROOT, ReadyKeys.RESPONSE, ReadyKeys.STATE, ReadyKeys.PREDICATE,
+    *CartApiKeys,
+})
+INT_KEYS = frozenset({ReadyKeys.TIMEOUT_MS})
+
+# Selector lists that are evaluated in-page with document.querySelectorAll, so they must be
+# plain CSS: Playwright selector engines (text=, >>, :has-text(), xpath, ...) would never match
+CSS_ONLY_KEYS = frozenset({
+    CartKeys.SUBTOTAL,
+    SearchKeys.ITEM_LINKS, SearchKeys.ITEM_CARD, SearchKeys.ITEM_TITLE, SearchKeys.ITEM_PRICE, SearchKeys.NEXT_PAGE_BTN,
+    ItemKeys.VARIANT_CUSTOM_LISTBOXES, ItemKeys.VARIANT_NATIVE_SELECTS, ItemKeys.VARIANT_OPTIONS, ItemKeys.VARIANT_BUTTONS,
+})
@@ -0,0 +1,183 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from config.settings import logger, SITE_PROFILE_CACHE_DIR
+from data.data_loader import locators_path
+from data.locator_keys import (
+    SECTION_KEYS,
+    READY_SECTIONS,
+    NESTED_KEYS,
+    REQUIRED_KEYS,
+    STRING_KEYS,
+    INT_KEYS,
+    CSS_ONLY_KEYS,
+    READY_KEY,
+)
+
+# Bumped whenever the compiled structure changes, so stale disk caches are ignored
+_PROFILE_FORMAT_VERSION = 2
+
+# Playwright-only selector syntax that document.querySelectorAll rejects or reads differently
+_PLAYWRIGHT_ONLY_SELECTOR = re.compile(
+    r"^\s*(?:[a-z][\w-]*=|internal:|//|\.\.)"
+    r"|>>"
+    r"|:(?:has-text|text|text-is|text-matches|visible|nth-match|left-of|right-of|above|below|near)\b"
+)
+
+
+class SiteProfileError(ValueError):
+    def __init__(self, site: str, problems: list[str]):
+        self.site     = site
+        self.problems = problems
+        super().__init__(f"Invalid locators for site '{site}' ({locators_path(site)}):\n" + "\n".join(f"  - {p}" for p in problems))
+
+
+class FrozenSection(Mapping):
+    # Read-only view of one JSON object; selector lists are tuples and nested objects are FrozenSections
+    __slots__ = ("_values",)
+
+    def __init__(self, values: dict):
+        object.__setattr__(self, "_values", values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str):
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._values!r})"
+
+    def __getstate__(self):
+        return self._values
+
+    def __setstate__(self, values: dict):
+        object.__setattr__(self, "_values", values)
+
+
+_EMPTY_SECTION = FrozenSection({})
+
+
+class SiteProfile(FrozenSection):
+    # One site's locators JSON, validated against data/locator_keys.py and frozen. Compiled
+    # once per process and shared by every page object of the site.
+    __slots__ = ()
+
+    def section(self, name: str) -> FrozenSection:
+        return self._values.get(name, _EMPTY_SECTION)
+
+
+def compile_site_profile(site: str, raw: dict) -> SiteProfile:
+    problems = []
+    for section_name, section in raw.items():
+        keys_enum = SECTION_KEYS.get(section_name)
+        if keys_enum is None:
+            # Extension sections (e.g. the benchmarks' "click") are allowed, but a typo should be visible
+            logger.warning(f"{site}: unknown locators section '{section_name}' (known: {', '.join(SECTION_KEYS)})")
+            continue
+        if not isinstance(section, dict):
+            problems.append(f"{section_name}: expected an object, got {type(section).__name__}")
+            continue
+        extra_keys = (READY_KEY,) if section_name in READY_SECTIONS else ()
+        problems += _check_object(section_name, section, keys_enum, extra_keys)
+    if problems:
+        raise SiteProfileError(site, problems)
+    return SiteProfile({name: _freeze(section) for name, section in raw.items()})
+
+
+@lru_cache(maxsize=None)
+def site_profile(site: str) -> SiteProfile:
+    with open(locators_path(site), "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()[:16]
+    cached = _read_cached(site, digest)
+    if cached is not None:
+        return cached
+    profile = compile_site_profile(site, json.loads(source))
+    _write_cached(site, digest, profile)
+    return profile
+
+
+def _check_object(path: str, values: dict, keys_enum, extra_keys: tuple = ()) -> list[str]:
+    problems = []
+    allowed = {key.value for key in keys_enum} | set(extra_keys)
+    for key, value in values.items():
+        if key not in allowed:
+            problems.append(f"{path}.{key}: unknown key (expected one of: {', '.join(sorted(allowed))})")
+            continue
+        nested_enum = NESTED_KEYS.get(key)
+        if nested_enum is not None:
+            if isinstance(value, dict):
+                problems += _check_object(f"{path}.{key}", value, nested_enum)
+            else:
+                problems.append(f"{path}.{key}: expected an object, got {type(value).__name__}")
+        elif key in STRING_KEYS:
+            if not isinstance(value, str) or not value:
+                problems.append(f"{path}.{key}: expected a non-empty string")
+        elif key in INT_KEYS:
+            if not isinstance(value, int) or isinstance(value, bool):
+                problems.append(f"{path}.{key}: expected an integer")
+        elif not (isinstance(value, list) and all(isinstance(item, str) and item for item in value)):
+            problems.append(f"{path}.{key}: expected a list of non-empty strings")
+        elif key in CSS_ONLY_KEYS:
+            for selector in value:
+                if _PLAYWRIGHT_ONLY_SELECTOR.search(selector):
+                    problems.append(f"{path}.{key}: '{selector}' is a Playwright selector, but this key is matched in-page and needs plain CSS")
+    for key in REQUIRED_KEYS.get(keys_enum, ()):
+        if not values.get(key.value):
+            problems.append(f"{path}.{key.value}: required key is missing or empty")
+    return problems
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return FrozenSection({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _cache_path(site: str, digest: str) -> Optional[str]:
+    if not SITE_PROFILE_CACHE_DIR:
+        return None
+    return os.path.join(SITE_PROFILE_CACHE_DIR, f"{site}-{digest}-v{_PROFILE_FORMAT_VERSION}.pickle")
+
+
+def _read_cached(site: str, digest: str) -> Optional[SiteProfile]:
+    path = _cache_path(site, digest)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable site profile cache {path}: {e}")
+        return None
+
+
+def _write_cached(site: str, digest: str, profile: SiteProfile) -> None:
+    path = _cache_path(site, digest)
+    if not path:
+        return
+    os.makedirs(SITE_PROFILE_CACHE_DIR, exist_ok=True)
+    # Profiles compiled from older versions of the JSON are dropped
+    for stale in glob.glob(os.path.join(SITE_PROFILE_CACHE_DIR, f"{site}-{'[0-9a-f]' * 16}-v*.pickle")):
+        if stale != path:
+            os.remove(stale)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(profile, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
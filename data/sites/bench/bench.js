@@ -0,0 +1,66 @@
+// Synthetic pages for benchmarks/: large, deterministic DOMs that stress the
+// page-object hot paths (fallback selectors, pagination, variant matrices).
+const RESULTS_PER_PAGE = 60;
+const RESULT_PAGES = 3;
+const params = () => new URLSearchParams(location.search);
+const el = (tag, attrs = {}, text = "") => {
+    const node = document.createElement(tag);
+    Object.entries(attrs).forEach(([name, value]) => node.setAttribute(name, value));
+    if (text) node.textContent = text;
+    return node;
+};
+
+function renderClick() {
+    const target = document.getElementById("target");
+    target.addEventListener("click", () => { target.dataset.clicks = String(Number(target.dataset.clicks || 0) + 1); });
+}
+
+function renderResults() {
+    const page = parseInt(params().get("page") || "1", 10);
+    const results = document.getElementById("results");
+    for (let i = 0; i < RESULTS_PER_PAGE; i++) {
+        const id = (page - 1) * RESULTS_PER_PAGE + i;
+        const card = el("div", {class: "card"});
+        card.appendChild(el("a", {class: "item-link", href: `item.html?id=${id}&_trksid=p${page}.${i}&hash=item${id}`}, `Item ${id}`));
+        card.appendChild(el("span", {class: "title"}, `Item ${id}`));
+        card.appendChild(el("span", {class: "price"}, `$${(10 + id % 90).toFixed(2)}`));
+        results.appendChild(card);
+    }
+    if (page < RESULT_PAGES) {
+        document.getElementById("pagination").appendChild(el("a", {class: "next", href: `results.html?page=${page + 1}`}, "Next"));
+    }
+}
+
+function renderVariants() {
+    const variants = document.getElementById("variants");
+    // Custom listboxes: half scoped through aria-controls, half relying on visibility
+    for (let box = 0; box < 4; box++) {
+        const scoped = box % 2 === 0;
+        const button = el("button", {class: "lb-btn", type: "button"}, `Option group ${box}`);
+        const listbox = el("ul", {id: `lb-${box}`, role: "listbox", hidden: ""});
+        if (scoped) button.setAttribute("aria-controls", `lb-${box}`);
+        for (let opt = 0; opt < 25; opt++) {
+            const option = el("li", {role: "option", "data-sku-value-name": `v${box}-${opt}`}, `Value ${opt}`);
+            if (opt % 7 === 3) option.setAttribute("aria-disabled", "true");
+            option.addEventListener("click", () => { listbox.hidden = true; button.textContent = option.textContent; });
+            listbox.appendChild(option);
+        }
+        button.addEventListener("click", () => {
+            document.querySelectorAll("[role='listbox']").forEach(other => { other.hidden = true; });
+            listbox.hidden = false;
+        });
+        variants.appendChild(button);
+        variants.appendChild(listbox);
+    }
+    for (let sel = 0; sel < 6; sel++) {
+        const select = el("select", {class: "native", name: `attr${sel}`});
+        select.appendChild(el("option", {value: "-1"}, "Select"));
+        for (let opt = 0; opt < 40; opt++) select.appendChild(el("option", {value: `s${sel}-${opt}`}, `Choice ${opt}`));
+        variants.appendChild(select);
+    }
+    for (let b = 0; b < 30; b++) {
+        const button = el("button", {class: "vbtn", type: "button"}, `Swatch ${b}`);
+        if (b % 5 === 0) button.setAttribute("disabled", "");
+        variants.appendChild(button);
+    }
+}
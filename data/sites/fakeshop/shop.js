@@ -0,0 +1,124 @@
+// Minimal static "fake shop" used for offline, deterministic runs of the framework.
+// The signed-in user lives in localStorage; the cart lives behind the JSON endpoint
+// api/cart, which the framework's LocalSite serves per browser context.
+const PRODUCTS = [
+    {id: 1,  title: "Trail Running Shoes",  price: 59.99,  category: "shoes",  sizes: ["40", "41", "42", "43"], colors: ["Black", "Blue"]},
+    {id: 2,  title: "Canvas Sneakers",      price: 34.50,  category: "shoes",  sizes: ["38", "39", "40"],       colors: []},
+    {id: 3,  title: "Leather Boots",        price: 149.00, category: "shoes",  sizes: ["41", "42", "44"],       colors: ["Brown"]},
+    {id: 4,  title: "Running Shoes Pro",    price: 89.90,  category: "shoes",  sizes: [],                       colors: ["Red", "White", "Black"]},
+    {id: 5,  title: "Slip-on Shoes",        price: 24.99,  category: "shoes",  sizes: ["40", "42"],             colors: []},
+    {id: 6,  title: "Basketball Shoes",     price: 119.00, category: "shoes",  sizes: ["43", "44", "45"],       colors: ["White"]},
+    {id: 7,  title: "Hiking Shoes",         price: 74.00,  category: "shoes",  sizes: [],                       colors: []},
+    {id: 8,  title: "Cotton T-Shirt",       price: 12.00,  category: "shirts", sizes: ["S", "M", "L"],          colors: ["White", "Grey"]},
+    {id: 9,  title: "Linen Shirt",          price: 39.00,  category: "shirts", sizes: ["M", "L"],               colors: []},
+    {id: 10, title: "Flannel Shirt",        price: 29.00,  category: "shirts", sizes: [],                       colors: ["Red"]},
+];
+const PAGE_SIZE = 3;
+const USER_KEY = "fakeshop-user";
+const CART_API = "api/cart";
+
+const params = () => new URLSearchParams(location.search);
+const money = value => "$" + value.toFixed(2);
+const readCart = () => fetch(CART_API).then(response => response.json()).then(cart => cart.items);
+const el = (tag, attrs = {}, text = "") => {
+    const node = document.createElement(tag);
+    Object.entries(attrs).forEach(([name, value]) => node.setAttribute(name, value));
+    if (text) node.textContent = text;
+    return node;
+};
+
+function renderHeader() {
+    const user = localStorage.getItem(USER_KEY);
+    const header = document.getElementById("header-user");
+    if (!header) return;
+    header.replaceChildren(user
+        ? el("span", {id: "greeting"}, "Hi " + user)
+        : el("a", {id: "signin-link", href: "login.html"}, "Sign in"));
+}
+
+function searchFromHome(event) {
+    event.preventDefault();
+    const query = document.getElementById("search-input").value.trim();
+    location.href = "search.html?q=" + encodeURIComponent(query);
+}
+
+function renderSearch() {
+    const query = (params().get("q") || "").toLowerCase();
+    const maxPrice = parseFloat(params().get("max") || "Infinity");
+    const page = parseInt(params().get("page") || "1", 10);
+    const matches = PRODUCTS.filter(p =>
+        (p.title.toLowerCase().includes(query) || p.category === query) && p.price <= maxPrice);
+    const results = document.getElementById("results");
+    matches.slice((page - 1) * PAGE_SIZE, page * PAGE_SIZE).forEach(p => {
+        const card = el("li", {class: "result"});
+        // Tracking params on purpose: the framework must normalise them away
+        card.appendChild(el("a", {class: "result-link", href: `item.html?id=${p.id}&_trksid=p${page}&hash=item${p.id}`}, p.title));
+        card.appendChild(el("span", {class: "result-title"}, p.title));
+        card.appendChild(el("span", {class: "result-price"}, money(p.price)));
+        results.appendChild(card);
+    });
+    document.getElementById("max-price").value = isFinite(maxPrice) ? maxPrice : "";
+    if (page * PAGE_SIZE < matches.length) {
+        const next = new URLSearchParams(params());
+        next.set("page", page + 1);
+        document.getElementById("pagination").appendChild(el("a", {class: "next-page", href: "search.html?" + next}, "Next"));
+    }
+}
+
+function applyPriceFilter() {
+    const next = new URLSearchParams(params());
+    next.set("max", document.getElementById("max-price").value);
+    next.delete("page");
+    location.href = "search.html?" + next;
+}
+
+function renderItem() {
+    const product = PRODUCTS.find(p => p.id === parseInt(params().get("id"), 10));
+    document.getElementById("item-title").textContent = product.title;
+    document.getElementById("item-price").textContent = money(product.price);
+    const variants = document.getElementById("variants");
+    if (product.sizes.length) {
+        const select = el("select", {class: "variant-select", name: "size"});
+        select.appendChild(el("option", {value: "-1"}, "Select size"));
+        product.sizes.forEach(size => select.appendChild(el("option", {value: size}, size)));
+        variants.appendChild(select);
+    }
+    product.colors.forEach(color => {
+        const button = el("button", {class: "variant-btn", type: "button"}, color);
+        button.addEventListener("click", () => {
+            variants.querySelectorAll(".variant-btn").forEach(b => b.removeAttribute("aria-pressed"));
+            button.setAttribute("aria-pressed", "true");
+        });
+        variants.appendChild(button);
+    });
+    document.getElementById("add-to-cart").addEventListener("click", () => {
+        const select = variants.querySelector("select");
+        if (select && select.value === "-1") {
+            document.getElementById("status").textContent = "Please select a size";
+            return;
+        }
+        fetch(CART_API, {
+            method: "POST",
+            headers: {"Content-Type": "application/json"},
+            body: JSON.stringify({id: product.id, title: product.title, price: product.price}),
+        }).then(() => { document.getElementById("status").textContent = "Added to cart"; });
+    });
+}
+
+async function renderCart() {
+    const cart = await readCart();
+    const lines = document.getElementById("cart-lines");
+    cart.forEach(line => lines.appendChild(el("li", {class: "cart-line"}, `${line.title} - ${money(line.price)}`)));
+    const subtotal = cart.reduce((sum, line) => sum + line.price, 0);
+    document.getElementById("subtotal").textContent = money(subtotal);
+}
+
+function renderLogin() {
+    document.getElementById("continue").addEventListener("click", () => {
+        document.getElementById("password-step").hidden = false;
+    });
+    document.getElementById("sign-in").addEventListener("click", () => {
+        localStorage.setItem(USER_KEY, document.getElementById("userid").value);
+        location.href = "index.html";
+    });
+}
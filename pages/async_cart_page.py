@@ -0,0 +1,60 @@
+import allure
+import time
+from typing import Optional
+from config.settings import logger
+from core.async_base_page import AsyncBasePage
+from data.site_profile import site_profile
+from data.locator_keys import CartKeys, CartApiKeys
+from core.extraction import FieldSpec
+from core.constants import FieldParser
+from pages.cart_page import CartLine, CartSnapshot, parse_cart_payload
+
+
+class AsyncCartPage(AsyncBasePage):
+    _SECTION = "cart"
+
+    def __init__(self, page, site: str, label: str = ""):
+        super().__init__(page, site, label)
+        locators                = site_profile(site).section(self._SECTION)
+        self.cart_url           = locators.get(CartKeys.URL)
+        self.subtotal_selectors = locators[CartKeys.SUBTOTAL]
+        self.api                = locators.get(CartKeys.API)
+        self._opened_at         = None
+        if self.api:
+            self.capture_responses([self.api[CartApiKeys.RESPONSE]])
+
+    def cart_from_api(self) -> Optional[CartSnapshot]:
+        if not self.api or self._opened_at is None:
+            return None
+        captured = self.captured_json(self.api[CartApiKeys.RESPONSE], since=self._opened_at)
+        if captured is None:
+            return None
+        snapshot = parse_cart_payload(captured.payload, self.api, captured.url)
+        if snapshot is None:
+            logger.warning(f"{self._log_prefix()}Captured cart response {captured.url} has no usable subtotal — falling back to the cart page")
+        return snapshot
+
+    def get_cart_lines(self) -> list[CartLine]:
+        snapshot = self.cart_from_api()
+        return list(snapshot.lines) if snapshot else []
+
+    async def get_cart_total(self) -> float:
+        self._opened_at = time.time()
+        if self.cart_url and not self.page.url.startswith(self.cart_url):
+            async with self.expect_ready():
+                await self.go_to(self.cart_url)
+        else:
+            await self.wait_until_ready()
+
+        snapshot = self.cart_from_api()
+        if snapshot:
+            logger.info(f"{self._log_prefix()}Cart total from captured response {snapshot.source_url}: {snapshot.subtotal}")
+            allure.attach(str(snapshot.subtotal), name=f"{self._log_prefix()}Cart Total")
+            await self.take_screenshot("Cart_Page_Final")
+            return snapshot.subtotal
+
+        total = (await self.smart_extract({"subtotal": FieldSpec(self.subtotal_selectors, FieldParser.CURRENCY)}))["subtotal"]
+        logger.info(f"{self._log_prefix()}Cart total: {total}")
+        allure.attach(str(total), name=f"{self._log_prefix()}Cart Total")
+        await self.take_screenshot("Cart_Page_Final")
+        return total
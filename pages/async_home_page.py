@@ -0,0 +1,31 @@
+from core.async_base_page import AsyncBasePage
+from data.site_profile import site_profile
+from data.locator_keys import HomeKeys
+
+
+class AsyncHomePage(AsyncBasePage):
+    _SECTION = "home"
+
+    def __init__(self, page, site: str, label: str = ""):
+        super().__init__(page, site, label)
+        locators          = site_profile(site).section(self._SECTION)
+        self.home_url     = locators[HomeKeys.URL]
+        self.search_input = locators[HomeKeys.SEARCH_INPUT]
+        self.search_btn   = locators[HomeKeys.SEARCH_BTN]
+        self.login_url    = locators.get(HomeKeys.LOGIN_URL)
+        self.login_link   = locators.get(HomeKeys.LOGIN_LINK)
+
+    async def navigate(self):
+        await self.go_to(self.home_url)
+
+    async def search(self, query: str):
+        await self.smart_fill(self.search_input, query)
+        await self.smart_click(self.search_btn)
+        await self.wait_for_page_load()
+
+    async def go_to_login(self):
+        if self.login_url:
+            await self.go_to(self.login_url)
+        else:
+            await self.smart_click(self.login_link)
+        await self.wait_for_page_load()
@@ -0,0 +1,122 @@
+import asyncio
+import random
+from config.settings import logger, ADD_TO_CART_CONCURRENCY, VARIANT_SEED
+from core.async_base_page import AsyncBasePage
+from core.deadline import BudgetExceededError
+from data.site_profile import site_profile
+from data.locator_keys import ItemKeys
+from core.constants import INVALID_SELECT_VALUE, VariantKind
+from pages.item_page import (
+    AddToCartResult,
+    DISCOVER_VARIANTS_JS,
+    APPLY_SELECT_VALUES_JS,
+    VISIBLE_OPTION_INDEXES_JS,
+    report_add_to_cart_results,
+    variant_rng,
+    listbox_option_selector,
+    pick_select_values,
+)
+
+
+class AsyncItemPage(AsyncBasePage):
+    _SECTION = "item"
+
+    def __init__(self, page, site: str, label: str = ""):
+        super().__init__(page, site, label)
+        locators                      = site_profile(site).section(self._SECTION)
+        self.add_to_cart_btn          = locators[ItemKeys.ADD_TO_CART_BTN]
+        self.custom_listbox_selectors = locators.get(ItemKeys.VARIANT_CUSTOM_LISTBOXES, [])
+        self.native_select_selectors  = locators.get(ItemKeys.VARIANT_NATIVE_SELECTS, [])
+        variant_options               = locators.get(ItemKeys.VARIANT_OPTIONS)
+        self.variant_option_selector  = variant_options[0] if variant_options else None
+        self.variant_buttons          = locators.get(ItemKeys.VARIANT_BUTTONS, [])
+
+    async def add_items_to_cart(self, urls: list[str], concurrency: int = ADD_TO_CART_CONCURRENCY) -> list[AddToCartResult]:
+        # Every item is attempted and failures are raised together at the end, serial or not.
+        # With concurrency > 1 each item gets its own tab in this context (shared cart cookie)
+        # and the semaphore bounds how many tabs are open at once.
+        if concurrency <= 1 or len(urls) <= 1:
+            results = [await self._try_add_item(url, item_index) for item_index, url in enumerate(urls)]
+            return report_add_to_cart_results(results, self._log_prefix())
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def add_in_tab(item_index: int, url: str) -> AddToCartResult:
+            async with semaphore:
+                tab = await self.page.context.new_page()
+                try:
+                    return await AsyncItemPage(tab, self.site, self.label)._try_add_item(url, item_index)
+                finally:
+                    await tab.close()
+
+        results = await asyncio.gather(*(add_in_tab(index, url) for index, url in enumerate(urls)))
+        return report_add_to_cart_results(list(results), self._log_prefix())
+
+    async def _try_add_item(self, url: str, item_index: int) -> AddToCartResult:
+        logger.info(f"{self._log_prefix()}Adding item {item_index + 1} to cart - URL: {url}")
+        try:
+            await self._add_current_item(url, item_index)
+            return AddToCartResult(item_index, url)
+        except BudgetExceededError:
+            raise
+        except Exception as e:
+            logger.error(f"{self._log_prefix()}Adding item {item_index + 1} ({url}) failed: {e}")
+            return AddToCartResult(item_index, url, error=str(e))
+
+    async def _add_current_item(self, url: str, item_index: int) -> None:
+        await self.go_to(url)
+        await self.wait_for_page_load()
+        await self._select_variants_if_exist()
+        if self.ready_condition:
+            async with self.expect_ready():
+                await self.smart_click(self.add_to_cart_btn)
+        else:
+            await self.smart_click(self.add_to_cart_btn)
+        await self.take_screenshot(f"item_added_{item_index + 1}")
+
+    async def _select_variants_if_exist(self):
+        variants = await self.page.evaluate(DISCOVER_VARIANTS_JS, self._variant_discovery_args())
+        if variants is None:
+            logger.info(f"{self._log_prefix()}No variants found — proceeding without selection")
+            return
+        rng = variant_rng(self.page.url)
+        logger.info(
+            f"{self._log_prefix()}Found {len(variants['groups'])} {variants['kind']} variant group(s) "
+            f"via '{variants['selector']}' (seed {VARIANT_SEED})"
+        )
+        if variants["kind"] == VariantKind.LISTBOX:
+            await self._apply_listbox_choices(variants, rng)
+        elif variants["kind"] == VariantKind.SELECT:
+            await self.page.evaluate(APPLY_SELECT_VALUES_JS, {
+                "selector": variants["selector"],
+                "values":   pick_select_values(variants["groups"], rng),
+            })
+        elif variants["groups"]:
+            await self.page.locator(variants["selector"]).nth(rng.choice(variants["groups"])).click()
+
+    def _variant_discovery_args(self) -> dict:
+        return {
+            "listboxSelectors": self.custom_listbox_selectors,
+            "optionSelector":   self.variant_option_selector,
+            "selectSelectors":  self.native_select_selectors,
+            "buttonSelectors":  self.variant_buttons,
+            "invalidValue":     INVALID_SELECT_VALUE,
+        }
+
+    async def _apply_listbox_choices(self, variants: dict, rng: random.Random) -> None:
+        listbox_buttons = self.page.locator(variants["selector"])
+        for group_index, group in enumerate(variants["groups"]):
+            try:
+                await listbox_buttons.nth(group_index).click()
+                if not self.variant_option_selector:
+                    continue
+                option_selector = listbox_option_selector(group, self.variant_option_selector)
+                option_indexes = list(range(group["options"] or 0))
+                if not option_indexes:
+                    option_indexes = await self.page.evaluate(VISIBLE_OPTION_INDEXES_JS, option_selector)
+                if option_indexes:
+                    await self.page.locator(option_selector).nth(rng.choice(option_indexes)).click()
+            except BudgetExceededError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self._log_prefix()}Custom listbox variant selection failed: {e}")
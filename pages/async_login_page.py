@@ -0,0 +1,24 @@
+from config.settings import logger
+from core.async_base_page import AsyncBasePage
+from data.site_profile import site_profile
+from data.locator_keys import LoginKeys
+
+
+class AsyncLoginPage(AsyncBasePage):
+    _SECTION = "login"
+
+    def __init__(self, page, site: str, label: str = ""):
+        super().__init__(page, site, label)
+        locators            = site_profile(site).section(self._SECTION)
+        self.username_input = locators[LoginKeys.USERNAME_INPUT]
+        self.continue_btn   = locators[LoginKeys.CONTINUE_BTN]
+        self.password_input = locators[LoginKeys.PASSWORD_INPUT]
+        self.submit_btn     = locators[LoginKeys.SUBMIT_BTN]
+
+    async def login(self, email: str, password: str):
+        logger.info(f"{self._log_prefix()}Login with {email}")
+        await self.smart_fill(self.username_input, email)
+        await self.smart_click(self.continue_btn)
+        await self.smart_fill(self.password_input, password)
+        async with self.expect_ready():
+            await self.smart_click(self.submit_btn)
@@ -0,0 +1,162 @@
+from contextlib import nullcontext
+from config.settings import logger, SEARCH_BUDGET_SECONDS
+from core.async_base_page import AsyncBasePage
+from core.url_utils import normalize_item_url, build_search_url
+from core.search_cache import search_cache, search_cache_key
+from core.deadline import deadline, budgeted_timeout, BudgetExceededError
+from core.instrumentation import span
+from data.site_profile import site_profile
+from data.locator_keys import SearchKeys
+from core.constants import ElementState, LoadState, SpanKind, DEFAULT_TIMEOUT_MS
+from pages.search_results_page import HARVEST_RESULTS_JS, SearchResult
+
+
+class AsyncSearchResultsPage(AsyncBasePage):
+    _SECTION = "search"
+
+    def __init__(self, page, site: str, label: str = ""):
+        super().__init__(page, site, label)
+        locators                  = site_profile(site).section(self._SECTION)
+        self.url_template         = locators.get(SearchKeys.URL_TEMPLATE)
+        self.price_filter_max     = locators.get(SearchKeys.PRICE_FILTER_MAX)
+        self.price_filter_submit  = locators.get(SearchKeys.PRICE_FILTER_SUBMIT)
+        self.item_links           = locators[SearchKeys.ITEM_LINKS]
+        self.item_card            = locators.get(SearchKeys.ITEM_CARD, [])
+        self.item_title           = locators.get(SearchKeys.ITEM_TITLE, [])
+        self.item_price           = locators.get(SearchKeys.ITEM_PRICE, [])
+        self.next_page_btn        = locators.get(SearchKeys.NEXT_PAGE_BTN)
+        self._url_filtered_price  = None
+        self.use_search_cache     = True
+
+    async def open_filtered_search(self, query: str, max_price: float) -> bool:
+        if not self.url_template:
+            return False
+        logger.info(f"{self._log_prefix()}Search '{query}' under {int(max_price)} via URL template")
+        await self.go_to(build_search_url(self.url_template, query, max_price))
+        self._url_filtered_price = max_price
+        return True
+
+    def cached_item_urls(self, query: str, max_price: float, limit: int = 5):
+        if not self.use_search_cache:
+            return None
+        return search_cache.get(self._cache_key(query, max_price), limit)
+
+    def _cache_key(self, query: str, max_price: float) -> str:
+        return search_cache_key(self.site, query, {"max_price": max_price})
+
+    async def search_items_by_name_under_price(self, query: str, max_price: float, limit: int = 5) -> list[str]:
+        with deadline("search_items_by_name_under_price", SEARCH_BUDGET_SECONDS):
+            await self.wait_for_page_load()
+            if self._url_filtered_price == max_price:
+                logger.info(f"{self._log_prefix()}Max price {int(max_price)} already applied through the search URL")
+            elif self.price_filter_max and self.price_filter_submit:
+                await self._apply_price_filter(max_price)
+            else:
+                logger.warning(f"{self._log_prefix()}Price filter locators not configured — skipping price filter")
+            item_urls = await self._collect_item_urls(limit)
+        search_cache.put(self._cache_key(query, max_price), item_urls, exhausted=len(item_urls) < limit)
+        return item_urls
+
+    async def _apply_price_filter(self, max_price: float) -> None:
+        prefix = self._log_prefix()
+        logger.info(f"{prefix}Apply max price filter ({int(max_price)})")
+        price_input = await self._find_price_input()
+        if price_input is None:
+            logger.error(f"{prefix}Price filter input NOT found — skipping price filter")
+            return
+        try:
+            await price_input.scroll_into_view_if_needed()
+            await self._fill_price(price_input, str(int(max_price)))
+            await self._submit_price_filter()
+        except BudgetExceededError:
+            raise
+        except Exception as e:
+            logger.error(f"{prefix}Price filter interaction failed: {e}")
+
+    async def _find_price_input(self):
+        for selector in self.price_filter_max:
+            try:
+                price_input_element = self.page.locator(selector).first
+                with span(SpanKind.ATTEMPT, selector, action="find_price_input"):
+                    await price_input_element.wait_for(state=ElementState.VISIBLE, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS))
+                logger.info(f"{self._log_prefix()}Price filter input found: {selector}")
+                return price_input_element
+            except BudgetExceededError:
+                raise
+            except Exception:
+                logger.warning(f"{self._log_prefix()}Price filter selector not visible: {selector}")
+        return None
+
+    async def _fill_price(self, price_input, expected_value: str) -> None:
+        await price_input.click()
+        if self.ready_condition is None:
+            async with self.expect_ready():
+                await price_input.fill(expected_value)
+                await price_input.blur()
+        else:
+            await price_input.fill(expected_value)
+            await price_input.blur()
+
+    async def _submit_price_filter(self) -> None:
+        await self.wait_for_page_load()
+        for submit_selector in self.price_filter_submit:
+            try:
+                submit_btn = self.page.locator(submit_selector).first
+                with span(SpanKind.ATTEMPT, submit_selector, action="submit_price_filter"):
+                    await submit_btn.wait_for(state=ElementState.VISIBLE, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS))
+                    # A declared ready condition is the filtered results page; without one the navigation is enough
+                    async with self.expect_ready() if self.ready_condition else nullcontext():
+                        async with self.page.expect_navigation(wait_until=LoadState.DOM_CONTENT, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS)):
+                            await submit_btn.click()
+                logger.info(f"{self._log_prefix()}Price filter submitted via: {submit_selector}")
+                return
+            except BudgetExceededError:
+                raise
+            except Exception:
+                continue
+        raise RuntimeError("Price filter submit button not found — all selectors exhausted")
+
+    async def collect_results(self, limit: int, with_details: bool = True) -> list[SearchResult]:
+        collected: dict[str, SearchResult] = {}
+        await self.wait_for_page_load()
+        logger.info(f"{self._log_prefix()}Extracting up to {limit} item URLs")
+        while len(collected) < limit:
+            await self._wait_for_result_links()
+            for raw in await self._harvest_results_page(with_details):
+                url = normalize_item_url(raw["href"])
+                if url not in collected:
+                    collected[url] = SearchResult(url, raw.get("title"), raw.get("price"))
+                    if len(collected) >= limit:
+                        break
+
+            if len(collected) >= limit:
+                break
+
+            try:
+                async with self.page.expect_navigation(wait_until=LoadState.DOM_CONTENT, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS)):
+                    await self.smart_click(self.next_page_btn, timeout_ms=DEFAULT_TIMEOUT_MS)
+            except BudgetExceededError:
+                raise
+            except Exception:
+                break
+
+        return list(collected.values())[:limit]
+
+    async def _collect_item_urls(self, limit: int) -> list[str]:
+        return [result.url for result in await self.collect_results(limit, with_details=False)]
+
+    async def _wait_for_result_links(self) -> None:
+        any_result_link = self.page.locator(self.item_links[0])
+        for selector in self.item_links[1:]:
+            any_result_link = any_result_link.or_(self.page.locator(selector))
+        with span(SpanKind.WAIT, "wait_for_result_links"):
+            await any_result_link.first.wait_for(state=ElementState.ATTACHED, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS))
+
+    async def _harvest_results_page(self, with_details: bool) -> list[dict]:
+        return await self.page.evaluate(HARVEST_RESULTS_JS, {
+            "linkSelectors":  self.item_links,
+            "cardSelectors":  self.item_card,
+            "titleSelectors": self.item_title,
+            "priceSelectors": self.item_price,
+            "withDetails":    with_details,
+        })
@@ -1,26 +1,101 @@
 import allure
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+from config.settings import logger
 from core.base_page import BasePage
-from data.data_loader import load_locators
-from data.locator_keys import CartKeys
+from core.response_capture import json_path, to_number
+from core.extraction import FieldSpec
+from core.constants import FieldParser
+from data.site_profile import site_profile
+from data.locator_keys import CartKeys, CartApiKeys
+
+
+@dataclass(frozen=True)
+class CartLine:
+    title:    Optional[str]
+    price:    Optional[float]
+    quantity: int = 1
+
+
+@dataclass(frozen=True)
+class CartSnapshot:
+    subtotal:   float
+    lines:      tuple[CartLine, ...]
+    source_url: str
+
+
+def parse_cart_payload(payload, api: dict, source_url: str) -> Optional[CartSnapshot]:
+    entries = json_path(payload, api.get(CartApiKeys.LINE_ITEMS, "")) if api.get(CartApiKeys.LINE_ITEMS) else None
+    lines = tuple(
+        CartLine(
+            title=json_path(entry, api.get(CartApiKeys.TITLE, "")) if api.get(CartApiKeys.TITLE) else None,
+            price=to_number(json_path(entry, api[CartApiKeys.PRICE])) if api.get(CartApiKeys.PRICE) else None,
+            quantity=int(to_number(json_path(entry, api[CartApiKeys.QUANTITY])) or 1) if api.get(CartApiKeys.QUANTITY) else 1,
+        )
+        for entry in (entries if isinstance(entries, list) else [])
+    )
+    subtotal = to_number(json_path(payload, api[CartApiKeys.SUBTOTAL])) if api.get(CartApiKeys.SUBTOTAL) else None
+    if subtotal is None and lines and all(line.price is not None for line in lines):
+        subtotal = round(sum(line.price * line.quantity for line in lines), 2)
+    if subtotal is None:
+        return None
+    return CartSnapshot(subtotal, lines, source_url)
 
 
 class CartPage(BasePage):
     _SECTION = "cart"
 
     def __init__(self, page, site: str):
-        super().__init__(page)
-        locators                = load_locators(site).get(self._SECTION, {})
+        super().__init__(page, site)
+        locators                = site_profile(site).section(self._SECTION)
         self.cart_url           = locators.get(CartKeys.URL)
         self.subtotal_selectors = locators[CartKeys.SUBTOTAL]
+        self.api                = locators.get(CartKeys.API)
+        self._opened_at         = None
+        if self.api:
+            self.capture_responses([self.api[CartApiKeys.RESPONSE]])
+
+    def cart_from_api(self) -> Optional[CartSnapshot]:
+        # The cart JSON the site fetched while the cart page was last opened; a payload from
+        # before that (e.g. ahead of the last add-to-cart) is stale and ignored
+        if not self.api or self._opened_at is None:
+            return None
+        captured = self.captured_json(self.api[CartApiKeys.RESPONSE], since=self._opened_at)
+        if captured is None:
+            return None
+        snapshot = parse_cart_payload(captured.payload, self.api, captured.url)
+        if snapshot is None:
+            logger.warning(f"Captured cart response {captured.url} has no usable subtotal — falling back to the cart page")
+        return snapshot
+
+    def get_cart_lines(self) -> list[CartLine]:
+        snapshot = self.cart_from_api()
+        return list(snapshot.lines) if snapshot else []
 
     def get_cart_total(self) -> float:
+        self._opened_at = time.time()
         if self.cart_url and not self.page.url.startswith(self.cart_url):
-            self.go_to(self.cart_url)
+            with self.expect_ready():
+                self.go_to(self.cart_url)
+        else:
+            self.wait_until_ready()
 
-        self.wait_for_network_idle()
+        snapshot = self.cart_from_api()
+        if snapshot:
+            with allure.step(f"Reading cart subtotal from captured response {snapshot.source_url}"):
+                allure.attach(str(snapshot.subtotal), name="Cart Total")
+                allure.attach(
+                    json.dumps([line.__dict__ for line in snapshot.lines], indent=2),
+                    name="Cart Lines",
+                    attachment_type=allure.attachment_type.JSON,
+                )
+                self.take_screenshot("Cart_Page_Final")
+                return snapshot.subtotal
 
         with allure.step("Reading cart subtotal"):
-            total = self.smart_get_number(self.subtotal_selectors)
+            total = self.smart_extract({"subtotal": FieldSpec(self.subtotal_selectors, FieldParser.CURRENCY)})["subtotal"]
             allure.attach(str(total), name="Cart Total")
             self.take_screenshot("Cart_Page_Final")
             return total
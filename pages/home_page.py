@@ -1,5 +1,5 @@
 from core.base_page import BasePage
-from data.data_loader import load_locators
+from data.site_profile import site_profile
 from data.locator_keys import HomeKeys
 
 
@@ -7,8 +7,8 @@ class HomePage(BasePage):
     _SECTION = "home"
 
     def __init__(self, page, site: str):
-        super().__init__(page)
-        locators         = load_locators(site).get(self._SECTION, {})
+        super().__init__(page, site)
+        locators         = site_profile(site).section(self._SECTION)
         self.home_url    = locators[HomeKeys.URL]
         self.search_input = locators[HomeKeys.SEARCH_INPUT]
         self.search_btn  = locators[HomeKeys.SEARCH_BTN]
@@ -1,18 +1,116 @@
 import allure
 import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Optional
 from core.base_page import BasePage
-from config.settings import logger
-from data.data_loader import load_locators
+from core.deadline import BudgetExceededError
+from config.settings import logger, ADD_TO_CART_CONCURRENCY, VARIANT_SEED
+from data.site_profile import site_profile
 from data.locator_keys import ItemKeys
-from core.constants import HtmlAttr, HtmlTag, INVALID_SELECT_VALUE
+from core.constants import INVALID_SELECT_VALUE, LoadState, VariantKind
+
+# Describes the first variant widget family that exists on the page (custom listboxes,
+# then native selects, then buttons), using the first selector of that family that matches.
+# listbox groups: {controls, options} — option count inside the aria-controls target, or null
+# select groups:  enabled option values;  button groups: indexes of enabled buttons
+DISCOVER_VARIANTS_JS = """
+({listboxSelectors, optionSelector, selectSelectors, buttonSelectors, invalidValue}) => {
+    const firstMatch = (selectors) => {
+        for (const selector of selectors) {
+            let found = [];
+            try { found = Array.from(document.querySelectorAll(selector)); } catch (e) { continue; }
+            if (found.length) return {selector, found};
+        }
+        return null;
+    };
+    const enabled = el => !el.disabled && el.getAttribute("aria-disabled") !== "true";
+    const listboxes = firstMatch(listboxSelectors);
+    if (listboxes) {
+        return {kind: "listbox", selector: listboxes.selector, groups: listboxes.found.map(btn => {
+            const controls = btn.getAttribute("aria-controls");
+            const target = controls && document.getElementById(controls);
+            return {controls: target ? controls : null, options: target && optionSelector ? target.querySelectorAll(optionSelector).length : null};
+        })};
+    }
+    const selects = firstMatch(selectSelectors);
+    if (selects) {
+        return {kind: "select", selector: selects.selector, groups: selects.found.map(select =>
+            Array.from(select.options).filter(o => enabled(o) && o.value && o.value !== invalidValue).map(o => o.value))};
+    }
+    const buttons = firstMatch(buttonSelectors);
+    if (buttons) {
+        return {kind: "button", selector: buttons.selector,
+                groups: buttons.found.map((b, i) => enabled(b) ? i : -1).filter(i => i >= 0)};
+    }
+    return null;
+}
+"""
+
+# Sets every select matched by `selector` (null = leave as is) and fires the events a user change would
+APPLY_SELECT_VALUES_JS = """
+({selector, values}) => {
+    const selects = document.querySelectorAll(selector);
+    values.forEach((value, i) => {
+        if (value === null || !selects[i]) return;
+        selects[i].value = value;
+        selects[i].dispatchEvent(new Event("input", {bubbles: true}));
+        selects[i].dispatchEvent(new Event("change", {bubbles: true}));
+    });
+}
+"""
+
+VISIBLE_OPTION_INDEXES_JS = """
+selector => Array.from(document.querySelectorAll(selector))
+    .map((el, i) => el.getClientRects().length && getComputedStyle(el).visibility !== "hidden" ? i : -1)
+    .filter(i => i >= 0)
+"""
+
+
+def variant_rng(item_url: str) -> random.Random:
+    # Seeded per item, so picks are reproducible regardless of item order or concurrency
+    return random.Random(f"{VARIANT_SEED}:{item_url}")
+
+
+def listbox_option_selector(group: dict, option_selector: str) -> str:
+    return f"#{group['controls']} {option_selector}" if group["controls"] else option_selector
+
+
+def pick_select_values(groups: list[list[str]], rng: random.Random) -> list[Optional[str]]:
+    return [rng.choice(values) if values else None for values in groups]
+
+
+@dataclass
+class AddToCartResult:
+    index: int
+    url:   str
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def report_add_to_cart_results(results: list[AddToCartResult], prefix: str = "") -> list[AddToCartResult]:
+    # Serial and tab-pool runs end the same way: every item was attempted, the per-item
+    # outcome is attached, and any failures surface together in one exception
+    summary = "\n".join(
+        f"item_{result.index + 1}: {'OK' if result.succeeded else 'FAILED - ' + result.error} ({result.url})"
+        for result in results
+    )
+    allure.attach(summary, name=f"{prefix}Add to cart results")
+    failures = [result for result in results if not result.succeeded]
+    if failures:
+        raise Exception(f"{prefix}{len(failures)}/{len(results)} items could not be added to cart:\n{summary}")
+    return results
 
 
 class ItemPage(BasePage):
     _SECTION = "item"
 
     def __init__(self, page, site: str):
-        super().__init__(page)
-        locators                     = load_locators(site).get(self._SECTION, {})
+        super().__init__(page, site)
+        locators                     = site_profile(site).section(self._SECTION)
         self.add_to_cart_btn         = locators[ItemKeys.ADD_TO_CART_BTN]
         self.custom_listbox_selectors = locators.get(ItemKeys.VARIANT_CUSTOM_LISTBOXES, [])
         self.native_select_selectors  = locators.get(ItemKeys.VARIANT_NATIVE_SELECTS, [])
@@ -20,84 +118,127 @@ class ItemPage(BasePage):
         self.variant_option_selector  = variant_options[0] if variant_options else None
         self.variant_buttons          = locators.get(ItemKeys.VARIANT_BUTTONS, [])
 
-    def add_items_to_cart(self, urls: list[str]):
+    def add_items_to_cart(self, urls: Iterable[str], concurrency: int = ADD_TO_CART_CONCURRENCY) -> list[AddToCartResult]:
+        # `urls` may be a lazy stream (SearchResultsPage.stream_item_urls): each URL is
+        # pulled only when a slot frees up, so search pagination overlaps with adding.
+        # With concurrency > 1 only the item-page navigations run in parallel (background
+        # tabs); variant selection and the add-to-cart click stay serial, in item order.
+        # Either way every item is attempted and failures are raised together at the end.
+        if concurrency > 1:
+            return self._add_items_concurrently(urls, concurrency)
+        results = []
         for item_index, url in enumerate(urls):
             with allure.step(f"Adding item {item_index + 1} to cart - URL: {url}"):
-                self.go_to(url)
-                self.wait_for_page_load()
-                self._select_variants_if_exist()
+                results.append(self._try_add_item(url, item_index))
+        return report_add_to_cart_results(results)
+
+    def _try_add_item(self, url: str, item_index: int, navigate: bool = True) -> AddToCartResult:
+        try:
+            self._add_current_item(url, item_index, navigate=navigate)
+            return AddToCartResult(item_index, url)
+        except BudgetExceededError:
+            raise
+        except Exception as e:
+            logger.error(f"Adding item {item_index + 1} ({url}) failed: {e}")
+            return AddToCartResult(item_index, url, error=str(e))
+
+    def _add_current_item(self, url: str, item_index: int, navigate: bool = True) -> None:
+        if navigate:
+            self.go_to(url)
+        self.wait_for_page_load()
+        self._select_variants_if_exist()
+        if self.ready_condition:
+            # A declared ready condition confirms the add (e.g. the cart API call) before moving on
+            with self.expect_ready():
                 self.smart_click(self.add_to_cart_btn)
-                self.take_screenshot(f"item_added_{item_index + 1}")
+        else:
+            self.smart_click(self.add_to_cart_btn)
+        self.take_screenshot(f"item_added_{item_index + 1}")
 
-    def _select_variants_if_exist(self):
-        if self._try_custom_listboxes():
-            return
-        if self._try_native_selects():
-            return
-        if self._try_variant_buttons():
-            return
-        logger.info("No variants found — proceeding without selection")
+    def _add_items_concurrently(self, urls: Iterable[str], concurrency: int) -> list[AddToCartResult]:
+        # Sync Playwright drives one call at a time, so only navigation is parallel: up to
+        # `concurrency` tabs in this context (sharing the cart cookie) load their item pages
+        # in the background while the oldest tab is processed. Variant selection and the
+        # add-to-cart click happen one tab at a time, in item order.
+        results: list[AddToCartResult] = []
+        pending_tabs = deque()
+        queued_items = iter(enumerate(urls))
 
-    def _try_custom_listboxes(self) -> bool:
-        for selector in self.custom_listbox_selectors:
+        def open_next_tab():
+            next_item = next(queued_items, None)
+            if next_item is None:
+                return
+            item_index, url = next_item
+            tab = self.page.context.new_page()
+            navigation_error = None
             try:
-                listbox_buttons = self.page.locator(selector).all()
-                if not listbox_buttons:
-                    continue
-                logger.info(f"Found {len(listbox_buttons)} custom listbox variant(s) via '{selector}'")
-                for listbox_btn in listbox_buttons:
+                tab.goto(url, wait_until=LoadState.COMMIT)
+            except Exception as e:
+                navigation_error = e
+            pending_tabs.append((item_index, url, tab, navigation_error))
+
+        with allure.step(f"Adding items to cart across {concurrency} tabs"):
+            for _ in range(concurrency):
+                open_next_tab()
+
+            while pending_tabs:
+                item_index, url, tab, navigation_error = pending_tabs.popleft()
+                with allure.step(f"Adding item {item_index + 1} to cart - URL: {url}"):
                     try:
-                        listbox_btn.click()
-                        if not self.variant_option_selector:
-                            continue
-                        listbox_id = listbox_btn.get_attribute(HtmlAttr.ARIA_CONTROLS)
-                        if listbox_id:
-                            scoped_selector = f"#{listbox_id} {self.variant_option_selector}"
-                            available_options = self.page.locator(scoped_selector).all()
+                        if navigation_error:
+                            logger.error(f"Adding item {item_index + 1} ({url}) failed: {navigation_error}")
+                            results.append(AddToCartResult(item_index, url, error=str(navigation_error)))
                         else:
-                            available_options = [
-                                opt for opt in self.page.locator(self.variant_option_selector).all()
-                                if opt.is_visible()
-                            ]
-                        if available_options:
-                            chosen = random.choice(available_options)
-                            chosen.scroll_into_view_if_needed()
-                            chosen.click()
-                    except Exception as e:
-                        logger.warning(f"Custom listbox variant selection failed: {e}")
-                return True
-            except Exception:
-                continue
-        return False
-
-    def _try_native_selects(self) -> bool:
-        for selector in self.native_select_selectors:
-            try:
-                native_selects = self.page.locator(selector).all()
-                if not native_selects:
-                    continue
-                logger.info(f"Found {len(native_selects)} native select variant(s) via '{selector}'")
-                for native_select in native_selects:
-                    all_options = native_select.locator(HtmlTag.OPTION).all()
-                    selectable_values = [
-                        opt.get_attribute(HtmlAttr.VALUE) for opt in all_options
-                        if opt.get_attribute(HtmlAttr.VALUE) and opt.get_attribute(HtmlAttr.VALUE) != INVALID_SELECT_VALUE
-                    ]
-                    if selectable_values:
-                        native_select.select_option(value=random.choice(selectable_values))
-                return True
-            except Exception:
-                continue
-        return False
-
-    def _try_variant_buttons(self) -> bool:
-        for selector in self.variant_buttons:
+                            results.append(ItemPage(tab, self.site)._try_add_item(url, item_index, navigate=False))
+                    finally:
+                        tab.close()
+                        open_next_tab()
+
+        return report_add_to_cart_results(results)
+
+    def _select_variants_if_exist(self):
+        # One evaluation describes the whole variant matrix; picks are made in Python
+        # from a per-item seeded RNG and applied with as few round trips as possible.
+        variants = self.page.evaluate(DISCOVER_VARIANTS_JS, self._variant_discovery_args())
+        if variants is None:
+            logger.info("No variants found — proceeding without selection")
+            return
+        rng = variant_rng(self.page.url)
+        logger.info(f"Found {len(variants['groups'])} {variants['kind']} variant group(s) via '{variants['selector']}' (seed {VARIANT_SEED})")
+        if variants["kind"] == VariantKind.LISTBOX:
+            self._apply_listbox_choices(variants, rng)
+        elif variants["kind"] == VariantKind.SELECT:
+            self.page.evaluate(APPLY_SELECT_VALUES_JS, {
+                "selector": variants["selector"],
+                "values":   pick_select_values(variants["groups"], rng),
+            })
+        elif variants["groups"]:
+            self.page.locator(variants["selector"]).nth(rng.choice(variants["groups"])).click()
+
+    def _variant_discovery_args(self) -> dict:
+        return {
+            "listboxSelectors": self.custom_listbox_selectors,
+            "optionSelector":   self.variant_option_selector,
+            "selectSelectors":  self.native_select_selectors,
+            "buttonSelectors":  self.variant_buttons,
+            "invalidValue":     INVALID_SELECT_VALUE,
+        }
+
+    def _apply_listbox_choices(self, variants: dict, rng: random.Random) -> None:
+        listbox_buttons = self.page.locator(variants["selector"])
+        for group_index, group in enumerate(variants["groups"]):
             try:
-                buttons = self.page.locator(selector).all()
-                if not buttons:
+                listbox_buttons.nth(group_index).click()
+                if not self.variant_option_selector:
                     continue
-                random.choice(buttons).click()
-                return True
-            except Exception:
-                continue
-        return False
+                option_selector = listbox_option_selector(group, self.variant_option_selector)
+                option_indexes = list(range(group["options"] or 0))
+                if not option_indexes:
+                    # Unscoped (or lazily rendered) listboxes only reveal their options once opened
+                    option_indexes = self.page.evaluate(VISIBLE_OPTION_INDEXES_JS, option_selector)
+                if option_indexes:
+                    self.page.locator(option_selector).nth(rng.choice(option_indexes)).click()
+            except BudgetExceededError:
+                raise
+            except Exception as e:
+                logger.warning(f"Custom listbox variant selection failed: {e}")
@@ -1,24 +1,42 @@
 import allure
+from config.settings import logger
 from core.base_page import BasePage
-from data.data_loader import load_locators
+from data.site_profile import site_profile
 from data.locator_keys import LoginKeys
+from core.constants import DEFAULT_TIMEOUT_MS, ElementState
+from typing import Optional
 
 
 class LoginPage(BasePage):
     _SECTION = "login"
 
     def __init__(self, page, site: str):
-        super().__init__(page)
-        locators            = load_locators(site).get(self._SECTION, {})
-        self.username_input = locators[LoginKeys.USERNAME_INPUT]
-        self.continue_btn   = locators[LoginKeys.CONTINUE_BTN]
-        self.password_input = locators[LoginKeys.PASSWORD_INPUT]
-        self.submit_btn     = locators[LoginKeys.SUBMIT_BTN]
+        super().__init__(page, site)
+        locators              = site_profile(site).section(self._SECTION)
+        self.username_input   = locators[LoginKeys.USERNAME_INPUT]
+        self.continue_btn     = locators[LoginKeys.CONTINUE_BTN]
+        self.password_input   = locators[LoginKeys.PASSWORD_INPUT]
+        self.submit_btn       = locators[LoginKeys.SUBMIT_BTN]
+        self.logged_in_marker = locators.get(LoginKeys.LOGGED_IN_MARKER)
 
     def login(self, email: str, password: str):
         with allure.step(f"Login with {email}"):
             self.smart_fill(self.username_input, email)
             self.smart_click(self.continue_btn)
             self.smart_fill(self.password_input, password)
-            self.smart_click(self.submit_btn)
-            self.wait_for_network_idle()
+            with self.expect_ready():
+                self.smart_click(self.submit_btn)
+
+    def is_logged_in(self, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> Optional[bool]:
+        # None means the site declares no logged-in marker, so the session cannot be verified
+        if not self.logged_in_marker:
+            return None
+        any_marker = self.page.locator(self.logged_in_marker[0])
+        for selector in self.logged_in_marker[1:]:
+            any_marker = any_marker.or_(self.page.locator(selector))
+        try:
+            any_marker.first.wait_for(state=ElementState.VISIBLE, timeout=timeout_ms)
+            return True
+        except Exception:
+            logger.info("Logged-in marker not found — session is not authenticated")
+            return False
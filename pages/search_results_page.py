@@ -1,29 +1,126 @@
 import allure
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Iterator, Optional
 from core.base_page import BasePage
-from config.settings import logger
-from data.data_loader import load_locators
+from config.settings import logger, SEARCH_BUDGET_SECONDS
+from core.url_utils import normalize_item_url, build_search_url
+from core.search_cache import search_cache, search_cache_key
+from core.deadline import deadline, budgeted_timeout, BudgetExceededError
+from core.instrumentation import span
+from data.site_profile import site_profile
 from data.locator_keys import SearchKeys
-from core.constants import ElementState, LoadState, DEFAULT_TIMEOUT_MS
+from core.constants import ElementState, LoadState, SpanKind, DEFAULT_TIMEOUT_MS
+
+# Runs once per results page: uses the first link selector that matches anything and
+# returns every link's absolute href plus (optionally) the card's title and price text.
+HARVEST_RESULTS_JS = """
+({linkSelectors, cardSelectors, titleSelectors, priceSelectors, withDetails}) => {
+    const firstText = (root, selectors) => {
+        for (const selector of selectors) {
+            const el = root.querySelector(selector);
+            if (el && el.textContent.trim()) return el.textContent.trim();
+        }
+        return null;
+    };
+    for (const selector of linkSelectors) {
+        const links = Array.from(document.querySelectorAll(selector));
+        if (!links.length) continue;
+        return links.filter(a => a.href).map(a => {
+            if (!withDetails) return {href: a.href};
+            const card = cardSelectors.map(s => a.closest(s)).find(Boolean) || a;
+            return {
+                href:  a.href,
+                title: firstText(card, titleSelectors) || a.textContent.trim(),
+                price: firstText(card, priceSelectors),
+            };
+        });
+    }
+    return [];
+}
+"""
+
+# Describes the first enabled "next page" control: its absolute href when it is a real link
+NEXT_PAGE_TARGET_JS = """
+selectors => {
+    for (const selector of selectors) {
+        let el = null;
+        try { el = document.querySelector(selector); } catch (e) { continue; }
+        if (!el || el.disabled || el.getAttribute("aria-disabled") === "true") continue;
+        const href = el.href && !el.href.startsWith("javascript:") && el.href.split("#")[0] !== location.href.split("#")[0] ? el.href : null;
+        return {href};
+    }
+    return null;
+}
+"""
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    url:   str
+    title: Optional[str] = None
+    price: Optional[str] = None
 
 
 class SearchResultsPage(BasePage):
     _SECTION = "search"
 
     def __init__(self, page, site: str):
-        super().__init__(page)
-        locators                  = load_locators(site).get(self._SECTION, {})
+        super().__init__(page, site)
+        locators                  = site_profile(site).section(self._SECTION)
+        self.url_template         = locators.get(SearchKeys.URL_TEMPLATE)
         self.price_filter_max     = locators.get(SearchKeys.PRICE_FILTER_MAX)
         self.price_filter_submit  = locators.get(SearchKeys.PRICE_FILTER_SUBMIT)
         self.item_links           = locators[SearchKeys.ITEM_LINKS]
+        self.item_card            = locators.get(SearchKeys.ITEM_CARD, [])
+        self.item_title           = locators.get(SearchKeys.ITEM_TITLE, [])
+        self.item_price           = locators.get(SearchKeys.ITEM_PRICE, [])
         self.next_page_btn        = locators.get(SearchKeys.NEXT_PAGE_BTN)
+        self._url_filtered_price  = None
+        # False for tests that must exercise the live search (pytest marker `live_search`)
+        self.use_search_cache     = True
+
+    def open_filtered_search(self, query: str, max_price: float) -> bool:
+        # One navigation replaces typing the query on the home page and driving the
+        # price-filter widget. False when the site declares no URL template.
+        if not self.url_template:
+            return False
+        with allure.step(f"Search '{query}' under {int(max_price)} via URL template"):
+            self.go_to(build_search_url(self.url_template, query, max_price))
+        self._url_filtered_price = max_price
+        return True
+
+    def cached_item_urls(self, query: str, max_price: float, limit: int = 5) -> Optional[list[str]]:
+        # Checked before searching at all: a hit skips the search navigation and the harvest
+        if not self.use_search_cache:
+            return None
+        return search_cache.get(self._cache_key(query, max_price), limit)
 
     def search_items_by_name_under_price(self, query: str, max_price: float, limit: int = 5) -> list[str]:
+        with deadline("search_items_by_name_under_price", SEARCH_BUDGET_SECONDS):
+            self._filter_by_max_price(max_price)
+            item_urls = self._collect_item_urls(limit)
+        search_cache.put(self._cache_key(query, max_price), item_urls, exhausted=len(item_urls) < limit)
+        return item_urls
+
+    def stream_items_by_name_under_price(self, query: str, max_price: float, limit: int = 5) -> Iterator[str]:
+        # The price filter is applied right away; URLs are then yielded page by page. Only the filter
+        # gets the search budget: pagination runs while the consumer does, under the test's budget.
+        with deadline("stream_items_by_name_under_price", SEARCH_BUDGET_SECONDS):
+            self._filter_by_max_price(max_price)
+        return self.stream_item_urls(limit, cache_key=self._cache_key(query, max_price))
+
+    def _cache_key(self, query: str, max_price: float) -> str:
+        return search_cache_key(self.site, query, {"max_price": max_price})
+
+    def _filter_by_max_price(self, max_price: float) -> None:
         self.wait_for_page_load()
-        if self.price_filter_max and self.price_filter_submit:
+        if self._url_filtered_price == max_price:
+            logger.info(f"Max price {int(max_price)} already applied through the search URL")
+        elif self.price_filter_max and self.price_filter_submit:
             self._apply_price_filter(max_price)
         else:
             logger.warning("Price filter locators not configured — skipping price filter")
-        return self._collect_item_urls(limit)
 
     def _apply_price_filter(self, max_price: float) -> None:
         with allure.step(f"Apply max price filter ({int(max_price)})"):
@@ -35,6 +132,8 @@ class SearchResultsPage(BasePage):
                 price_input.scroll_into_view_if_needed()
                 self._fill_price(price_input, str(int(max_price)))
                 self._submit_price_filter()
+            except BudgetExceededError:
+                raise
             except Exception as e:
                 logger.error(f"Price filter interaction failed: {e}")
                 allure.attach(str(e), name="Price Filter Error")
@@ -43,58 +142,153 @@ class SearchResultsPage(BasePage):
         for selector in self.price_filter_max:
             try:
                 price_input_element = self.page.locator(selector).first
-                price_input_element.wait_for(state=ElementState.VISIBLE, timeout=DEFAULT_TIMEOUT_MS)
+                with span(SpanKind.ATTEMPT, selector, action="find_price_input"):
+                    price_input_element.wait_for(state=ElementState.VISIBLE, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS))
                 logger.info(f"Price filter input found: {selector}")
                 return price_input_element
+            except BudgetExceededError:
+                raise
             except Exception:
                 logger.warning(f"Price filter selector not visible: {selector}")
         return None
 
     def _fill_price(self, price_input, expected_value: str) -> None:
         price_input.click()
-        price_input.fill(expected_value)
-        self.wait_for_network_idle()
-        price_input.blur()
-        self.wait_for_network_idle()
+        if self.ready_condition is None:
+            # No declared condition: let whatever the input triggers settle (network idle)
+            with self.expect_ready():
+                price_input.fill(expected_value)
+                price_input.blur()
+        else:
+            # The declared condition is the filtered results page, awaited around the submit
+            price_input.fill(expected_value)
+            price_input.blur()
 
     def _submit_price_filter(self) -> None:
         self.wait_for_page_load()
         for submit_selector in self.price_filter_submit:
             try:
                 submit_btn = self.page.locator(submit_selector).first
-                submit_btn.wait_for(state=ElementState.VISIBLE, timeout=DEFAULT_TIMEOUT_MS)
-                with self.page.expect_navigation(wait_until=LoadState.DOM_CONTENT, timeout=DEFAULT_TIMEOUT_MS):
-                    submit_btn.click()
+                with span(SpanKind.ATTEMPT, submit_selector, action="submit_price_filter"):
+                    submit_btn.wait_for(state=ElementState.VISIBLE, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS))
+                    # A declared ready condition is the filtered results page; without one the navigation is enough
+                    with self.expect_ready() if self.ready_condition else nullcontext():
+                        with self.page.expect_navigation(wait_until=LoadState.DOM_CONTENT, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS)):
+                            submit_btn.click()
                 logger.info(f"Price filter submitted via: {submit_selector}")
                 return
+            except BudgetExceededError:
+                raise
             except Exception:
                 continue
         raise RuntimeError("Price filter submit button not found — all selectors exhausted")
 
-    def _collect_item_urls(self, limit: int) -> list[str]:
-        collected_urls = []
+    def collect_results(self, limit: int, with_details: bool = True) -> list[SearchResult]:
+        # dict doubles as an insertion-ordered set keyed by normalised URL
+        collected: dict[str, SearchResult] = {}
         self.wait_for_page_load()
         with allure.step(f"Extracting up to {limit} item URLs"):
-            while len(collected_urls) < limit:
-                self.page.wait_for_selector(
-                    self.item_links[0],
-                    state=ElementState.ATTACHED,
-                    timeout=DEFAULT_TIMEOUT_MS,
-                )
-                for item_link in self.page.locator(self.item_links[0]).all():
-                    if len(collected_urls) >= limit:
-                        break
-                    href = item_link.get_attribute("href")
-                    if href and href not in collected_urls:
-                        collected_urls.append(href)
-
-                if len(collected_urls) >= limit:
+            while len(collected) < limit:
+                self._wait_for_result_links()
+                for raw in self._harvest_results_page(with_details):
+                    url = normalize_item_url(raw["href"])
+                    if url not in collected:
+                        collected[url] = SearchResult(url, raw.get("title"), raw.get("price"))
+                        if len(collected) >= limit:
+                            break
+
+                if len(collected) >= limit:
                     break
 
                 try:
-                    with self.page.expect_navigation(wait_until=LoadState.DOM_CONTENT, timeout=DEFAULT_TIMEOUT_MS):
+                    with self.page.expect_navigation(wait_until=LoadState.DOM_CONTENT, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS)):
                         self.smart_click(self.next_page_btn, timeout_ms=DEFAULT_TIMEOUT_MS)
+                except BudgetExceededError:
+                    raise
                 except Exception:
                     break
 
-        return collected_urls[:limit]
+        return list(collected.values())[:limit]
+
+    def _collect_item_urls(self, limit: int) -> list[str]:
+        return [result.url for result in self.collect_results(limit, with_details=False)]
+
+    def stream_item_urls(self, limit: int, cache_key: str = None) -> Iterator[str]:
+        # The search cache is filled only when the stream is consumed to the end
+        harvested = []
+        for url in self._stream_live_item_urls(limit):
+            harvested.append(url)
+            yield url
+        if cache_key:
+            search_cache.put(cache_key, harvested, exhausted=len(harvested) < limit)
+
+    def _stream_live_item_urls(self, limit: int) -> Iterator[str]:
+        # Yields normalised, deduplicated item URLs as soon as each results page is
+        # harvested. Before a page's URLs are handed out, the next results page starts
+        # loading in a background tab, so the consumer may navigate this page freely
+        # (e.g. ItemPage on the same tab) while pagination continues in the browser.
+        seen = set()
+        results_page = self
+        self.wait_for_page_load()
+        try:
+            while len(seen) < limit:
+                try:
+                    results_page._wait_for_result_links()
+                except BudgetExceededError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"No result links on {results_page.page.url}: {e}")
+                    return
+                fresh = []
+                for raw in results_page._harvest_results_page(with_details=False):
+                    url = normalize_item_url(raw["href"])
+                    if url not in seen and len(seen) < limit:
+                        seen.add(url)
+                        fresh.append(url)
+                next_tab = results_page._prefetch_next_page() if len(seen) < limit else None
+                logger.info(f"Streaming {len(fresh)} item URL(s) from {results_page.page.url} ({len(seen)}/{limit})")
+                yield from fresh
+                if results_page is not self:
+                    results_page.page.close()
+                if next_tab is None:
+                    return
+                results_page = SearchResultsPage(next_tab, self.site)
+        finally:
+            if results_page is not self and not results_page.page.is_closed():
+                results_page.page.close()
+
+    def _prefetch_next_page(self):
+        if not self.next_page_btn:
+            return None
+        target = self.page.evaluate(NEXT_PAGE_TARGET_JS, self.next_page_btn)
+        if target is None:
+            return None
+        tab = self.page.context.new_page()
+        try:
+            if target["href"]:
+                tab.goto(target["href"], wait_until=LoadState.COMMIT)
+            else:
+                # Script-driven pagination: replay the click on a copy of this page
+                tab.goto(self.page.url, wait_until=LoadState.DOM_CONTENT)
+                SearchResultsPage(tab, self.site).smart_click(self.next_page_btn)
+        except Exception as e:
+            logger.warning(f"Could not prefetch the next results page: {e}")
+            tab.close()
+            return None
+        return tab
+
+    def _wait_for_result_links(self) -> None:
+        any_result_link = self.page.locator(self.item_links[0])
+        for selector in self.item_links[1:]:
+            any_result_link = any_result_link.or_(self.page.locator(selector))
+        with span(SpanKind.WAIT, "wait_for_result_links"):
+            any_result_link.first.wait_for(state=ElementState.ATTACHED, timeout=budgeted_timeout(DEFAULT_TIMEOUT_MS))
+
+    def _harvest_results_page(self, with_details: bool) -> list[dict]:
+        return self.page.evaluate(HARVEST_RESULTS_JS, {
+            "linkSelectors":  self.item_links,
+            "cardSelectors":  self.item_card,
+            "titleSelectors": self.item_title,
+            "priceSelectors": self.item_price,
+            "withDetails":    with_details,
+        })
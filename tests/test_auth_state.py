@@ -0,0 +1,73 @@
+import json
+
+from core.auth_state import AuthStateCache
+
+
+class FakeContext:
+    def __init__(self, options: dict):
+        self.options  = options
+        self.prepared = []
+        self.cookies  = []
+        self.closed   = False
+
+    def new_page(self):
+        return self
+
+    def storage_state(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"cookies": [{"name": "session", "value": "fresh"}], "origins": []}, f)
+
+    def clear_cookies(self) -> None:
+        self.cookies = []
+
+    def add_cookies(self, cookies: list[dict]) -> None:
+        self.cookies.extend(cookies)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        self.contexts.append(FakeContext(options))
+        return self.contexts[-1]
+
+
+def _cache(tmp_path, browser, logged_in=True):
+    return AuthStateCache(
+        browser,
+        state_dir=str(tmp_path),
+        ttl_seconds=3600,
+        context_options={"locale": "en-US"},
+        log_in=lambda page, site: None,
+        is_logged_in=lambda page, site: logged_in,
+        prepare_context=lambda context, site: context.prepared.append(site),
+    )
+
+
+def test_every_auth_context_is_prepared_for_its_site(tmp_path):
+    browser = FakeBrowser()
+    cache = _cache(tmp_path, browser)
+    state_path = cache.storage_state_for("fakeshop")
+    # Second run in the same state dir: the saved state is verified instead of re-created
+    _cache(tmp_path, browser).storage_state_for("fakeshop")
+    assert [context.prepared for context in browser.contexts] == [["fakeshop"], ["fakeshop"]]
+    assert browser.contexts[1].options == {"locale": "en-US", "storage_state": state_path}
+    assert all(context.closed for context in browser.contexts)
+
+
+def test_refresh_re_authenticates_and_swaps_the_session_cookies(tmp_path):
+    browser = FakeBrowser()
+    cache = _cache(tmp_path, browser)
+    cache.storage_state_for("fakeshop")
+    test_context = FakeContext({})
+    test_context.cookies = [{"name": "session", "value": "expired"}]
+
+    cache.refresh(test_context, "fakeshop")
+
+    # Verified sites skip the check, so only a fresh login opens a second context
+    assert len(browser.contexts) == 2
+    assert test_context.cookies == [{"name": "session", "value": "fresh"}]
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from data.data_loader import iter_test_params, _price, _shard_of
+
+ROWS = [
+    {"site": "ebay", "query": "shoes", "maxPrice": 220, "limit": 3},
+    {"site": "ebay", "query": "shirt", "maxPrice": 49.5, "limit": 2},
+    {"site": "fakeshop", "query": "shoes", "maxPrice": 100, "limit": 5},
+    {"site": "fakeshop", "query": "boots", "maxPrice": 150, "limit": 1},
+]
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in ROWS) + "\n\n")
+    return str(path)
+
+
+def test_price_keeps_whole_prices_as_ints():
+    assert _price("220") == 220 and isinstance(_price("220"), int)
+    assert _price(220.0) == 220 and isinstance(_price(220.0), int)
+    assert _price("49.5") == 49.5
+
+
+def test_shard_of_is_stable_and_in_range():
+    params = ("ebay", "shoes", 220, 3)
+    assert _shard_of(params, 4) == _shard_of(params, 4)
+    assert all(0 <= _shard_of(tuple(row.values()), 3) < 3 for row in ROWS)
+
+
+def test_reads_every_format_to_the_same_cases(tmp_path, jsonl_path):
+    csv_path = tmp_path / "cases.csv"
+    csv_path.write_text("site,query,maxPrice,limit\n" + "".join(
+        f"{row['site']},{row['query']},{row['maxPrice']},{row['limit']}\n" for row in ROWS
+    ))
+    grouped_path = tmp_path / "cases.json"
+    grouped = {}
+    for row in ROWS:
+        grouped.setdefault(row["site"], []).append({key: value for key, value in row.items() if key != "site"})
+    grouped_path.write_text(json.dumps(grouped))
+
+    expected = [("ebay", "shoes", 220, 3), ("ebay", "shirt", 49.5, 2), ("fakeshop", "shoes", 100, 5), ("fakeshop", "boots", 150, 1)]
+    assert list(iter_test_params(jsonl_path)) == expected
+    assert list(iter_test_params(str(csv_path))) == expected
+    assert list(iter_test_params(str(grouped_path))) == expected
+
+
+def test_duplicates_are_skipped_across_price_spellings(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("\n".join(json.dumps(dict(ROWS[0], maxPrice=price)) for price in (220, "220", 220.0)))
+    assert list(iter_test_params(str(path))) == [("ebay", "shoes", 220, 3)]
+
+
+def test_shards_partition_the_cases(jsonl_path):
+    shards = [list(iter_test_params(jsonl_path, shard_index=index, shard_count=3)) for index in range(3)]
+    assert sorted(case for shard in shards for case in shard) == sorted(iter_test_params(jsonl_path))
+
+
+@pytest.mark.parametrize("shard_index, shard_count", [(-1, 2), (2, 2)])
+def test_shard_index_out_of_range_is_rejected(jsonl_path, shard_index, shard_count):
+    with pytest.raises(ValueError):
+        list(iter_test_params(jsonl_path, shard_index=shard_index, shard_count=shard_count))
@@ -0,0 +1,79 @@
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.deadline import BudgetExceededError, budgeted_timeout, charged, current_budget, deadline
+
+
+def test_no_budget_passes_the_requested_timeout_through():
+    assert current_budget() is None
+    assert budgeted_timeout(5000) == 5000
+    assert budgeted_timeout(None) is None
+
+
+def test_zero_seconds_opens_no_budget():
+    with deadline("search", 0) as budget:
+        assert budget is None
+        assert budgeted_timeout(5000) == 5000
+
+
+def test_timeout_is_clamped_to_the_remaining_budget(clock):
+    with deadline("search", 10):
+        assert budgeted_timeout(30_000) == 10_000
+        assert budgeted_timeout(2_000) == 2_000
+        clock[0] += 9
+        assert budgeted_timeout(30_000) == 1_000
+        # Playwright's default (None) is shortened by the budget too
+        assert budgeted_timeout(None) == 1_000
+    assert current_budget() is None
+
+
+def test_nested_budget_is_limited_by_its_parent(clock):
+    with deadline("test", 5) as outer:
+        clock[0] += 4
+        with deadline("search", 60) as inner:
+            assert inner.parent is outer
+            assert inner.remaining_ms() == pytest.approx(1_000)
+            assert budgeted_timeout(None) == 1_000
+        assert current_budget() is outer
+
+
+def test_exhausted_budget_raises_before_waiting(clock):
+    with deadline("test", 1) as budget:
+        clock[0] += 2
+        with pytest.raises(BudgetExceededError) as raised:
+            budgeted_timeout(1_000)
+        assert raised.value.budget is budget
+
+
+def test_charged_converts_a_timeout_that_used_up_the_budget(clock):
+    with deadline("test", 1):
+        with pytest.raises(BudgetExceededError) as raised:
+            with charged("attempt #price"):
+                clock[0] += 1.5
+                raise PlaywrightTimeoutError("Timeout 1000ms exceeded")
+        assert isinstance(raised.value.__cause__, PlaywrightTimeoutError)
+        assert "attempt #price" in str(raised.value)
+
+
+def test_charged_keeps_a_timeout_while_budget_remains(clock):
+    with deadline("test", 10):
+        with pytest.raises(PlaywrightTimeoutError):
+            with charged("attempt #price"):
+                clock[0] += 1
+                raise PlaywrightTimeoutError("Timeout 1000ms exceeded")
+
+
+def test_breakdown_charges_every_enclosing_budget(clock):
+    with deadline("test", 60) as outer:
+        with deadline("search", 30) as inner:
+            for _ in range(3):
+                with charged("attempt #price"):
+                    clock[0] += 1
+            with charged("navigate"):
+                clock[0] += 2
+            assert inner.breakdown() == [("attempt #price", pytest.approx(3_000), 3), ("navigate", pytest.approx(2_000), 1)]
+        clock[0] += 0.5
+        assert outer.breakdown()[-1] == ("(untracked)", pytest.approx(500), 0)
+        report = outer.report()
+        assert report.startswith("Time budget 'test' (60.0s): 5.5s used")
+        assert "attempt #price (3x)" in report
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+import allure
+
+from config.settings import logger, USER_EMAIL, USER_PASSWORD, ASYNC_CASE_CONCURRENCY
+from data.data_loader import load_test_params
+
+
+async def _run_checkout_flow(site_pages, site: str, query: str, max_price: float, limit: int) -> tuple[float, float]:
+    if USER_EMAIL and USER_PASSWORD:
+        await site_pages.home.navigate()
+        await site_pages.home.go_to_login()
+        await site_pages.login.login(USER_EMAIL, USER_PASSWORD)
+
+    item_urls = site_pages.search.cached_item_urls(query, max_price, limit)
+    if item_urls is None:
+        if not await site_pages.search.open_filtered_search(query, max_price):
+            await site_pages.home.navigate()
+            await site_pages.home.search(query)
+        item_urls = await site_pages.search.search_items_by_name_under_price(query, max_price, limit)
+
+    if not item_urls:
+        logger.warning(f"[{site}:{query}] No items found for criteria. Skipping add-to-cart.")
+    else:
+        await site_pages.item.add_items_to_cart(item_urls)
+
+    cart_total = await site_pages.cart.get_cart_total()
+    return cart_total, max_price * len(item_urls)
+
+
+@allure.feature("E-Commerce Checkout Flow (async)")
+@pytest.mark.async_stack
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ecommerce_end_to_end_concurrent(async_site_pages_factory):
+
+    allure.dynamic.title(f"Concurrent checkout flows (up to {ASYNC_CASE_CONCURRENCY} at once)")
+    semaphore = asyncio.Semaphore(ASYNC_CASE_CONCURRENCY)
+
+    async def run_case(site, query, max_price, limit):
+        async with semaphore:
+            label = f"{site}:{query}"
+            site_pages = await async_site_pages_factory(site, label)
+            cart_total, budget_threshold = await _run_checkout_flow(site_pages, site, query, max_price, limit)
+            assert cart_total <= budget_threshold, (
+                f"[{label}] Cart total {cart_total} exceeds budget limit {budget_threshold}"
+            )
+            return f"[{label}] cart total {cart_total} <= budget threshold {budget_threshold}"
+
+    cases = load_test_params()
+    outcomes = await asyncio.gather(*(run_case(*case) for case in cases), return_exceptions=True)
+
+    report = "\n".join(
+        f"FAILED {case[0]}:{case[1]} - {outcome}" if isinstance(outcome, BaseException) else f"PASSED {outcome}"
+        for case, outcome in zip(cases, outcomes)
+    )
+    allure.attach(report, name="Concurrent case results")
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    assert not failures, f"{len(failures)}/{len(cases)} concurrent cases failed:\n{report}"
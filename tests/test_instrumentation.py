@@ -0,0 +1,51 @@
+import asyncio
+
+from core.constants import SpanKind
+from core.instrumentation import SpanRecorder, span
+
+
+def test_spans_outside_a_started_recorder_are_not_recorded():
+    recorder = SpanRecorder("test_id")
+    with span(SpanKind.ACTION, "before"):
+        pass
+
+    recorder.start()
+    with span(SpanKind.ACTION, "during"):
+        pass
+    recorder.finish()
+
+    with span(SpanKind.ACTION, "after"):
+        pass
+    assert [recorded.name for recorded in recorder.spans] == ["during"]
+
+
+def test_finishing_a_nested_recorder_restores_the_outer_one():
+    outer, inner = SpanRecorder("outer"), SpanRecorder("inner")
+    outer.start()
+    inner.start()
+    with span(SpanKind.ACTION, "inner_span"):
+        pass
+    inner.finish()
+    with span(SpanKind.ACTION, "outer_span"):
+        pass
+    outer.finish()
+
+    assert [recorded.name for recorded in inner.spans] == ["inner_span"]
+    assert [recorded.name for recorded in outer.spans] == ["outer_span"]
+
+
+def test_tasks_started_during_the_test_record_into_its_recorder():
+    recorder = SpanRecorder("test_id")
+
+    async def case(name: str):
+        with span(SpanKind.ACTION, name):
+            await asyncio.sleep(0)
+
+    async def run_cases():
+        await asyncio.gather(case("first"), case("second"))
+
+    recorder.start()
+    asyncio.run(run_cases())
+    recorder.finish()
+
+    assert sorted(recorded.name for recorded in recorder.spans) == ["first", "second"]
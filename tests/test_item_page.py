@@ -0,0 +1,31 @@
+import pytest
+
+from pages.item_page import AddToCartResult, ItemPage, report_add_to_cart_results
+
+
+class FlakyItemPage(ItemPage):
+    # Skips the page setup; adding fails for URLs listed in `failing`
+    def __init__(self, failing: set[str]):
+        self.failing = failing
+        self.added   = []
+
+    def _add_current_item(self, url: str, item_index: int, navigate: bool = True) -> None:
+        if url in self.failing:
+            raise Exception("add-to-cart button not found")
+        self.added.append(url)
+
+
+def test_serial_add_attempts_every_item_and_raises_the_aggregated_failures():
+    item_page = FlakyItemPage(failing={"/b"})
+
+    with pytest.raises(Exception, match=r"1/3 items could not be added to cart") as raised:
+        item_page.add_items_to_cart(["/a", "/b", "/c"], concurrency=1)
+
+    assert item_page.added == ["/a", "/c"]
+    assert "item_2: FAILED - add-to-cart button not found (/b)" in str(raised.value)
+
+
+def test_report_returns_results_when_every_item_was_added():
+    results = [AddToCartResult(0, "/a"), AddToCartResult(1, "/b")]
+
+    assert report_add_to_cart_results(results) == results
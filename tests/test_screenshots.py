@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import allure
+
+from core import screenshots
+from core.screenshots import BackgroundAttachmentWriter
+
+
+def _with_lifecycle(monkeypatch, lifecycle) -> list:
+    plugin = SimpleNamespace(allure_logger=lifecycle)
+    monkeypatch.setattr(screenshots.allure_commons.plugin_manager, "get_plugins", lambda: [plugin])
+    attached = []
+    monkeypatch.setattr(screenshots.allure, "attach", lambda body, name, attachment_type: attached.append(name))
+    return attached
+
+
+def test_attachment_is_written_synchronously_without_the_lifecycle_hook(monkeypatch):
+    attached = _with_lifecycle(monkeypatch, SimpleNamespace())
+    writer = BackgroundAttachmentWriter()
+
+    writer.attach(b"png", "item_added_1", allure.attachment_type.PNG)
+    writer.attach(b"png", "item_added_2", allure.attachment_type.PNG)
+
+    assert attached == ["item_added_1", "item_added_2"]
+    assert writer._thread is None
+
+
+def test_attachment_is_written_synchronously_when_registering_fails(monkeypatch):
+    def failing_attach(uuid, name, attachment_type):
+        raise KeyError("no running test")
+
+    attached = _with_lifecycle(monkeypatch, SimpleNamespace(_attach=failing_attach))
+    BackgroundAttachmentWriter().attach(b"png", "item_added_1", allure.attachment_type.PNG)
+
+    assert attached == ["item_added_1"]
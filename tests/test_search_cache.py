@@ -0,0 +1,67 @@
+import json
+
+from core.search_cache import SearchResultCache, search_cache_key
+
+URLS = ["https://shop.test/item/1", "https://shop.test/item/2", "https://shop.test/item/3"]
+
+
+def test_key_ignores_filter_order():
+    assert search_cache_key("ebay", "shoes", {"max": 220, "page": 1}) == search_cache_key("ebay", "shoes", {"page": 1, "max": 220})
+
+
+def test_put_then_get_serves_up_to_the_stored_urls(clock):
+    cache = SearchResultCache("", ttl_seconds=60)
+    cache.put("k", URLS, exhausted=False)
+    assert cache.get("k", 2) == URLS[:2]
+    assert cache.get("k", 3) == URLS
+    assert cache.summary() == {"hits": 2, "misses": 0, "entries": 1}
+
+
+def test_partial_entry_misses_a_larger_limit(clock):
+    cache = SearchResultCache("", ttl_seconds=60)
+    cache.put("k", URLS[:2], exhausted=False)
+    assert cache.get("k", 3) is None
+    assert cache.misses == 1
+
+
+def test_exhausted_entry_serves_any_limit(clock):
+    cache = SearchResultCache("", ttl_seconds=60)
+    cache.put("k", URLS[:2], exhausted=True)
+    assert cache.get("k", 10) == URLS[:2]
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = SearchResultCache("", ttl_seconds=60)
+    cache.put("k", URLS, exhausted=False)
+    clock[0] += 61
+    assert cache.get("k", 1) is None
+
+
+def test_shorter_live_result_does_not_replace_a_fresh_longer_entry(clock):
+    cache = SearchResultCache("", ttl_seconds=60)
+    cache.put("k", URLS, exhausted=False)
+    cache.put("k", URLS[:1], exhausted=False)
+    assert cache.get("k", 3) == URLS
+    # An exhausted search is authoritative even when it found fewer results
+    cache.put("k", URLS[:1], exhausted=True)
+    assert cache.get("k", 3) == URLS[:1]
+
+
+def test_disabled_cache_never_stores_or_serves(clock):
+    cache = SearchResultCache("", ttl_seconds=60, enabled=False)
+    cache.put("k", URLS, exhausted=True)
+    assert cache.get("k", 1) is None
+    assert cache.summary()["entries"] == 0
+
+
+def test_save_merges_with_disk_and_drops_expired_entries(clock, tmp_path):
+    path = tmp_path / "search_cache.json"
+    path.write_text(json.dumps({
+        "old":   {"urls": URLS, "exhausted": False, "stored_at": clock[0] - 120},
+        "other": {"urls": URLS[:1], "exhausted": True, "stored_at": clock[0] - 10},
+    }))
+    cache = SearchResultCache(str(path), ttl_seconds=60)
+    cache.put("k", URLS, exhausted=False)
+    cache.save()
+    assert set(json.loads(path.read_text())) == {"other", "k"}
+    assert SearchResultCache(str(path), ttl_seconds=60).get("other", 5) == URLS[:1]
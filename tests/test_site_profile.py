@@ -0,0 +1,79 @@
+import pytest
+
+from data import site_profile as site_profile_module
+from data.site_profile import FrozenSection, SiteProfileError, compile_site_profile
+
+RAW = {
+    "search": {
+        "item_links": ["#results a.result-link"],
+        "ready": {"response": "**/search.html?*", "selector": ["#results"], "state": "attached", "timeout_ms": 5000},
+    },
+    "cart": {
+        "url": "https://shop.test/cart.html",
+        "cart_subtotal_text": ["#subtotal"],
+        "api": {"response": "**/api/cart", "line_items": "items"},
+    },
+}
+
+
+def test_profile_is_frozen_with_tuples_and_nested_sections():
+    profile = compile_site_profile("shop", RAW)
+    search = profile.section("search")
+    assert search["item_links"] == ("#results a.result-link",)
+    assert isinstance(search["ready"], FrozenSection)
+    assert search["ready"]["selector"] == ("#results",)
+    with pytest.raises(TypeError):
+        search["item_links"] = ["#other"]
+    with pytest.raises(AttributeError):
+        search.extra = 1
+
+
+def test_missing_section_is_an_empty_section():
+    profile = compile_site_profile("shop", RAW)
+    assert len(profile.section("login")) == 0
+    assert profile.section("login").get("url") is None
+
+
+def test_unknown_extension_section_is_kept_without_validation():
+    profile = compile_site_profile("shop", dict(RAW, click={"anything": ["#a"]}))
+    assert profile["click"]["anything"] == ("#a",)
+
+
+def test_every_problem_is_reported_at_once():
+    raw = {
+        "search": {"item_links": [], "item_titel": [".title"], "ready": {"timeout_ms": "5s"}},
+        "cart": {"cart_subtotal_text": "#subtotal", "url": ""},
+    }
+    with pytest.raises(SiteProfileError) as raised:
+        compile_site_profile("shop", raw)
+    problems = raised.value.problems
+    assert raised.value.site == "shop"
+    assert "search.item_links: required key is missing or empty" in problems
+    assert any(problem.startswith("search.item_titel: unknown key") for problem in problems)
+    assert "search.ready.timeout_ms: expected an integer" in problems
+    assert "cart.cart_subtotal_text: expected a list of non-empty strings" in problems
+    assert "cart.url: expected a non-empty string" in problems
+
+
+def test_nested_object_must_be_an_object():
+    with pytest.raises(SiteProfileError) as raised:
+        compile_site_profile("shop", {"cart": {"cart_subtotal_text": ["#subtotal"], "api": "**/api/cart"}})
+    assert raised.value.problems == ["cart.api: expected an object, got str"]
+
+
+def test_ready_is_only_allowed_in_page_sections():
+    with pytest.raises(SiteProfileError) as raised:
+        compile_site_profile("shop", {"network": {"ready": {"state": "visible"}}})
+    assert raised.value.problems[0].startswith("network.ready: unknown key")
+
+
+def test_disk_cache_round_trips_the_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(site_profile_module, "SITE_PROFILE_CACHE_DIR", str(tmp_path))
+    profile = compile_site_profile("shop", RAW)
+    site_profile_module._write_cached("shop", "0" * 16, profile)
+    cached = site_profile_module._read_cached("shop", "0" * 16)
+    assert cached == profile
+    assert cached.section("cart")["api"]["line_items"] == "items"
+    # A newer version of the JSON replaces the stale pickle
+    site_profile_module._write_cached("shop", "1" * 16, profile)
+    assert site_profile_module._read_cached("shop", "0" * 16) is None
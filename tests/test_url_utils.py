@@ -0,0 +1,27 @@
+from core.url_utils import build_search_url, normalize_item_url
+
+
+def test_tracking_params_and_fragment_are_dropped():
+    url = "https://www.ebay.com/itm/123?_trksid=p2380057&hash=item1c&utm_source=mail&var=42#tab"
+    assert normalize_item_url(url) == "https://www.ebay.com/itm/123?var=42"
+
+
+def test_host_is_lowercased_but_path_is_kept():
+    assert normalize_item_url("https://WWW.Shop.TEST/Item/A1") == "https://www.shop.test/Item/A1"
+
+
+def test_same_item_from_different_result_pages_normalises_equal():
+    first = normalize_item_url("https://fakeshop.test/item.html?id=3&_trksid=p1&hash=item3")
+    second = normalize_item_url("https://fakeshop.test/item.html?id=3&_trksid=p2&hash=item3")
+    assert first == second == "https://fakeshop.test/item.html?id=3"
+
+
+def test_blank_non_tracking_params_are_kept():
+    assert normalize_item_url("https://shop.test/item?id=1&ref=") == "https://shop.test/item?id=1&ref="
+
+
+def test_search_url_quotes_the_query_and_truncates_the_price():
+    template = "https://fakeshop.test/search.html?q={query}&max={max_price}"
+    assert build_search_url(template, "running shoes & more", 220.9) == (
+        "https://fakeshop.test/search.html?q=running+shoes+%26+more&max=220"
+    )
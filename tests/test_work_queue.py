@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from core.work_queue import WorkQueue, WORKER_ID_ENV_KEY
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNNER_CONFTEST = """
+from core.work_queue import WorkQueue, run_from_work_queue
+
+def pytest_runtestloop(session):
+    run_from_work_queue(session, WorkQueue(["w0"], {}))
+    return True
+"""
+
+MODULE = """
+import pytest
+
+@pytest.fixture(scope="module")
+def module_resource():
+    yield object()
+
+class TestGrouped:
+    def test_first(self, module_resource):
+        pass
+
+    def test_second(self, module_resource):
+        pass
+
+def test_plain(module_resource):
+    pass
+"""
+
+
+def test_one_worker_runs_cases_from_several_modules(tmp_path):
+    (tmp_path / "conftest.py").write_text(textwrap.dedent(RUNNER_CONFTEST))
+    for name in ("test_alpha.py", "test_beta.py", "test_gamma.py"):
+        (tmp_path / name).write_text(textwrap.dedent(MODULE))
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, **{WORKER_ID_ENV_KEY: "w0"})
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", str(tmp_path)],
+        cwd=tmp_path, env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "9 passed" in result.stdout
+
+
+def test_crashed_worker_releases_its_site_slot():
+    work_queue = WorkQueue(["w0", "w1"], {"ebay": 1})
+    work_queue.register([("a", "ebay"), ("b", "ebay")])
+    assert work_queue.next_case("w0") == "a"
+    assert work_queue.next_case("w1") is None
+    assert work_queue.release_worker("w0") == "a"
+    assert work_queue.next_case("w1") == "b"
+    assert work_queue.summary()["outcomes"] == {"crashed": 1}